@@ -1,29 +1,240 @@
-from fastapi import FastAPI
-from data_modules.past_quizzes_preprocessing import analyze_performance as analyze_past_quizzes,load_quiz_data
-from data_modules.latest_quiz_preprocessing import get_full_quiz_data as latest_quiz_data
+import hashlib
+import sys
+import time
+from datetime import date
+from typing import Literal, Optional
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from data_modules.past_quizzes_preprocessing import (
+    MAX_PAGE_SIZE, analyze_performance as analyze_past_quizzes, query_quiz_data, quiz_data_version,
+    stream_quiz_data
+)
+from data_modules.latest_quiz_preprocessing import latest_quiz_cache, load_latest_quiz
+from data_modules.instrumentation import end_request, registry, server_timing_header, start_request
+from data_modules.snapshots import get_snapshot, get_snapshot_refresher, loaded_snapshot
+from data_modules.student_store import get_student_store
+from data_modules.upstream import close_http_client
+from data_modules.worker_pool import run_blocking, shutdown_executor
+from tools.performance_analysis import analyze_performance as analyze_topic
+from tools.report_cache import get_mentor_report_cache
+from tools.report_jobs import get_report_job_queue
+from config import API_PROCESSES, COMPRESSION_MIN_BYTES, SERVER_TIMING_HEADERS, SNAPSHOT_REFRESH_SECONDS
+
+try:
+    from brotli_asgi import BrotliMiddleware  # Optional: brotli for clients that accept it, else gzip
+except ImportError:
+    BrotliMiddleware = None
 
 # Initialize FastAPI
 app = FastAPI()
 
+# **Response Compression** (only above COMPRESSION_MIN_BYTES; small payloads aren't worth the CPU)
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_BYTES, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
+
+def _loaded(module_name, read):
+    """`read(module)` if `module_name` was already imported by this process, else None."""
+    module = sys.modules.get(module_name)
+    return read(module) if module is not None else None
+
+@app.on_event("startup")
+async def register_caches():
+    registry.register_cache("latest_quiz", latest_quiz_cache)
+    registry.register_cache("mentor_report", get_mentor_report_cache())
+    # ✅ LangChain/CrewAI-backed caches are exported once this process uses them, never loaded for a scrape
+    registry.register_lazy_cache("answer", lambda: _loaded(
+        "tools.retrieval_service", lambda module: getattr(module.loaded_retrieval_service(), "answer_cache", None)))
+    registry.register_lazy_cache("tool_result", lambda: _loaded(
+        "tools.tool_cache", lambda module: module.loaded_tool_cache()))
+    registry.register_gauge("quiz_snapshot_age_seconds", "Seconds since the served upstream snapshot was refreshed.",
+                            lambda: None if loaded_snapshot() is None else loaded_snapshot().age())
+
+# **Upstream Snapshots**
+# Requests only read the published snapshot; upstream APIs are pulled by this background task
+@app.on_event("startup")
+async def start_snapshot_refresher():
+    if SNAPSHOT_REFRESH_SECONDS > 0:
+        get_snapshot_refresher().start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await get_snapshot_refresher().stop()
+    await close_http_client()
+    shutdown_executor()
+
+# **Request Timing**
+# Every request is recorded per route template (not raw path, so user ids don't explode the label set)
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    token = start_request()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        elapsed = time.perf_counter() - start
+        spans = end_request(token)
+    route = request.scope.get("route")
+    registry.observe_request(request.method, getattr(route, "path", "unmatched"), response.status_code, elapsed)
+    if SERVER_TIMING_HEADERS:
+        response.headers["Server-Timing"] = server_timing_header(spans, elapsed)
+    snapshot = loaded_snapshot()
+    if snapshot is not None:
+        response.headers.update(snapshot.headers())  # ✅ Clients can see how old the data is
+    return response
+
+# **Metrics Endpoint** (Prometheus text format)
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# **Conditional GET**
+# Strong ETags derived from the data version; a client that already has it gets an empty 304
+def _etag_headers(tag):
+    return {"ETag": f'"{tag}"', "Cache-Control": "no-cache"}
+
+def _not_modified(request, tag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates or f'"{tag}"' in candidates:
+        return Response(status_code=304, headers=_etag_headers(tag))
+    return None
+
 # **Root Endpoint**
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Student Quiz Analysis API"}
+
+# **Snapshot Status**
+@app.get("/snapshot")
+async def snapshot_status():
+    snapshot = await run_blocking(get_snapshot)
+    return {**snapshot.status(), "refresher": get_snapshot_refresher().status()}
+# Without parameters, returns the whole history as before. `limit` + `cursor` page through it,
+# `topic`/`from_date`/`to_date` filter, `fields` projects columns, and `format=ndjson` streams.
 @app.get("/all")
-async def get_quiz_info():
-    quiz_data = load_quiz_data()
-    return {"quizzes": quiz_data}
+async def get_quiz_info(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    topic: Optional[str] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated field names"),
+    format: Literal["json", "ndjson"] = "json"
+):
+    query = dict(cursor=cursor, limit=limit, topic=topic, fields=fields,
+                 from_date=from_date.isoformat() if from_date else None,
+                 to_date=to_date.isoformat() if to_date else None)
+    if format == "ndjson":
+        # Sync generator: Starlette iterates it in its threadpool, one attempt per line
+        lines = await run_blocking(stream_quiz_data, **query)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    query_hash = hashlib.sha256(request.url.query.encode()).hexdigest()[:16]
+    tag = f"all-{await run_blocking(quiz_data_version)}-{query_hash}"
+    return _not_modified(request, tag) or JSONResponse(
+        await run_blocking(query_quiz_data, **query), headers=_etag_headers(tag)
+    )
 # **Performance Analysis for A**
 @app.get("/performance")
-async def past_performance():
-    return analyze_past_quizzes()
+async def past_performance(request: Request):
+    # ✅ The version is checked before the report is serialized
+    tag = f"performance-{await run_blocking(quiz_data_version)}"
+    return _not_modified(request, tag) or JSONResponse(
+        await run_blocking(analyze_past_quizzes), headers=_etag_headers(tag)
+    )
 
 # **Performance Analysis for B**
 @app.get("/latestquiz")
-async def latest_performance():
-    return latest_quiz_data()
+async def latest_performance(request: Request):
+    version, payload = await run_blocking(load_latest_quiz)
+    tag = f"latestquiz-{version}"
+    return _not_modified(request, tag) or JSONResponse(payload, headers=_etag_headers(tag))
+
+# **Per-Student Endpoints**
+# Each handler hands one synchronous SQLite query to the worker pool.
+def _student_query(user_id, query, *args, missing=None):
+    """Runs `query` for a known student; a None payload is a 404 with `missing` as its detail."""
+    store = get_student_store()
+    if not store.has_student(user_id):
+        raise HTTPException(status_code=404, detail=f"❌ No quiz data for student {user_id}.")
+    payload = getattr(store, query)(user_id, *args)
+    if payload is None:
+        # ✅ e.g. a student with only a knowledge base has no performance yet
+        raise HTTPException(status_code=404, detail=missing or f"❌ No quiz data for student {user_id}.")
+    return payload
+
+def _student_topic(user_id, topic):
+    summary = _student_query(user_id, "topic_summary", topic, missing=f"⚠️ No quiz data found for the topic: {topic}")
+    return {"summary": summary, "history": get_student_store().topic_history(user_id, topic)}
+
+def _student_latest_quiz(user_id):
+    latest = get_student_store().latest_quiz(user_id)
+    if latest is None:
+        raise HTTPException(status_code=404, detail=f"❌ No latest quiz for student {user_id}.")
+    return latest
+
+@app.get("/students/{user_id}/all")
+async def student_quiz_info(user_id: str):
+    return {"quizzes": await run_blocking(_student_query, user_id, "quiz_history")}
+
+@app.get("/students/{user_id}/performance")
+async def student_performance(user_id: str):
+    return await run_blocking(_student_query, user_id, "performance",
+                              missing=f"❌ No quiz attempts for student {user_id}.")
+
+@app.get("/students/{user_id}/topics")
+async def student_topics(user_id: str):
+    return {"topics": await run_blocking(_student_query, user_id, "topics")}
+
+@app.get("/students/{user_id}/topics/{topic}")
+async def student_topic_performance(user_id: str, topic: str):
+    return await run_blocking(_student_topic, user_id, topic)
+
+@app.get("/students/{user_id}/latestquiz")
+async def student_latest_quiz(user_id: str):
+    return await run_blocking(_student_latest_quiz, user_id)
+
+@app.get("/students/{user_id}/knowledge-base")
+async def student_knowledge_base(user_id: str):
+    return await run_blocking(_student_query, user_id, "knowledge_base")
+
+# **Mentor Report Jobs**
+def _submit_report(topic):
+    quiz_history, performance_summary = analyze_topic(topic)
+    if not quiz_history:
+        raise HTTPException(status_code=404, detail=performance_summary)
+    return get_report_job_queue().submit(topic, quiz_history, performance_summary)
+
+def _require_job(job_id):
+    job = get_report_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"❌ Unknown report job {job_id}.")
+    return job
+
+@app.post("/reports")
+async def submit_report(topic: str):
+    return await run_blocking(_submit_report, topic)
+
+@app.get("/reports/{job_id}")
+async def report_status(job_id: str):
+    return await run_blocking(_require_job, job_id)
+
+@app.get("/reports/{job_id}/stream")
+async def report_stream(job_id: str):
+    await run_blocking(_require_job, job_id)
+    # ✅ Async generator: waits on the event loop between progress checks, holding no thread
+    chunks = (f"{chunk}\n" async for chunk in get_report_job_queue().stream(job_id))
+    return StreamingResponse(chunks, media_type="text/plain")
 
 # **Run FastAPI**
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    # ✅ Multiple processes spread the analytics across cores; each has its own worker pool,
+    # and report jobs live in SQLite so any process can answer for any job
+    uvicorn.run("api:app", host="127.0.0.1", port=8000, workers=API_PROCESSES)
@@ -1,29 +1,25 @@
 import json
 import pandas as pd
-import requests
 import streamlit as st
 import matplotlib.pyplot as plt
-from config import FASTAPI_URL
+from tools.api_client import get_api_session
 from tools.data_fetcher import fetch_quiz_data
 
 
+# ✅ Pooled session with ETag revalidation: an unchanged payload comes back as an empty 304
 @st.cache_data
 def fetch_quiz_performance():
-    response = requests.get(f"{FASTAPI_URL}/performance")
-    if response.status_code == 200:
-        return response.json()
-    else:
+    data = get_api_session().get_json("/performance")
+    if data is None:
         st.error("❌ Failed to fetch past quiz performance from API")
-        return None
+    return data
 
 @st.cache_data
 def fetch_latest_quiz():
-    response = requests.get(f"{FASTAPI_URL}/latestquiz")
-    if response.status_code == 200:
-        return response.json()
-    else:
+    data = get_api_session().get_json("/latestquiz")
+    if data is None:
         st.error("❌ Failed to fetch latest quiz data from API")
-        return None
+    return data
 
 
 st.title("📊 Student Quiz Performance Dashboard")
@@ -31,6 +27,8 @@ st.title("📊 Student Quiz Performance Dashboard")
 
 st.sidebar.header("🔍 Choose a Topic")
 data = fetch_quiz_performance()
+if data is None:
+    fetch_quiz_performance.clear()  # ✅ Failed fetches aren't kept, so the next rerun asks the API again
 if data:
     df = pd.DataFrame(data["all_quiz_performance"])
     df["topic_title"] = df["quiz_identifier"]
@@ -49,6 +47,8 @@ st.sidebar.markdown("---")
 st.sidebar.subheader("📌 Latest Quiz Results")
 
 latest_quiz_data = fetch_latest_quiz()
+if latest_quiz_data is None:
+    fetch_latest_quiz.clear()
 if latest_quiz_data:
     quiz = latest_quiz_data["quiz_details"]
     student = latest_quiz_data["student_performance"]
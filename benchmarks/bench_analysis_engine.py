@@ -0,0 +1,53 @@
+"""Per-topic analytics on a synthetic 1M-attempt history: the old filter-per-call pandas path vs the engine.
+
+Run from the repository root:  python -m benchmarks.bench_analysis_engine [--attempts 1000000]
+"""
+import argparse
+import random
+import time
+import pandas as pd
+from benchmarks.synthetic import TOPICS, make_attempt
+from data_modules.analysis_engine import TopicAnalysisEngine
+from data_modules.dataset_store import build_frame
+
+
+def legacy_topic_stats(quiz_data, topic):
+    """The original tools.performance_analysis computation (string frame, filter, parse, apply)."""
+    df = pd.DataFrame(quiz_data)
+    df_filtered = df[df["topic"].str.lower() == topic.lower()].copy()
+    df_filtered["started_at"] = pd.to_datetime(df_filtered["started_at"])
+    df_filtered = df_filtered.sort_values(by="started_at")
+    df_filtered["total_attempted"] = df_filtered["correct_answers"] + df_filtered["incorrect_answers"]
+    df_filtered["total_unattempted"] = (df_filtered["total_questions"] - df_filtered["total_attempted"]).apply(
+        lambda x: max(0, x))
+    df_filtered["accuracy_rate"] = df_filtered["correct_answers"] / df_filtered["total_attempted"] * 100
+    return df_filtered["accuracy_rate"].mean()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attempts", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    quiz_data = [make_attempt(rng) for _ in range(args.attempts)]
+    frame, build_time = timed(build_frame, quiz_data)
+    engine, engine_time = timed(TopicAnalysisEngine, frame)
+    print(f"{args.attempts} attempts: typed frame {build_time:.2f} s, engine sort/group {engine_time:.2f} s (once)")
+
+    _, legacy = timed(legacy_topic_stats, quiz_data, TOPICS[0])
+    _, single = timed(engine.topic_summary, TOPICS[0])
+    _, every = timed(engine.all_topic_summaries)
+    print(f"one topic, legacy path: {legacy * 1000:10.1f} ms")
+    print(f"one topic, engine:      {single * 1000:10.3f} ms")
+    print(f"all {len(TOPICS)} topics, engine: {every * 1000:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
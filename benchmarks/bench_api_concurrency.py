@@ -0,0 +1,66 @@
+"""Throughput of the API under 200 concurrent clients for 1, 2 and 4 uvicorn worker processes.
+
+Run from the repository root:  python -m benchmarks.bench_api_concurrency [--processes 1 2 4] [--path /performance]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import httpx
+
+PORT = 8765
+CLIENTS = 200
+DURATION_SECONDS = 10
+
+
+async def client_loop(client, path, deadline, counts):
+    while time.perf_counter() < deadline:
+        response = await client.get(path)
+        counts["ok" if response.status_code == 200 else "error"] += 1
+
+
+async def load(path):
+    counts = {"ok": 0, "error": 0}
+    limits = httpx.Limits(max_connections=CLIENTS, max_keepalive_connections=CLIENTS)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + DURATION_SECONDS
+        await asyncio.gather(*(client_loop(client, path, deadline, counts) for _ in range(CLIENTS)))
+    return counts
+
+
+def wait_until_up():
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("API did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/performance")
+    args = parser.parse_args()
+
+    print(f"{'processes':>10}{'req/s':>12}{'errors':>8}")
+    for processes in args.processes:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "api:app", "--port", str(PORT),
+             "--workers", str(processes), "--log-level", "warning"],
+            env={**os.environ, "API_PROCESSES": str(processes)}
+        )
+        try:
+            wait_until_up()
+            counts = asyncio.run(load(args.path))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{processes:>10}{counts['ok'] / DURATION_SECONDS:>12.1f}{counts['error']:>8}")
+
+
+if __name__ == "__main__":
+    main()
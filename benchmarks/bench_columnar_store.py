@@ -0,0 +1,126 @@
+"""Quiz history analytics from JSON vs the partitioned columnar formats, at 1M attempts.
+
+Writes the same synthetic history as pretty-printed JSON (the `quiz_data.json` layout), as
+JSONL (the snapshot layout) and as Arrow IPC and Parquet datasets partitioned by topic and
+month. Each format is then opened in a fresh process, which reports load time, resident
+memory and the latency of one topic's summary + history and of the all-topics aggregates.
+The JSON paths parse every attempt before answering; the columnar paths read only the
+partitions and columns a query needs.
+
+Run from the repository root:
+    python -m benchmarks.bench_columnar_store [--attempts 1000000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.synthetic import TOPICS, make_history
+
+FORMATS = ("json", "jsonl", "ipc", "parquet")
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def disk_mb(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 2 ** 20
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names) / 2 ** 20
+
+
+def dataset_path(workdir, file_format):
+    from data_modules.columnar_store import columnar_name
+
+    if file_format == "json":
+        return os.path.join(workdir, "quiz_data.json")
+    if file_format == "jsonl":
+        return os.path.join(workdir, "quiz_attempts.jsonl")
+    return os.path.join(workdir, columnar_name("quiz_attempts", file_format))
+
+
+def build(workdir, attempts):
+    from data_modules.columnar_store import write_columnar
+    from data_modules.dataset_store import QuizDatasetStore
+
+    records = make_history(attempts)
+    for file_format in FORMATS:
+        path = dataset_path(workdir, file_format)
+        start = time.perf_counter()
+        if file_format == "json":
+            with open(path, "w") as f:
+                json.dump(records, f, indent=4)
+        elif file_format == "jsonl":
+            QuizDatasetStore(path).replace(records)
+        else:
+            write_columnar(records, path, file_format)
+        print(f"  {file_format:<8} write {time.perf_counter() - start:6.1f} s  {disk_mb(path):8.1f} MB on disk")
+
+
+def probe(workdir, file_format):
+    """Runs in a fresh process: open one format, answer topic queries, and print a JSON report."""
+    from data_modules.columnar_store import ColumnarQuizHistory
+    from data_modules.dataset_store import QuizDatasetStore
+
+    import pandas  # noqa: F401  Imported up front so it is not counted as load time or memory
+    import pyarrow.dataset  # noqa: F401
+    baseline_rss = rss_mb()
+    path = dataset_path(workdir, file_format)
+
+    start = time.perf_counter()
+    if file_format in ("json", "jsonl"):
+        store = QuizDatasetStore(path)
+        store.engine()  # Parse every attempt, build the typed frame and sort it, as the JSON store does
+    else:
+        store = ColumnarQuizHistory(path)
+        store.dataset()
+    load_seconds = time.perf_counter() - start
+    loaded_rss = rss_mb()
+
+    start = time.perf_counter()
+    store.topic_summary(TOPICS[0])
+    store.topic_history(TOPICS[0])
+    topic_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    store.all_topic_summaries()
+    all_topics_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({"load_s": load_seconds, "rss_loaded_mb": loaded_rss - baseline_rss,
+                      "rss_after_queries_mb": rss_mb() - baseline_rss, "topic_ms": topic_ms,
+                      "all_topics_ms": all_topics_ms}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attempts", type=int, default=1_000_000)
+    parser.add_argument("--probe", nargs=2, metavar=("WORKDIR", "FORMAT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        probe(*args.probe)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="quiz-columnar-bench-", dir=".") as workdir:
+        print(f"{args.attempts:,} attempts")
+        build(workdir, args.attempts)
+        print(f"{'format':<9}{'load s':>9}{'RSS MB':>10}{'RSS after q':>13}{'topic ms':>10}{'all topics ms':>15}")
+        for file_format in FORMATS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_columnar_store", "--probe", workdir, file_format],
+                capture_output=True, text=True, check=True
+            ).stdout
+            row = json.loads(output.strip().splitlines()[-1])
+            print(f"{file_format:<9}{row['load_s']:>9.2f}{row['rss_loaded_mb']:>10.0f}"
+                  f"{row['rss_after_queries_mb']:>13.0f}{row['topic_ms']:>10.1f}{row['all_topics_ms']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Flat float32 FAISS index + pickled docstore vs the compact backends, at 1M and 5M vectors.
+
+For each size, builds the flat index (today's `faiss_index/` layout) and the "ivfpq" and
+"ivf-fp16" compact indexes from the same clustered synthetic vectors. Each index is then
+loaded in a fresh process, which reports load time, resident memory, query latency and
+recall@k against exact flat search. The pickled docstore is a plain {doc_id: text} dict,
+a lower bound on unpickling LangChain Documents; the compact backends use `ChunkStore`.
+
+Run from the repository root:
+    python -m benchmarks.bench_compact_index [--sizes 1000000 5000000] [--k 10] [--nprobe 16]
+Needs several GB of free disk at 5M vectors, and enough RAM for the flat index.
+"""
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+DIM = 384
+CLUSTERS = 4096
+QUERIES = 1000
+BATCH = 100_000
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def chunk_text(row):
+    return f"Question {row // 2}: synthetic chunk {row} about cells, tissues and enzymes."
+
+
+def write_vectors(path, count, seed=0):
+    """Clustered Gaussian vectors (like topic-grouped questions) written to a float32 memmap."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((CLUSTERS, DIM)).astype(np.float32)
+    vectors = np.memmap(path, dtype=np.float32, mode="w+", shape=(count, DIM))
+    for start in range(0, count, BATCH):
+        size = min(BATCH, count - start)
+        assignment = rng.integers(0, CLUSTERS, size)
+        vectors[start:start + size] = centers[assignment] + 0.35 * rng.standard_normal((size, DIM), dtype=np.float32)
+    vectors.flush()
+    queries = centers[rng.integers(0, CLUSTERS, QUERIES)] + 0.35 * rng.standard_normal((QUERIES, DIM), dtype=np.float32)
+    return np.memmap(path, dtype=np.float32, mode="r", shape=(count, DIM)), queries
+
+
+def build(workdir, count, k):
+    import faiss
+    from tools.compact_index import ChunkStore, build_compact_index
+
+    vectors, queries = write_vectors(os.path.join(workdir, "vectors.f32"), count)
+    np.save(os.path.join(workdir, "queries.npy"), queries)
+
+    start = time.perf_counter()
+    flat = faiss.IndexFlatL2(DIM)
+    for offset in range(0, count, BATCH):
+        flat.add(np.ascontiguousarray(vectors[offset:offset + BATCH]))
+    faiss.write_index(flat, os.path.join(workdir, "flat.index"))
+    with open(os.path.join(workdir, "docstore.pkl"), "wb") as f:
+        pickle.dump({f"{row}:0": chunk_text(row) for row in range(count)}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"  flat build:      {time.perf_counter() - start:8.1f} s")
+
+    _, truth = flat.search(queries, k)
+    np.save(os.path.join(workdir, "truth.npy"), truth)
+    del flat
+
+    ChunkStore(os.path.join(workdir, "docstore.sqlite3")).write(
+        (f"{row}:0", str(row // 2), chunk_text(row)) for row in range(count)
+    )
+    for kind in ("ivfpq", "ivf-fp16"):
+        start = time.perf_counter()
+        build_compact_index(vectors, os.path.join(workdir, f"{kind}.index"), kind)
+        print(f"  {kind} build: {time.perf_counter() - start:8.1f} s")
+
+
+def probe(workdir, kind, k, nprobe):
+    """Runs in a fresh process: load one index and its docstore, search, and print a JSON report."""
+    import faiss
+    from tools.compact_index import ChunkStore, load_compact_index
+
+    queries = np.load(os.path.join(workdir, "queries.npy"))
+    truth = np.load(os.path.join(workdir, "truth.npy"))
+    baseline_rss = rss_mb()
+
+    start = time.perf_counter()
+    if kind == "flat":
+        index = faiss.read_index(os.path.join(workdir, "flat.index"))
+        with open(os.path.join(workdir, "docstore.pkl"), "rb") as f:
+            docstore = pickle.load(f)
+        fetch = lambda rows: [docstore[f"{row}:0"] for row in rows]
+    else:
+        index = load_compact_index(os.path.join(workdir, f"{kind}.index"), nprobe)
+        docstore = ChunkStore(os.path.join(workdir, "docstore.sqlite3"))
+        fetch = lambda rows: list(docstore.by_rows(rows).values())
+    load_seconds = time.perf_counter() - start
+    loaded_rss = rss_mb()
+
+    start = time.perf_counter()
+    for query in queries:
+        _, rows = index.search(query[None, :], k)
+        fetch([int(row) for row in rows[0] if row >= 0])
+    query_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    _, found = index.search(queries, k)
+    recall = np.mean([len(set(found[i]) & set(truth[i])) / k for i in range(len(queries))])
+    print(json.dumps({"load_s": load_seconds, "rss_loaded_mb": loaded_rss - baseline_rss,
+                      "rss_after_queries_mb": rss_mb() - baseline_rss, "query_ms": query_ms,
+                      "recall": float(recall)}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--probe", nargs=2, metavar=("WORKDIR", "KIND"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        probe(*args.probe, args.k, args.nprobe)
+        return
+
+    for count in args.sizes:
+        with tempfile.TemporaryDirectory(prefix="quiz-index-bench-", dir=".") as workdir:
+            print(f"\n{count:,} vectors x {DIM} dims")
+            build(workdir, count, args.k)
+            print(f"{'index':<10}{'load s':>9}{'RSS MB':>10}{'RSS after q':>13}{'query ms':>10}{f'recall@{args.k}':>11}")
+            for kind in ("flat", "ivfpq", "ivf-fp16"):
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_compact_index", "--probe", workdir, kind,
+                     "--k", str(args.k), "--nprobe", str(args.nprobe)],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                row = json.loads(output.strip().splitlines()[-1])
+                print(f"{kind:<10}{row['load_s']:>9.2f}{row['rss_loaded_mb']:>10.0f}"
+                      f"{row['rss_after_queries_mb']:>13.0f}{row['query_ms']:>10.2f}{row['recall']:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Requests/sec for `/all` and `/performance` with and without the in-memory dataset store.
+
+Run from the repository root:  python -m benchmarks.bench_dataset_store
+"""
+import time
+from fastapi.testclient import TestClient
+from api import app
+from data_modules.snapshots import current_quiz_store
+
+REQUESTS = 500
+
+
+def run(client, path, invalidate):
+    store = current_quiz_store()  # The store the API serves from
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        if invalidate:
+            store.invalidate()  # Forces a re-parse, like the old per-request json.load
+        response = client.get(path)
+        response.raise_for_status()
+    elapsed = time.perf_counter() - start
+    return REQUESTS / elapsed
+
+
+def main():
+    client = TestClient(app)
+    print(f"{'endpoint':<14}{'before (req/s)':>16}{'after (req/s)':>16}{'speedup':>10}")
+    for path in ["/all", "/performance"]:
+        before = run(client, path, invalidate=True)
+        after = run(client, path, invalidate=False)
+        print(f"{path:<14}{before:>16.1f}{after:>16.1f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Embedding throughput for the knowledge-base chunks: cold cache per batch size, then a warm re-index.
+
+Run from the repository root:  python -m benchmarks.bench_embedding_cache
+"""
+import tempfile
+import time
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from tools.embedding_cache import CachedEmbeddings
+from tools.retrieval_service import EMBEDDING_MODEL_NAME
+from tools.vector_index import CHUNK_OVERLAP, CHUNK_SIZE, load_knowledge_base, split_question
+
+
+def chunk_texts():
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    texts = []
+    for item in load_knowledge_base()["quiz_questions"]:
+        chunks, _ = split_question(item, splitter)
+        texts += [chunk.page_content for chunk in chunks]
+    return texts
+
+
+def timed(embeddings, texts):
+    start = time.perf_counter()
+    embeddings.embed_documents(texts)
+    return time.perf_counter() - start
+
+
+def main():
+    texts = chunk_texts()
+    print(f"{len(texts)} chunks")
+    for batch_size in [8, 32, 64, 128]:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            embeddings = CachedEmbeddings(EMBEDDING_MODEL_NAME, cache_dir=cache_dir, batch_size=batch_size)
+            cold = timed(embeddings, texts)
+            warm = timed(embeddings, texts)
+        print(f"batch={batch_size:<4} cold {len(texts) / cold:8.1f} chunks/s   warm (cached) {len(texts) / warm:10.1f} chunks/s")
+
+
+if __name__ == "__main__":
+    main()
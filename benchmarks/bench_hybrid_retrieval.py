@@ -0,0 +1,74 @@
+"""Retrieval latency on a synthetic knowledge base (100k questions by default).
+
+Compares the previous path (embed the question, FAISS top-k) with the exact-match fast
+path for questions picked from the knowledge base and the BM25 + vector hybrid for free
+text, plus the page's question lookup (linear scan vs hash index). Uses the offline fake
+embeddings, so absolute FAISS numbers exclude model inference.
+
+Run from the repository root:  python -m benchmarks.bench_hybrid_retrieval [--questions 100000]
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from benchmarks.fakes import FakeEmbeddings, fake_llm
+from benchmarks.report import measure, print_report
+from benchmarks.synthetic import make_knowledge_base
+from tools.question_index import QuestionIndex
+from tools.retrieval_service import RetrievalService
+
+QUERIES = 200
+
+
+def cycle(func, values):
+    values = itertools.cycle(values)
+    return lambda: func(next(values))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    knowledge_base = make_knowledge_base(args.questions)
+    questions = knowledge_base["quiz_questions"]
+    rng = random.Random(1)
+    picked = [item["question"] for item in rng.sample(questions, min(QUERIES, len(questions)))]
+    free_text = [" ".join(rng.sample(text.split(), len(text.split()) // 2)) for text in picked]
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="quiz-bench-") as workdir:
+        os.chdir(workdir)
+        try:
+            with open("quiz_knowledge_base.json", "w", encoding="utf-8") as f:
+                json.dump(knowledge_base, f)
+            start = time.perf_counter()
+            service = RetrievalService(llm=fake_llm(), embeddings=FakeEmbeddings())
+            print(f"{args.questions} questions, index + BM25 build: {time.perf_counter() - start:.1f} s")
+
+            index = service.index_manager
+            results = {
+                "picked: embed + FAISS (old)": measure(cycle(lambda q: index.similarity_search(q, k=4), picked),
+                                                      args.repeat),
+                "picked: exact-match path": measure(cycle(service.retrieve, picked), args.repeat),
+                "free text: FAISS only": measure(cycle(lambda q: index.similarity_search(q, k=4), free_text),
+                                                args.repeat),
+                "free text: hybrid": measure(cycle(service.retrieve, free_text), args.repeat),
+            }
+        finally:
+            os.chdir(cwd)
+
+    index = QuestionIndex(questions)
+    results["page lookup: linear scan"] = measure(
+        cycle(lambda q: next(item for item in questions if item["question"] == q), picked), args.repeat
+    )
+    results["page lookup: hash index"] = measure(cycle(index.match, picked), args.repeat)
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
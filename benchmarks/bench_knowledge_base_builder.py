@@ -0,0 +1,81 @@
+"""Batch knowledge-base build against a local stub upstream, vs the one-source-at-a-time loop.
+
+Serves synthetic quiz/student payloads from `StubServer` with per-request latency, then builds
+them sequentially (requests + in-process cleaning, one source at a time) and
+with `build_knowledge_bases` into JSONL and SQLite. Checks that every output has the same
+questions and that the JSONL file loads for embedding.
+
+Run from the repository root:
+    python -m benchmarks.bench_knowledge_base_builder [--sources 200] [--questions 100] [--delay 0.05]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import requests
+from benchmarks.stub_server import StubServer
+from benchmarks.synthetic import make_quiz_source
+from data_modules.knowledge_base_builder import build_knowledge_bases
+from data_modules.lastquizdata import build_knowledge_base
+from data_modules.student_store import StudentStore
+from tools.vector_index import load_knowledge_base
+
+
+def sequential(sources, path):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for source in sources:
+            quiz = requests.get(source["quiz_url"]).json()["quiz"]
+            student = requests.get(source["student_url"]).json()
+            questions = build_knowledge_base(quiz["questions"], student)
+            for question in questions:
+                f.write(json.dumps({"user_id": student["user_id"], "quiz_id": quiz["id"], **question}) + "\n")
+            count += len(questions)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--fetch-concurrency", type=int, default=16)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    routes = {}
+    for quiz_id in range(1, args.sources + 1):
+        quiz, student = make_quiz_source(rng, quiz_id, args.questions)
+        routes[f"/quiz/{quiz_id}"], routes[f"/student/{quiz_id}"] = quiz, student
+
+    with StubServer(routes, delay=args.delay) as stub, tempfile.TemporaryDirectory(prefix="quiz-kb-bench-") as workdir:
+        sources = [{"quiz_url": f"{stub.url}/quiz/{n}", "student_url": f"{stub.url}/student/{n}"}
+                   for n in range(1, args.sources + 1)]
+        print(f"{args.sources} sources x {args.questions} questions, {args.delay * 1000:.0f} ms upstream latency")
+
+        start = time.perf_counter()
+        expected = sequential(sources, os.path.join(workdir, "sequential.jsonl"))
+        baseline = time.perf_counter() - start
+        print(f"{'sequential':<14}{baseline:8.2f} s  {expected} questions")
+
+        for name in ("batch.jsonl", "batch.sqlite3"):
+            path = os.path.join(workdir, name)
+            start = time.perf_counter()
+            summary = build_knowledge_bases(sources, path, args.fetch_concurrency, args.processes)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<14}{elapsed:8.2f} s  {summary['questions']} questions  "
+                  f"{baseline / elapsed:5.1f}x  failed: {len(summary['failed'])}")
+            assert summary["questions"] == expected and not summary["failed"]
+
+        loaded = load_knowledge_base(os.path.join(workdir, "batch.jsonl"))["quiz_questions"]
+        stored = StudentStore(os.path.join(workdir, "batch.sqlite3"))._connect().execute(
+            "SELECT COUNT(*) FROM student_knowledge_base").fetchone()[0]
+        students = {question["user_id"] for question in loaded}
+        print(f"JSONL loads for embedding: {len(loaded)} questions; SQLite: {stored} rows for {len(students)} students")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Latency and upstream fan-out of the snapshot refresher's latest-quiz fetch, against a local
+stub of the upstream APIs.
+
+Run from the repository root:  python -m benchmarks.bench_latest_quiz
+"""
+import asyncio
+import time
+from benchmarks.stub_server import LATEST_QUIZ, STUDENT_RESPONSE, StubServer
+from data_modules import latest_quiz_preprocessing
+from data_modules.upstream import close_http_client
+
+UPSTREAM_DELAY = 0.1
+CONCURRENT_CLIENTS = 100
+
+
+async def burst(clients):
+    start = time.perf_counter()
+    await asyncio.gather(*(latest_quiz_preprocessing.fetch_latest_sources() for _ in range(clients)))
+    return time.perf_counter() - start
+
+
+async def run(server):
+    latest_quiz_preprocessing.QUIZ_API = f"{server.url}/quiz"
+    latest_quiz_preprocessing.STUDENT_API = f"{server.url}/student"
+    cache = latest_quiz_preprocessing.latest_quiz_cache
+
+    cache.clear()
+    single = await burst(1)
+    print(f"single cold request:        {single * 1000:8.1f} ms  "
+          f"(two sequential calls would be ~{2 * UPSTREAM_DELAY * 1000:.0f} ms)")
+
+    cache.clear()
+    before = dict(server.hits)
+    cold = await burst(CONCURRENT_CLIENTS)
+    fetches = sum(server.hits.values()) - sum(before.values())
+    print(f"{CONCURRENT_CLIENTS} concurrent, cold cache: {cold * 1000:8.1f} ms  upstream calls: {fetches}")
+
+    warm = await burst(CONCURRENT_CLIENTS)
+    print(f"{CONCURRENT_CLIENTS} concurrent, warm cache: {warm * 1000:8.1f} ms")
+    print(f"cache hits={cache.hits} misses={cache.misses} coalesced={cache.coalesced}")
+    await close_http_client()
+
+
+def main():
+    routes = {"/quiz": LATEST_QUIZ, "/student": STUDENT_RESPONSE}
+    with StubServer(routes, delay=UPSTREAM_DELAY) as server:
+        asyncio.run(run(server))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Mentor prompt size for topic histories of 10, 100 and 1000 attempts: full JSON dump vs compact encoding.
+
+Run from the repository root:  python -m benchmarks.bench_prompt_builder
+"""
+import json
+import time
+from benchmarks.synthetic import TOPICS, make_history
+from data_modules.analysis_engine import TopicAnalysisEngine
+from data_modules.dataset_store import build_frame
+from tools.prompt_builder import build_mentor_task_description, estimate_tokens
+
+
+def topic_history(count):
+    history = [{**quiz, "topic": TOPICS[0]} for quiz in make_history(count, seed=count)]
+    return TopicAnalysisEngine(build_frame(history)).topic_history(TOPICS[0])
+
+
+def main():
+    print(f"{'attempts':>9}{'json tokens':>14}{'compact tokens':>16}{'build ms':>10}")
+    for count in [10, 100, 1000]:
+        history = topic_history(count)
+        legacy = json.dumps(history, indent=4)
+
+        start = time.perf_counter()
+        description = build_mentor_task_description(TOPICS[0], history, "summary")
+        elapsed = time.perf_counter() - start
+
+        print(f"{count:>9}{estimate_tokens(legacy):>14}{estimate_tokens(description):>16}{elapsed * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
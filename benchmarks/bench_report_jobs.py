@@ -0,0 +1,52 @@
+"""Load test of the mentor report job queue with a fake crew (no LLM or network).
+
+Run from the repository root:  python -m benchmarks.bench_report_jobs
+"""
+import asyncio
+import os
+import tempfile
+import time
+from benchmarks.fakes import FakeMentorCrew
+from benchmarks.synthetic import TOPICS, make_history
+from tools.report_cache import MentorReportCache
+from tools.report_jobs import ReportJobQueue
+
+STUDENT_REQUESTS = 200
+CONCURRENCY = 4
+
+
+async def drain(queue, jobs):
+    for job in jobs:
+        async for _ in queue.stream(job["job_id"], poll_seconds=0.01):
+            pass
+
+
+def main():
+    crew = FakeMentorCrew()
+    histories = {topic: make_history(10, seed=n) for n, topic in enumerate(TOPICS)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = MentorReportCache(os.path.join(tmp, "reports.sqlite3"))
+        queue = ReportJobQueue(max_concurrency=CONCURRENCY, generate=crew, cache=cache)
+
+        start = time.perf_counter()
+        jobs = []
+        for n in range(STUDENT_REQUESTS):
+            topic = TOPICS[n % len(TOPICS)]
+            jobs.append(queue.submit(topic, histories[topic], "summary"))
+        submit_time = time.perf_counter() - start
+
+        asyncio.run(drain(queue, jobs))
+        total_time = time.perf_counter() - start
+        statuses = sorted({queue.get(job["job_id"])["status"] for job in jobs})
+
+    print(f"{STUDENT_REQUESTS} submissions in {submit_time * 1000:.1f} ms "
+          f"({submit_time / STUDENT_REQUESTS * 1e6:.0f} us each)")
+    print(f"all reports ready after {total_time:.2f} s")
+    print(f"crew runs: {crew.calls} for {len(TOPICS)} distinct topics; "
+          f"peak concurrent runs: {crew.peak_running} (limit {CONCURRENCY})")
+    print(f"statuses: {statuses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Startup and per-interaction latency of the AI Quiz Insights retrieval path.
+
+"per rerun" repeats what the page used to do on every Streamlit rerun (construct the
+embedding model, split documents, load FAISS, build the chain); "service" loads once
+and then only answers retrieval calls.
+
+Run from the repository root:  python -m benchmarks.bench_retrieval_service
+"""
+import statistics
+import time
+from benchmarks.fakes import fake_llm
+from tools.retrieval_service import RetrievalService
+from tools.vector_index import load_knowledge_base
+
+INTERACTIONS = 20
+
+
+def main():
+    questions = [q["question"] for q in load_knowledge_base()["quiz_questions"]]
+
+    rerun = []
+    for question in questions[:5]:
+        start = time.perf_counter()
+        RetrievalService(llm=fake_llm()).retrieve(question)
+        rerun.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    service = RetrievalService(llm=fake_llm())
+    startup = time.perf_counter() - start
+
+    interactions = []
+    for question in questions[:INTERACTIONS]:
+        start = time.perf_counter()
+        service.retrieve(question)
+        interactions.append(time.perf_counter() - start)
+
+    print(f"per rerun (load + retrieve): {statistics.median(rerun) * 1000:10.1f} ms median")
+    print(f"service startup (once):      {startup * 1000:10.1f} ms")
+    print(f"service interaction:         {statistics.median(interactions) * 1000:10.1f} ms median")
+
+
+if __name__ == "__main__":
+    main()
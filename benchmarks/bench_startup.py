@@ -0,0 +1,86 @@
+"""Import-time profile and cold start of the API process.
+
+Prints the slowest imports (cumulative, from `python -X importtime`) for each module, lists
+any heavy dependency that gets imported eagerly, and measures how long a fresh uvicorn
+process takes to answer its first request. The target for the API is under one second.
+
+Run from the repository root:  python -m benchmarks.bench_startup [--modules api crew_ai] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import httpx
+
+PORT = 8766
+TARGET_SECONDS = 1.0
+
+# Dependencies that should only load when a feature needs them
+HEAVY_MODULES = ["pandas", "numpy", "requests", "langchain", "faiss", "sentence_transformers", "torch",
+                 "crewai", "crewai_tools", "google.generativeai", "langchain_google_genai"]
+
+
+def import_profile(module):
+    """Returns (total seconds, [(cumulative seconds, module name), ...]) for a fresh `import module`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        rows.append((int(cumulative) / 1e6, depth, name.strip()))
+    total = sum(seconds for seconds, depth, _ in rows if depth == 1)
+    return total, sorted(((seconds, name) for seconds, _, name in rows), reverse=True)
+
+
+def eager_heavy_imports(module):
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def api_cold_start():
+    """Seconds from spawning uvicorn to the first successful response."""
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(PORT), "--log-level", "warning"],
+        env={**os.environ, "API_PROCESSES": "1"}
+    )
+    try:
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{PORT}/", timeout=1).raise_for_status()
+                return time.perf_counter() - start
+            except httpx.HTTPError:
+                if server.poll() is not None:
+                    raise RuntimeError("API exited during startup")
+                time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", nargs="+", default=["api"])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        total, rows = import_profile(module)
+        print(f"\nimport {module}: {total * 1000:.0f} ms")
+        for seconds, name in rows[:args.top]:
+            print(f"{seconds * 1000:10.1f} ms  {name}")
+        heavy = eager_heavy_imports(module)
+        print(f"eager heavy imports: {', '.join(heavy) if heavy else 'none'}")
+
+    elapsed = api_cold_start()
+    status = "✅" if elapsed < TARGET_SECONDS else "❌"
+    print(f"\n{status} API cold start to first response: {elapsed * 1000:.0f} ms (target {TARGET_SECONDS * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Per-student query latency of the SQLite student store as the cohort grows.
+
+Run from the repository root:  python -m benchmarks.bench_student_store [--students 1000 10000 100000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from benchmarks.synthetic import make_attempt
+from data_modules.student_store import StudentStore
+
+ATTEMPTS_PER_STUDENT = 20
+QUERIES = 2000
+
+
+def grow(store, rng, start, stop):
+    for index in range(start, stop):
+        store.add_attempts(f"student-{index}", [make_attempt(rng) for _ in range(ATTEMPTS_PER_STUDENT)])
+
+
+def measure(store, rng, students):
+    timings = {"performance": [], "topic": []}
+    for _ in range(QUERIES):
+        user_id = f"student-{rng.randrange(students)}"
+
+        start = time.perf_counter()
+        store.performance(user_id)
+        timings["performance"].append(time.perf_counter() - start)
+
+        topic = rng.choice(store.topics(user_id))
+        start = time.perf_counter()
+        store.topic_summary(user_id, topic)
+        store.topic_history(user_id, topic)
+        timings["topic"].append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StudentStore(os.path.join(tmp, "students.sqlite3"))
+        print(f"{'students':>10}{'perf p50 ms':>14}{'perf p99 ms':>14}{'topic p50 ms':>14}{'topic p99 ms':>14}")
+        loaded = 0
+        for students in sorted(args.students):
+            grow(store, rng, loaded, students)
+            loaded = students
+            timings = measure(store, rng, students)
+            row = []
+            for name in ["performance", "topic"]:
+                values = sorted(timings[name])
+                row += [statistics.median(values) * 1000, values[int(len(values) * 0.99)] * 1000]
+            print(f"{students:>10}" + "".join(f"{value:>14.3f}" for value in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Search-tool cache with stub tools: pre-warming every topic, then simulated crew runs (no network).
+
+Run from the repository root:  python -m benchmarks.bench_tool_cache
+"""
+import os
+import random
+import tempfile
+import time
+from crewai.tools import BaseTool
+from benchmarks.synthetic import TOPICS
+from tools.tool_cache import CachedTool, ToolResultCache, prewarm
+
+UPSTREAM_SECONDS = 0.3
+CREW_RUNS = 50
+
+
+class StubSearchTool(BaseTool):
+    name: str = "Stub search"
+    description: str = "Returns canned results after a fixed delay."
+    calls: int = 0
+
+    def _run(self, search_query: str) -> str:
+        self.calls += 1
+        time.sleep(UPSTREAM_SECONDS)
+        return f"results for {search_query}"
+
+
+def main():
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ToolResultCache(os.path.join(tmp, "tools.sqlite3"))
+        stub = StubSearchTool()
+        tool = CachedTool(stub, cache)
+
+        start = time.perf_counter()
+        prewarm([tool], TOPICS)
+        print(f"pre-warmed {len(TOPICS)} topics in {time.perf_counter() - start:.2f} s ({stub.calls} upstream calls)")
+
+        calls_before = stub.calls
+        start = time.perf_counter()
+        for _ in range(CREW_RUNS):
+            topic = rng.choice(TOPICS)
+            tool.run(search_query=f"  {topic.upper()} tutorial ")  # Different spacing/case, same query
+        elapsed = time.perf_counter() - start
+        print(f"{CREW_RUNS} crew lookups in {elapsed * 1000:.1f} ms, "
+              f"upstream calls: {stub.calls - calls_before}, hits={cache.hits} misses={cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
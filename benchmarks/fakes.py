@@ -0,0 +1,62 @@
+"""Offline stand-ins for the LLM-backed pieces, so queues and caches can be load-tested without keys."""
+import hashlib
+import threading
+import time
+import numpy as np
+from langchain_community.llms.fake import FakeListLLM
+from langchain_core.embeddings import Embeddings
+
+# Same width as all-MiniLM-L6-v2, so index sizes match the real model
+FAKE_EMBEDDING_DIM = 384
+
+
+class FakeMentorCrew:
+    """Replaces `crew_ai.run_mentor_report`: sleeps per step, reports progress and tracks peak concurrency."""
+
+    def __init__(self, steps=3, step_seconds=0.2):
+        self.steps = steps
+        self.step_seconds = step_seconds
+        self.calls = 0
+        self.running = 0
+        self.peak_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, topic, quiz_history, performance_summary, on_progress=None):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.peak_running = max(self.peak_running, self.running)
+        try:
+            for step in range(self.steps):
+                time.sleep(self.step_seconds)
+                if on_progress:
+                    on_progress(f"step {step + 1}/{self.steps} for {topic}")
+            return f"Report for {topic} covering {len(quiz_history)} attempts"
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic hashed bag-of-words vectors: similar texts get similar vectors, no model download."""
+
+    def __init__(self, dim=FAKE_EMBEDDING_DIM):
+        self.dim = dim
+
+    def _embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode("utf-8")).hexdigest()[:8], 16) % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def fake_llm():
+    """LLM that answers instantly with a fixed explanation."""
+    return FakeListLLM(responses=["stub explanation"])
@@ -0,0 +1,73 @@
+"""Latency, throughput and memory measurements for the benchmark suite, plus baseline comparison."""
+import json
+import time
+import tracemalloc
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def measure(func, repeat=50, warmup=3, setup=None):
+    """Times `repeat` sequential calls of `func` (after `warmup` untimed ones), then traces one more
+    call for peak Python memory. `setup` runs before every call and is not timed."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # ✅ Memory is traced in its own call so tracemalloc overhead does not skew the timings
+    if setup:
+        setup()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "calls": repeat,
+        "p50_ms": _percentile(timings, 0.50) * 1000,
+        "p95_ms": _percentile(timings, 0.95) * 1000,
+        "max_ms": timings[-1] * 1000,
+        "ops_per_s": repeat / sum(timings) if sum(timings) else float("inf"),
+        "peak_mb": peak / 2 ** 20
+    }
+
+
+def print_report(results):
+    print(f"{'component':<28}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'ops/s':>12}{'peak MB':>10}")
+    for name, row in results.items():
+        print(f"{name:<28}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['max_ms']:>10.2f}"
+              f"{row['ops_per_s']:>12.1f}{row['peak_mb']:>10.2f}")
+
+
+def save_report(results, path, parameters):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"parameters": parameters, "results": results}, f, indent=2)
+
+
+def load_report(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def regressions(baseline, results, tolerance):
+    """Components whose median latency or peak memory grew by more than `tolerance` (0.2 = 20%)."""
+    found = []
+    for name, row in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "peak_mb"):
+            if before[metric] and row[metric] > before[metric] * (1 + tolerance):
+                found.append(f"{name}: {metric} {before[metric]:.2f} -> {row[metric]:.2f}")
+    return found
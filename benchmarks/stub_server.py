@@ -0,0 +1,63 @@
+"""Local stand-in for the jsonkeeper/jsonserve upstream APIs, with configurable latency."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubServer:
+    """Serves `routes` (path -> JSON-able payload) after `delay` seconds and counts hits per path."""
+
+    def __init__(self, routes, delay=0.1):
+        self.routes = routes
+        self.delay = delay
+        self.hits = {path: 0 for path in routes}
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                payload = stub.routes.get(self.path)
+                with stub._lock:
+                    stub.hits[self.path] = stub.hits.get(self.path, 0) + 1
+                time.sleep(stub.delay)
+                body = json.dumps(payload).encode()
+                self.send_response(200 if payload is not None else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# Minimal payloads with the fields the latest-quiz pipeline reads
+LATEST_QUIZ = {
+    "quiz": {
+        "id": 43, "title": "Structural Organisation in Animals and Plants (7)",
+        "topic": "Structural Organisation in Animals", "questions_count": 10, "time": "2024-07-03T00:00:00.000+05:30",
+        "negative_marks": "1.0", "correct_answer_marks": "4.0", "duration": 15, "questions": []
+    }
+}
+STUDENT_RESPONSE = {
+    "user_id": "YcDFSO4ZukTJnnFMgRNVwZTE4j42", "submitted_at": "2025-01-17T15:51:29.859+05:30",
+    "score": 108, "accuracy": "90 %", "correct_answers": 27, "incorrect_answers": 3,
+    "negative_score": "3.0", "final_score": "105.0", "rank_text": "Topic Rank - #-171", "response_map": {}
+}
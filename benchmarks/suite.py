@@ -0,0 +1,144 @@
+"""Repeatable latency/throughput/memory report for every hot path, on synthetic data of a chosen size.
+
+Covers the background snapshot refresh, the `/all`, `/performance` and `/latestquiz` endpoints, topic analytics
+(`tools.performance_analysis`), FAISS retrieval and the RetrievalQA chain behind
+`pages/ai_analysis.py`, and mentor prompt construction for `crew_ai.py`. Upstream quiz
+APIs are served by a local stub, and embeddings and the LLM are offline fakes, so runs
+need no network or API keys. Everything runs inside a temporary directory.
+
+Run from the repository root:
+    python -m benchmarks.suite [--attempts 10000] [--questions 2000] [--repeat 50]
+                               [--output bench.json] [--baseline bench.json] [--tolerance 0.2]
+
+With `--baseline`, exits with status 1 if any component's median latency or peak memory
+grew by more than the tolerance.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from fastapi.testclient import TestClient
+from api import app
+from benchmarks.fakes import FakeEmbeddings, fake_llm
+from benchmarks.report import load_report, measure, print_report, regressions, save_report
+from benchmarks.stub_server import LATEST_QUIZ, STUDENT_RESPONSE, StubServer
+from benchmarks.synthetic import TOPICS, make_history, make_raw_attempt, write_dataset
+from data_modules import latest_quiz_preprocessing, past_quizzes_preprocessing
+from data_modules.snapshots import current_quiz_store, refresh_snapshot
+from data_modules.upstream import close_http_client
+from tools.performance_analysis import analyze_all_topics, analyze_performance
+from tools.prompt_builder import build_mentor_task_description
+from tools.retrieval_service import RetrievalService
+
+
+def get(client, path):
+    def call():
+        client.get(path).raise_for_status()
+    return call
+
+
+def refresh():
+    async def run():
+        try:
+            await refresh_snapshot()
+        finally:
+            await close_http_client()
+    asyncio.run(run())
+
+
+def bench_api(results, repeat, upstream_delay, attempts, seed):
+    # Upstream serves the same history the local files were seeded with, so a refresh adds nothing
+    history = [make_raw_attempt(attempt) for attempt in make_history(attempts, seed)]
+    routes = {"/history": history, "/quiz": LATEST_QUIZ, "/student": STUDENT_RESPONSE}
+    with StubServer(routes, delay=upstream_delay) as server:
+        past_quizzes_preprocessing.API_URL = f"{server.url}/history"
+        latest_quiz_preprocessing.QUIZ_API = f"{server.url}/quiz"
+        latest_quiz_preprocessing.STUDENT_API = f"{server.url}/student"
+        results["snapshot refresh"] = measure(refresh, repeat=max(1, repeat // 10), warmup=1)
+
+    # ✅ Requests read the snapshot just published; none of them reaches upstream
+    with TestClient(app) as client:
+        results["api /all"] = measure(get(client, "/all"), repeat)
+        results["api /performance"] = measure(get(client, "/performance"), repeat)
+        results["api /latestquiz"] = measure(get(client, "/latestquiz"), repeat)
+
+
+def bench_analytics(results, repeat):
+    store = current_quiz_store()
+    results["store reload"] = measure(store.performance, max(1, repeat // 10), warmup=1, setup=store.invalidate)
+    results["analyze_performance"] = measure(lambda: analyze_performance(TOPICS[0]), repeat)
+    results["analyze_all_topics"] = measure(analyze_all_topics, repeat)
+
+    history, summary = analyze_performance(TOPICS[0])
+    results["mentor prompt build"] = measure(
+        lambda: build_mentor_task_description(TOPICS[0], history, summary), repeat
+    )
+
+
+def bench_retrieval(results, repeat):
+    embeddings = FakeEmbeddings()
+
+    def build():
+        return RetrievalService(llm=fake_llm(), embeddings=embeddings)
+
+    results["retrieval index build"] = measure(
+        build, repeat=1, warmup=0, setup=lambda: shutil.rmtree("faiss_index", ignore_errors=True)
+    )
+
+    service = build()
+    question = "Which statement about human reproduction is correct?"
+    results["retrieval search k=4"] = measure(lambda: service.retrieve(question), repeat)
+    results["retrieval qa chain (uncached)"] = measure(lambda: service.qa_chain.run(question), repeat)
+    results["retrieval answer (cached)"] = measure(lambda: service.answer(question), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attempts", type=int, default=10_000)
+    parser.add_argument("--questions", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--upstream-delay", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    parameters = {"attempts": args.attempts, "questions": args.questions, "repeat": args.repeat,
+                  "upstream_delay": args.upstream_delay, "seed": args.seed}
+
+    # ✅ Resolve output paths before leaving the repository root
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = load_report(args.baseline) if args.baseline else None
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="quiz-bench-") as workdir:
+        write_dataset(workdir, args.attempts, args.questions, args.seed)
+        os.chdir(workdir)
+        try:
+            bench_api(results, args.repeat, args.upstream_delay, args.attempts, args.seed)
+            bench_analytics(results, args.repeat)
+            bench_retrieval(results, args.repeat)
+        finally:
+            os.chdir(cwd)
+
+    print(f"{args.attempts} attempts, {args.questions} questions, {args.repeat} calls per component")
+    print_report(results)
+    if output:
+        save_report(results, output, parameters)
+
+    if baseline:
+        if baseline["parameters"] != parameters:
+            print(f"⚠️ Baseline was recorded with different parameters: {baseline['parameters']}")
+        found = regressions(baseline, results, args.tolerance)
+        for line in found:
+            print(f"❌ Regression: {line}")
+        if found:
+            sys.exit(1)
+        print("✅ No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
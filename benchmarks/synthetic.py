@@ -0,0 +1,121 @@
+"""Synthetic data matching the quiz_data.json and quiz_knowledge_base.json schemas, for benchmarks."""
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+TOPICS = [
+    "Body Fluids and Circulation", "Human Reproduction", "principles of inheritance and variation",
+    "microbes in human welfare", "reproductive health", "human health and disease",
+    "Respiration and Gas Exchange", "Structural Organisation in Animals", "Plant Kingdom", "Cell Cycle"
+]
+
+IST = timezone(timedelta(hours=5, minutes=30))
+START = datetime(2024, 1, 1, tzinfo=IST)
+
+
+def make_attempt(rng, quiz_id=None, started_at=None, topic=None):
+    """One cleaned quiz attempt with the same fields and types as quiz_data.json."""
+    topic = topic or rng.choice(TOPICS)
+    total_questions = rng.choice([20, 23, 41, 55, 59, 89, 100])
+    correct = rng.randint(0, total_questions)
+    incorrect = rng.randint(0, total_questions - correct)
+    started_at = started_at or START + timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+    ended_at = started_at + timedelta(minutes=rng.randint(5, 30))
+    return {
+        "quiz_id": quiz_id if quiz_id is not None else rng.randint(1, 200),
+        "score": correct * 4,
+        "accuracy": round(100 * correct / max(1, correct + incorrect), 1),
+        "speed": float(rng.randint(50, 100)),
+        "correct_answers": correct,
+        "incorrect_answers": incorrect,
+        "correct_answer_marks": 4.0,
+        "negative_marks": 1.0,
+        "negative_score": float(incorrect),
+        "total_questions": total_questions,
+        "started_at": started_at.isoformat(timespec="milliseconds"),
+        "ended_at": ended_at.isoformat(timespec="milliseconds"),
+        "submitted_at": ended_at.isoformat(timespec="milliseconds"),
+        "duration": "15:00",
+        "initial_mistake_count": incorrect + rng.randint(0, 5),
+        "mistakes_corrected": rng.randint(0, incorrect) if incorrect else 0,
+        "date": ended_at.date().isoformat(),
+        "topic": topic,
+        "title": f"{topic.split()[0].title()} ({rng.randint(1, 20)})"
+    }
+
+
+def make_history(count, seed=0):
+    """A single student's quiz history with `count` attempts."""
+    rng = random.Random(seed)
+    return [make_attempt(rng) for _ in range(count)]
+
+
+def make_raw_attempt(attempt):
+    """The upstream (jsonserve) form of a cleaned attempt, as `clean_quiz` receives it."""
+    raw = {key: attempt[key] for key in (
+        "quiz_id", "score", "correct_answers", "incorrect_answers", "started_at", "ended_at", "submitted_at",
+        "duration", "initial_mistake_count", "mistakes_corrected"
+    )}
+    raw.update(accuracy=f"{attempt['accuracy']} %", speed=str(attempt["speed"]),
+               negative_score=str(attempt["negative_score"]))
+    raw["quiz"] = {"topic": attempt["topic"], "title": attempt["title"], "questions_count": attempt["total_questions"],
+                   "correct_answer_marks": str(attempt["correct_answer_marks"]),
+                   "negative_marks": str(attempt["negative_marks"])}
+    return raw
+
+
+def make_question(rng, question_id):
+    """One knowledge-base entry with the same fields as quiz_knowledge_base.json."""
+    topic = rng.choice(TOPICS)
+    options = [f"{topic.split()[0]} option {rng.randint(1, 999)}" for _ in range(4)]
+    answered = rng.random() < 0.8
+    return {
+        "question_id": question_id,
+        "question": f"Which statement about {topic.lower()} is correct? (variant {question_id})",
+        "answer_id": question_id * 4,
+        "answer": options[0],
+        "student_answered": "Yes" if answered else "No",
+        "was_answer_correct": "Yes" if answered and rng.random() < 0.6 else "No",
+        "other_options": options[1:],
+        "context": f"Explanation: {topic} " + " ".join(
+            rng.choice(["cells", "tissue", "membrane", "organ", "hormone", "enzyme", "gene", "fluid"])
+            for _ in range(rng.randint(40, 160))
+        )
+    }
+
+
+def make_knowledge_base(count, seed=0):
+    """A `{"quiz_questions": [...]}` knowledge base with `count` questions."""
+    rng = random.Random(seed)
+    return {"quiz_questions": [make_question(rng, question_id) for question_id in range(1, count + 1)]}
+
+
+def write_dataset(directory, attempts, questions, seed=0):
+    """Writes quiz_data.json and quiz_knowledge_base.json of the given sizes into `directory`."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "quiz_data.json"), "w", encoding="utf-8") as f:
+        json.dump(make_history(attempts, seed), f)
+    with open(os.path.join(directory, "quiz_knowledge_base.json"), "w", encoding="utf-8") as f:
+        json.dump(make_knowledge_base(questions, seed), f)
+
+
+def make_quiz_source(rng, quiz_id, questions=100):
+    """Raw upstream payloads for one quiz and one student's response to it, as lastquizdata fetches them."""
+    topic = rng.choice(TOPICS)
+    quiz_questions, response_map = [], {}
+    for offset in range(questions):
+        question_id = quiz_id * 1000 + offset
+        options = [{"id": question_id * 4 + n, "description": f"{topic.split()[0]} option {n}",
+                    "is_correct": n == 0} for n in range(4)]
+        solution = " ".join(rng.choice(["cells", "tissue", "membrane", "organ", "hormone", "enzyme"])
+                            for _ in range(rng.randint(40, 160)))
+        quiz_questions.append({
+            "id": question_id, "description": f"Which statement about {topic.lower()} is correct? ({question_id})",
+            "detailed_solution": f"**Explanation:** <p>{solution}</p>\n\n*{topic}*", "options": options
+        })
+        if rng.random() < 0.8:
+            response_map[str(question_id)] = rng.choice(options)["id"]
+    quiz = {"quiz": {"id": quiz_id, "topic": topic, "questions": quiz_questions}}
+    student = {"user_id": f"student-{quiz_id % 50}", "quiz_id": quiz_id, "response_map": response_map}
+    return quiz, student
@@ -8,6 +8,50 @@ load_dotenv()
 FASTAPI_URL = "http://127.0.0.1:8000"
 # FASTAPI_PERFORMANCE_URL = "http://127.0.0.1:8000/performance"
 
+# API concurrency: threads for blocking file/SQLite/pandas work, and uvicorn worker processes
+API_WORKER_THREADS = int(os.getenv("API_WORKER_THREADS", "8"))
+API_PROCESSES = int(os.getenv("API_PROCESSES", "1"))
+
+# Embedding pipeline: sentences per model call, and torch threads (0 keeps the torch default)
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+
+# Vector index backend: "flat" (exact float32 FAISS index), or a compressed, memory-mapped
+# "ivfpq" / "ivf-fp16" index for large question banks; nprobe trades recall for speed
+VECTOR_INDEX_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "flat")
+VECTOR_INDEX_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "16"))
+
+# AI Quiz Insights answer cache. The embedding-based lookup is off by default (0): near-duplicate
+# MCQs (same stem, different options) can clear a high threshold and get each other's answer
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+ANSWER_CACHE_TTL_SECONDS = int(os.getenv("ANSWER_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0"))
+
+# Mentor reports: crew runs allowed at the same time (protects LLM rate limits)
+MENTOR_REPORT_CONCURRENCY = int(os.getenv("MENTOR_REPORT_CONCURRENCY", "2"))
+
+# Approximate token budget for the quiz history embedded in the mentor prompt
+MENTOR_PROMPT_TOKEN_BUDGET = int(os.getenv("MENTOR_PROMPT_TOKEN_BUDGET", "1500"))
+
+# API responses smaller than this are sent uncompressed (gzip, or brotli when brotli-asgi is installed)
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# Upstream snapshots: directory of published versions, how often the API refreshes them (0 = never,
+# e.g. when a separate refresher process runs), when a snapshot counts as stale (still served, but
+# a refresh is triggered), the pause after a failed refresh, and how many old versions are kept
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots")
+SNAPSHOT_REFRESH_SECONDS = int(os.getenv("SNAPSHOT_REFRESH_SECONDS", "300"))
+SNAPSHOT_STALE_SECONDS = int(os.getenv("SNAPSHOT_STALE_SECONDS", "900"))
+SNAPSHOT_RETRY_SECONDS = int(os.getenv("SNAPSHOT_RETRY_SECONDS", "30"))
+SNAPSHOT_KEEP = int(os.getenv("SNAPSHOT_KEEP", "3"))
+
+# Opt-in columnar copy of each snapshot's quiz history for topic analytics (needs pyarrow): "ipc" (Arrow
+# files, memory-mapped without decoding), "parquet" (compressed, smaller on disk), or "" (default) for JSON only
+COLUMNAR_FORMAT = os.getenv("COLUMNAR_FORMAT", "")
+
+# Adds a Server-Timing header with per-span durations to every API response (browser dev tools show it)
+SERVER_TIMING_HEADERS = os.getenv("SERVER_TIMING_HEADERS", "0") == "1"
+
 
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -16,9 +60,11 @@ SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "dummy_value")
 
 
-if not YOUTUBE_API_KEY:
-    print("⚠️ Warning: YOUTUBE_API_KEY is missing! Check your .env file.")
-if not SERPER_API_KEY:
-    print("⚠️ Warning: SERPER_API_KEY is missing! Check your .env file.")
-if not OPENAI_API_KEY:
-    print("⚠️ Warning: OPENAI_API_KEY is missing! Using default 'dummy_value'.")
\ No newline at end of file
+def warn_missing_keys():
+    """Prints a warning for each missing API key. Called by the components that need the keys."""
+    if not YOUTUBE_API_KEY:
+        print("⚠️ Warning: YOUTUBE_API_KEY is missing! Check your .env file.")
+    if not SERPER_API_KEY:
+        print("⚠️ Warning: SERPER_API_KEY is missing! Check your .env file.")
+    if not OPENAI_API_KEY:
+        print("⚠️ Warning: OPENAI_API_KEY is missing! Using default 'dummy_value'.")
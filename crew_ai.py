@@ -1,22 +1,39 @@
+import threading
 from crewai import Agent, Task, Crew, Process, LLM
-from crewai_tools import SerperDevTool, YoutubeVideoSearchTool
-from config import GOOGLE_API_KEY, SERPER_API_KEY, YOUTUBE_API_KEY
+from config import GOOGLE_API_KEY, SERPER_API_KEY, YOUTUBE_API_KEY, warn_missing_keys
+from data_modules.instrumentation import timed
+from tools.prompt_builder import build_mentor_task_description
+from tools.tool_cache import CachedTool, get_tool_cache, prewarm
 
+# Search tools and the Gemini LLM are built on first use, not when the module is imported
+_clients = None
+_clients_lock = threading.Lock()
 
-google_search_tool = SerperDevTool(api_key=SERPER_API_KEY)
-youtube_search_tool = YoutubeVideoSearchTool(api_key=YOUTUBE_API_KEY)
-import json
 
-gemini_llm = LLM(
-    model="gemini/gemini-1.5-pro-latest",
-    api_key=GOOGLE_API_KEY,
-    temperature=0.7
-)
+def get_crew_clients():
+    """Returns `(google_search_tool, youtube_search_tool, gemini_llm)`, constructing them once per process."""
+    global _clients
+    with _clients_lock:
+        if _clients is None:
+            from crewai_tools import SerperDevTool, YoutubeVideoSearchTool
 
-import json
+            warn_missing_keys()
+            # ✅ Search results are cached on disk by normalized query, so repeat topics skip the external APIs
+            google_search_tool = CachedTool(SerperDevTool(api_key=SERPER_API_KEY), get_tool_cache())
+            youtube_search_tool = CachedTool(YoutubeVideoSearchTool(api_key=YOUTUBE_API_KEY), get_tool_cache())
 
-def create_crewai_agent(topic, quiz_data_json, performance_summary):
+            gemini_llm = LLM(
+                model="gemini/gemini-1.5-pro-latest",
+                api_key=GOOGLE_API_KEY,
+                temperature=0.7
+            )
+            _clients = (google_search_tool, youtube_search_tool, gemini_llm)
+        return _clients
+
+
+def create_crewai_agent(topic, quiz_data_json, performance_summary, step_callback=None):
     """Creates CrewAI system with full quiz history and performance trends."""
+    google_search_tool, youtube_search_tool, gemini_llm = get_crew_clients()
 
     student_guide = Agent(
         role="Student Performance Guide",
@@ -33,25 +50,8 @@ def create_crewai_agent(topic, quiz_data_json, performance_summary):
     )
 
 
-    quiz_data_str = json.dumps(quiz_data_json, indent=4).replace("{", "{{").replace("}", "}}")
-
-
-    guide_task_description = (
-        f"Analyze the student's quiz performance in **{topic}**.\n\n"
-        f"### 📊 **Performance Trends**\n"
-        f"{performance_summary}\n\n"
-        f"Here is the student's complete quiz history:\n\n"
-        f"{quiz_data_str}\n\n"  
-        f"### 🔹 Key Points to Analyze:\n"
-        f"1️⃣ **Highlight weak areas, improvement trends, and performance gaps for a given user.**\n\n"
-        f"2️⃣ **Identify specific strengths and weaknesses with creative labels or insights.**\n"
-        f"3️⃣ **Analyze if the student is improving over multiple attempts.**\n"
-        f"4️⃣ **Detect the weakest concepts based on repeated mistakes.**\n\n"
-        f"5️⃣ **Use `youtube_search_tool.run('{topic} tutorial')` to find 2 relevant YouTube videos.**\n"
-        f"6️⃣ **Use `google_search_tool.run('{topic} tutorial')` to find 2 relevant articles.**\n"
-        f"7️⃣ **Ensure the YouTube video links are clickable for easy access.**"
-        f"🎯 **Your output MUST include clickable YouTube and article links.**"
-    )
+    # ✅ Recent attempts in full, older ones summarized, within MENTOR_PROMPT_TOKEN_BUDGET
+    guide_task_description = build_mentor_task_description(topic, quiz_data_json, performance_summary)
 
     guide_task = Task(
         description=guide_task_description,
@@ -63,7 +63,39 @@ def create_crewai_agent(topic, quiz_data_json, performance_summary):
     crew = Crew(
         agents=[student_guide],
         tasks=[guide_task],
-        process=Process.sequential
+        process=Process.sequential,
+        step_callback=step_callback
     )
 
     return crew
+
+
+@timed("llm.mentor_report")
+def run_mentor_report(topic, quiz_history, performance_summary, on_progress=None):
+    """Runs the mentor crew for a topic and returns the report text.
+
+    `on_progress` receives a text rendering of every agent step as it happens.
+    """
+    step_callback = (lambda step: on_progress(str(step))) if on_progress else None
+    crew = create_crewai_agent(topic, quiz_data_json=quiz_history, performance_summary=performance_summary,
+                               step_callback=step_callback)
+    result = crew.kickoff(inputs={
+        "topic": topic,
+        "quiz_history": quiz_history
+    })
+
+    if hasattr(result, "raw") and isinstance(result.raw, str):
+        return result.raw
+    return str(result)
+
+
+def prewarm_search_cache(topics=None):
+    """Fills the search cache for every known topic so mentor runs find their resources already cached."""
+    from tools.data_fetcher import get_available_topics
+
+    google_search_tool, youtube_search_tool, _ = get_crew_clients()
+    prewarm([google_search_tool, youtube_search_tool], topics if topics is not None else get_available_topics())
+
+
+if __name__ == "__main__":
+    prewarm_search_cache()
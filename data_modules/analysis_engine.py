@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from data_modules.quiz_metrics import HISTORY_TIME_FORMAT, topic_key
+
+def _rate(part, whole):
+    return np.divide(part * 100.0, whole, out=np.zeros(len(part)), where=whole > 0)
+
+
+class TopicAnalysisEngine:
+    """Vectorized per-topic analytics over a typed quiz frame.
+
+    The frame is sorted once by (lower-cased topic, started_at) so that every topic is a
+    contiguous slice. A topic's statistics are then slice reductions, and the statistics
+    of all topics at once are `np.add.reduceat` over the slice boundaries.
+    """
+
+    def __init__(self, df):
+        """`df` is a non-empty frame from `dataset_store.build_frame`."""
+        codes, self.topic_keys = pd.factorize(df["topic"].astype(str).str.lower(), sort=True)
+        started_ns = df["started_at"].array.asi8
+
+        order = np.lexsort((started_ns, codes))
+        self.frame = df.iloc[order].reset_index(drop=True)
+        codes = codes[order]
+        topic_codes = np.arange(len(self.topic_keys))
+        self.starts = np.searchsorted(codes, topic_codes, side="left")
+        self.ends = np.searchsorted(codes, topic_codes, side="right")
+        self._compute_metrics()
+        self._histories = {}
+
+    def _compute_metrics(self):
+        frame = self.frame
+        correct = frame["correct_answers"].to_numpy(dtype=np.float64)
+        incorrect = frame["incorrect_answers"].to_numpy(dtype=np.float64)
+        total = frame["total_questions"].to_numpy(dtype=np.float64)
+
+        attempted = correct + incorrect
+        unattempted = np.maximum(total - attempted, 0)
+        self.metrics = {
+            "total_attempted": attempted,
+            "total_unattempted": unattempted,
+            "accuracy_rate": _rate(correct, attempted),
+            "attempt_rate": _rate(attempted, total),
+            "unanswered_rate": _rate(unattempted, total),
+            "net_score": correct * frame["correct_answer_marks"].to_numpy(dtype=np.float64)
+                         - incorrect * frame["negative_marks"].to_numpy(dtype=np.float64)
+        }
+        for column, values in self.metrics.items():
+            frame[column] = values.astype(np.int64) if column.startswith("total_") else values
+
+    def _bounds(self, topic):
+        code = self.topic_keys.get_indexer([topic_key(topic)])[0]
+        if code < 0:
+            return None
+        return self.starts[code], self.ends[code]
+
+    def _started_at(self, position):
+        return self.frame["started_at"].iloc[position].strftime(HISTORY_TIME_FORMAT)
+
+    def topic_summary(self, topic):
+        """Aggregates for one topic (case-insensitive), or None if it has no attempts."""
+        bounds = self._bounds(topic)
+        if bounds is None:
+            return None
+
+        start, end = bounds
+        accuracy, net_score = self.metrics["accuracy_rate"], self.metrics["net_score"]
+        return {
+            "total_quizzes": int(end - start),
+            "average_accuracy": float(accuracy[start:end].mean()),
+            "average_attempt_rate": float(self.metrics["attempt_rate"][start:end].mean()),
+            "average_unanswered_rate": float(self.metrics["unanswered_rate"][start:end].mean()),
+            "first_started_at": self._started_at(start),
+            "latest_started_at": self._started_at(end - 1),
+            "accuracy_change": float(accuracy[end - 1] - accuracy[start]),
+            "net_score_change": float(net_score[end - 1] - net_score[start])
+        }
+
+    def all_topic_summaries(self):
+        """Aggregates for every topic at once, as a DataFrame indexed by lower-cased topic."""
+        counts = self.ends - self.starts
+        first, latest = self.starts, self.ends - 1
+        accuracy, net_score = self.metrics["accuracy_rate"], self.metrics["net_score"]
+        started = self.frame["started_at"]
+        return pd.DataFrame({
+            "topic": self.frame["topic"].astype(str).to_numpy()[first],
+            "total_quizzes": counts,
+            "average_accuracy": np.add.reduceat(accuracy, self.starts) / counts,
+            "average_attempt_rate": np.add.reduceat(self.metrics["attempt_rate"], self.starts) / counts,
+            "average_unanswered_rate": np.add.reduceat(self.metrics["unanswered_rate"], self.starts) / counts,
+            "first_started_at": started.iloc[first].dt.strftime(HISTORY_TIME_FORMAT).to_numpy(),
+            "latest_started_at": started.iloc[latest].dt.strftime(HISTORY_TIME_FORMAT).to_numpy(),
+            "accuracy_change": accuracy[latest] - accuracy[first],
+            "net_score_change": net_score[latest] - net_score[first]
+        }, index=pd.Index(self.topic_keys, name="topic_key"))
+
+    def topic_history(self, topic):
+        """Chronological attempts for a topic with display-formatted timestamps (cached per topic)."""
+        bounds = self._bounds(topic)
+        if bounds is None:
+            return []
+
+        key = topic_key(topic)
+        if key not in self._histories:
+            history = self.frame.iloc[bounds[0]:bounds[1]].copy()
+            for column in ["started_at", "ended_at"]:
+                history[column] = history[column].dt.strftime(HISTORY_TIME_FORMAT)
+            for column in history.columns:
+                if isinstance(history[column].dtype, pd.CategoricalDtype):
+                    history[column] = history[column].astype(str)
+            self._histories[key] = history.to_dict(orient="records")
+        return self._histories[key]
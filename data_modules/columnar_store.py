@@ -0,0 +1,153 @@
+import os
+import threading
+from data_modules.dataset_store import build_frame
+from data_modules.instrumentation import span
+from data_modules.quiz_metrics import topic_key
+
+# **Partitioned Columnar Layout**
+# <dir>/topic_key=<lower-cased topic>/month=<YYYY-MM>/part-0.<ext>, with typed columns:
+# timestamps parsed, `topic`/`title` dictionary-encoded
+PARTITION_COLUMNS = ["topic_key", "month"]
+FORMAT_EXTENSIONS = {"ipc": "arrow", "parquet": "parquet"}
+
+# Columns the per-topic aggregates need (`TopicAnalysisEngine` without `topic_history`)
+SUMMARY_COLUMNS = [
+    "topic", "started_at", "correct_answers", "incorrect_answers", "total_questions",
+    "correct_answer_marks", "negative_marks"
+]
+
+
+def columnar_available():
+    try:
+        import pyarrow  # noqa: F401  Optional: without it, analytics stay on the JSON history
+    except ImportError:
+        return False
+    return True
+
+
+def columnar_name(base, file_format):
+    """Directory name for a dataset of `base` in `file_format`, e.g. `quiz_attempts.arrow`."""
+    return f"{base}.{FORMAT_EXTENSIONS[file_format]}"
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([(column, pa.string()) for column in PARTITION_COLUMNS]), flavor="hive")
+
+
+def _partitioned_table(records):
+    import pyarrow as pa
+
+    frame = build_frame(records)
+    if frame.empty:
+        return None
+    frame["topic_key"] = frame["topic"].astype(str).str.lower()
+    frame["month"] = frame["started_at"].dt.strftime("%Y-%m")
+    return pa.Table.from_pandas(frame, preserve_index=False)
+
+
+def write_columnar(records, path, file_format="ipc"):
+    """Writes quiz records as a dataset partitioned by topic and month at `path` (a new directory)."""
+    import pyarrow.dataset as ds
+
+    table = _partitioned_table(records)
+    if table is None:
+        os.makedirs(path)
+        return
+    ds.write_dataset(table, path, format=file_format, partitioning=_partitioning(),
+                     basename_template=f"part-{{i}}.{FORMAT_EXTENSIONS[file_format]}")
+
+
+def append_columnar(records, path, file_format, tag):
+    """Adds quiz records to a dataset written by `write_columnar`, as new `part-<tag>-<i>` files.
+
+    Existing files are never rewritten (they may be shared with older snapshots), and the
+    new rows are cast to the dataset's schema so every fragment reads back alike.
+    """
+    import pyarrow.dataset as ds
+
+    table = _partitioned_table(records)
+    if table is None:
+        return
+    existing = ds.dataset(path, format=file_format, partitioning=_partitioning())
+    if existing.files:
+        table = table.select(existing.schema.names).cast(existing.schema)
+    ds.write_dataset(table, path, format=file_format, partitioning=_partitioning(),
+                     basename_template=f"part-{tag}-{{i}}.{FORMAT_EXTENSIONS[file_format]}",
+                     existing_data_behavior="overwrite_or_ignore")
+
+
+class ColumnarQuizHistory:
+    """Topic analytics over a dataset written by `write_columnar`, read through memory maps.
+
+    A topic query reads only that topic's partitions, and the all-topics aggregates read only
+    SUMMARY_COLUMNS, instead of parsing the whole history. The dataset is immutable, so
+    engines are cached per topic for the life of the object.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = "parquet" if path.endswith(".parquet") else "ipc"
+        self._lock = threading.Lock()
+        self._dataset = None
+        self._engines = {}
+        self._summaries = None
+
+    def dataset(self):
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+
+        with self._lock:
+            if self._dataset is None:
+                # ✅ use_mmap: files are mapped, so only the pages of the columns read are loaded
+                self._dataset = ds.dataset(self.path, format=self.format, partitioning=_partitioning(),
+                                           filesystem=fs.LocalFileSystem(use_mmap=True))
+            return self._dataset
+
+    def count(self):
+        return self.dataset().count_rows()
+
+    def frame(self, topic=None, columns=None):
+        """Typed DataFrame of one topic's partitions (or all of them), limited to `columns`."""
+        import pyarrow.dataset as ds
+
+        dataset = self.dataset()
+        columns = columns or [name for name in dataset.schema.names if name not in PARTITION_COLUMNS]
+        condition = ds.field("topic_key") == topic_key(topic) if topic is not None else None
+        with span("dataset.columnar_read"):
+            return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+    def _engine(self, topic):
+        key = topic_key(topic)
+        with self._lock:
+            engine = self._engines.get(key)
+        if engine is None and key not in self._engines:
+            frame = self.frame(topic)
+            from data_modules.analysis_engine import TopicAnalysisEngine
+
+            engine = TopicAnalysisEngine(frame) if not frame.empty else None
+            with self._lock:
+                self._engines[key] = engine
+        return engine
+
+    def topic_summary(self, topic):
+        engine = self._engine(topic)
+        return engine.topic_summary(topic) if engine else None
+
+    def topic_history(self, topic):
+        engine = self._engine(topic)
+        return engine.topic_history(topic) if engine else []
+
+    def all_topic_summaries(self):
+        if self._summaries is None:
+            frame = self.frame(columns=SUMMARY_COLUMNS)
+            if frame.empty:
+                import pandas as pd
+
+                return pd.DataFrame()
+            from data_modules.analysis_engine import TopicAnalysisEngine
+
+            self._summaries = TopicAnalysisEngine(frame).all_topic_summaries()
+        return self._summaries
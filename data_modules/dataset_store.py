@@ -0,0 +1,295 @@
+import json
+import os
+import threading
+from data_modules.instrumentation import span
+from data_modules.quiz_metrics import PerformanceReport, attempt_keys, topic_key, with_metrics
+
+# Append-only quiz attempt log (one JSON record per line)
+ATTEMPTS_FILE = "quiz_attempts.jsonl"
+
+# Legacy pretty-printed snapshot, used to seed the attempt log
+DATA_FILE = "quiz_data.json"
+
+# **Column Types for the In-Memory Frame**
+INT_COLUMNS = [
+    "quiz_id", "score", "correct_answers", "incorrect_answers", "total_questions",
+    "initial_mistake_count", "mistakes_corrected"
+]
+FLOAT_COLUMNS = ["accuracy", "speed", "correct_answer_marks", "negative_marks", "negative_score"]
+CATEGORY_COLUMNS = ["topic", "title"]
+TIMESTAMP_COLUMNS = ["started_at", "ended_at"]
+
+
+def parse_timestamps(values):
+    """Parses ISO timestamps, falling back to UTC when offsets are mixed."""
+    import pandas as pd
+
+    try:
+        return pd.to_datetime(values)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, utc=True)
+
+
+def build_frame(records):
+    """Builds a typed columnar DataFrame from raw quiz records."""
+    import pandas as pd  # ✅ Deferred: `/all` and `/performance` are served without pandas
+
+    df = pd.DataFrame(records)
+    if df.empty:
+        return df
+
+    for column in INT_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype("int64")
+    for column in FLOAT_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype("float64")
+    for column in CATEGORY_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype("category")
+    for column in TIMESTAMP_COLUMNS:
+        if column in df:
+            df[column] = parse_timestamps(df[column])
+    return df
+
+
+class QuizDatasetStore:
+    """Keeps a quiz history file parsed in memory, together with its precomputed
+    performance report, typed frame and topic engine, and reloads it when the file changes on disk.
+
+    `.jsonl` files are treated as append-only: when such a file grows, only the new
+    lines are read, folded into the running report and appended to the typed frame.
+    The topic engine is re-sorted from the frame on the next topic query.
+
+    With a `columnar` copy of an immutable history (`ColumnarQuizHistory`), topic queries
+    read its partitions instead, and never parse the JSON file.
+    """
+
+    def __init__(self, path=ATTEMPTS_FILE, seed_path=None, columnar=None):
+        self.path = path
+        self.seed_path = seed_path
+        self.columnar = columnar
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self._signature = None
+        self._offset = 0
+        self._records = []
+        self._keys = set()
+        self._report = PerformanceReport()
+        self._pending = []
+        self._frame = None
+        self._engine = None
+
+    @property
+    def append_only(self):
+        return self.path.endswith(".jsonl")
+
+    def _seed(self):
+        """Converts the legacy JSON snapshot into the attempt log the first time it is needed."""
+        if os.path.exists(self.path) or not self.seed_path or not os.path.exists(self.seed_path):
+            return
+        with open(self.seed_path, "r") as f:
+            self.replace(json.load(f))
+
+    def _file_signature(self):
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _apply(self, records):
+        for quiz in records:
+            quiz = with_metrics(quiz)
+            self._records.append(quiz)
+            self._keys.update(attempt_keys(quiz))
+            self._report.add(quiz)
+            self._pending.append(quiz)
+        if records:
+            self._engine = None
+
+    def _read_tail(self):
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]  # Leave a half-written last line for the next read
+        self._offset += len(complete)
+        return [json.loads(line) for line in complete.splitlines() if line.strip()]
+
+    def _refresh(self):
+        if self._signature is None:
+            with self._lock:
+                self._seed()
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+
+        with self._lock:
+            if signature == self._signature:
+                return
+
+            appended = (
+                self.append_only and self._signature is not None
+                and signature[0] == self._signature[0] and signature[2] >= self._offset
+            )
+            if not appended:
+                self._clear()
+
+            with span("dataset.load"):
+                if self.append_only:
+                    self._apply(self._read_tail())
+                else:
+                    with open(self.path, "r") as f:
+                        self._apply(json.load(f))
+            self._signature = signature
+
+    def carried_to(self, path, columnar=None):
+        """Returns a store for `path`, a `.jsonl` file that starts with this store's file.
+
+        The parsed records, report and frame are carried over, so the new store only reads the
+        lines appended after them instead of re-parsing the whole log.
+        """
+        self._refresh()
+        store = QuizDatasetStore(path, columnar=columnar)
+        with self._lock:
+            store._offset = self._offset
+            store._records = list(self._records)
+            store._keys = set(self._keys)
+            store._report = self._report.copy()
+            store._pending = list(self._pending)
+            store._frame = self._frame
+            store._engine = self._engine
+        # ✅ Looks like this file before it grew, so the next read folds in only the tail
+        store._signature = (store._file_signature()[0], None, None)
+        return store
+
+    def exists(self):
+        return os.path.exists(self.path) or bool(self.seed_path and os.path.exists(self.seed_path))
+
+    def records(self):
+        """Returns the quiz records with their metrics. Callers must treat the list as read-only."""
+        self._refresh()
+        return self._records
+
+    def scan(self, start=0, topic=None, from_date=None, to_date=None):
+        """Yields `(position, quiz)` in file order from `start`, filtered by topic (case-insensitive)
+        and by an inclusive `started_at` date range (ISO `YYYY-MM-DD` strings).
+
+        Positions are stable while the log is only appended to, so they can be used as cursors.
+        Attempts appended after the scan starts are not included.
+        """
+        records = self.records()
+        key = topic_key(topic) if topic else None
+        for position in range(start, len(records)):
+            quiz = records[position]
+            if key is not None and topic_key(quiz["topic"]) != key:
+                continue
+            day = quiz["started_at"][:10]
+            if (from_date and day < from_date) or (to_date and day > to_date):
+                continue
+            yield position, quiz
+
+    def _current_frame(self):
+        """Folds records appended since the last call into the typed frame (caller holds the lock)."""
+        if self._pending:
+            with span("dataset.frame"):
+                fresh = build_frame(self._pending)
+                if self._frame is None or self._frame.empty:
+                    self._frame = fresh
+                else:
+                    import pandas as pd
+
+                    frame = pd.concat([self._frame, fresh], ignore_index=True)
+                    for column in CATEGORY_COLUMNS:
+                        frame[column] = frame[column].astype("category")
+                    self._frame = frame
+            self._pending = []
+        if self._frame is None:
+            self._frame = build_frame([])
+        return self._frame
+
+    def frame(self):
+        """Returns the typed DataFrame, extended lazily with new rows. Callers must copy before mutating."""
+        self._refresh()
+        with self._lock:
+            return self._current_frame()
+
+    def engine(self):
+        """Returns the vectorized topic engine for the current data, or None when there are no quizzes."""
+        self._refresh()
+        with self._lock:
+            if self._engine is None:
+                frame = self._current_frame()
+                if not frame.empty:
+                    from data_modules.analysis_engine import TopicAnalysisEngine
+
+                    with span("analysis.engine_build"):
+                        self._engine = TopicAnalysisEngine(frame)
+            return self._engine
+
+    def version(self):
+        """Opaque token that changes whenever the stored attempts change (for ETags)."""
+        self._refresh()
+        inode, mtime_ns, size = self._signature
+        return f"{inode:x}-{mtime_ns:x}-{size:x}"
+
+    def performance(self):
+        """Returns the precomputed `/performance` payload, or None when there are no quizzes."""
+        self._refresh()
+        return self._report.as_dict()
+
+    def has_records(self):
+        if self.columnar is not None:
+            return self.columnar.count() > 0
+        return bool(self.records())
+
+    def topic_summary(self, topic):
+        """Returns the aggregates for a topic (case-insensitive), or None."""
+        if self.columnar is not None:
+            return self.columnar.topic_summary(topic)
+        engine = self.engine()
+        return engine.topic_summary(topic) if engine else None
+
+    def topic_history(self, topic):
+        """Returns the chronologically sorted attempts for a topic (case-insensitive)."""
+        if self.columnar is not None:
+            return self.columnar.topic_history(topic)
+        engine = self.engine()
+        return engine.topic_history(topic) if engine else []
+
+    def all_topic_summaries(self):
+        """Returns the aggregates of every topic as a DataFrame indexed by lower-cased topic."""
+        if self.columnar is not None:
+            return self.columnar.all_topic_summaries()
+        engine = self.engine()
+        if engine is None:
+            import pandas as pd
+
+            return pd.DataFrame()
+        return engine.all_topic_summaries()
+
+    def unseen(self, quizzes):
+        """Filters out attempts whose `quiz_id`/`submitted_at` (or `started_at`) key is already stored."""
+        self._refresh()
+        return [quiz for quiz in quizzes if not any(key in self._keys for key in attempt_keys(quiz))]
+
+    def append(self, records):
+        """Appends records to the attempt log; the aggregates pick them up on the next read."""
+        if not records:
+            return
+        with open(self.path, "a") as f:
+            f.write("".join(json.dumps(quiz) + "\n" for quiz in records))
+
+    def replace(self, records):
+        """Atomically rewrites the whole file with the given records."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            if self.append_only:
+                f.write("".join(json.dumps(quiz) + "\n" for quiz in records))
+            else:
+                json.dump(records, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+    def invalidate(self):
+        with self._lock:
+            self._clear()
+
@@ -0,0 +1,170 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency histogram buckets, as in the Prometheus client defaults
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Spans finished during the current request, for the Server-Timing header (None outside a request)
+_request_spans = contextvars.ContextVar("request_spans", default=None)
+
+
+class Histogram:
+    """Cumulative latency histogram per label set."""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+
+    def observe(self, labels, seconds):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                series["buckets"][i] += 1
+        series["sum"] += seconds
+        series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            pairs = [f'{key}="{_escape(value)}"' for key, value in zip(self.label_names, labels)]
+            for bound, count in zip(BUCKETS, series["buckets"]):
+                lines.append(f"{self.name}_bucket{_labels(pairs, bound)} {count}")
+            lines.append(f"{self.name}_bucket{_labels(pairs, '+Inf')} {series['count']}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {series['sum']:.6f}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {series['count']}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs, bound=None):
+    if bound is not None:
+        pairs = pairs + [f'le="{bound}"']
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsRegistry:
+    """In-process request/span latencies and cache counters, rendered in the Prometheus text format.
+
+    Each API process keeps its own registry; with several uvicorn workers, every scrape of
+    `/metrics` reports the process that served it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Histogram("quiz_api_request_duration_seconds",
+                                  "Time spent handling API requests.", ("method", "route", "status"))
+        self.spans = Histogram("quiz_span_duration_seconds",
+                               "Time spent in instrumented functions.", ("span",))
+        self._caches = {}
+        self._gauges = {}
+
+    def observe_request(self, method, route, status, seconds):
+        with self._lock:
+            self.requests.observe((method, route, str(status)), seconds)
+
+    def observe_span(self, name, seconds):
+        with self._lock:
+            self.spans.observe((name,), seconds)
+
+    def register_cache(self, name, cache):
+        """Exports `cache.hits`/`cache.misses` (and `coalesced`/`semantic_hits`, if present) as counters."""
+        with self._lock:
+            self._caches[name] = lambda: cache
+
+    def register_lazy_cache(self, name, read):
+        """Like `register_cache`, for a cache that `read()` returns once it is loaded (None until then),
+        so a scrape never creates one."""
+        with self._lock:
+            self._caches[name] = read
+
+    def register_gauge(self, name, help_text, read):
+        """Exports `read()` as a gauge on every scrape; a None reading is left out."""
+        with self._lock:
+            self._gauges[name] = (help_text, read)
+
+    def render(self):
+        with self._lock:
+            lines = self.requests.render() + self.spans.render()
+            lines += ["# HELP quiz_cache_requests_total Cache lookups by result.",
+                      "# TYPE quiz_cache_requests_total counter"]
+            for name, read in sorted(self._caches.items()):
+                cache = read()
+                for result in ("hits", "semantic_hits", "misses", "coalesced"):
+                    if hasattr(cache, result):
+                        lines.append(
+                            f'quiz_cache_requests_total{{cache="{_escape(name)}",result="{result}"}} '
+                            f'{getattr(cache, result)}'
+                        )
+            for name, (help_text, read) in sorted(self._gauges.items()):
+                value = read()
+                if value is not None:
+                    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value:.3f}"]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def _record(name, seconds):
+    registry.observe_span(name, seconds)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name):
+    """Times the enclosed block as span `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """Decorator form of `span` for plain and async functions."""
+    def decorate(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start_request():
+    """Starts collecting spans for the current request; returns the token for `end_request`."""
+    return _request_spans.set([])
+
+
+def end_request(token):
+    """Stops collecting and returns the request's spans as `[(name, seconds), ...]`."""
+    spans = _request_spans.get() or []
+    _request_spans.reset(token)
+    return spans
+
+
+def server_timing_header(spans, total_seconds):
+    """`Server-Timing` value listing the total and each span in milliseconds."""
+    entries = [f"app;dur={total_seconds * 1000:.1f}"]
+    entries += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in spans]
+    return ", ".join(entries)
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from data_modules.lastquizdata import build_knowledge_base
+from data_modules.upstream import close_http_client, fetch_json
+
+# **Batch Build Settings**
+FETCH_CONCURRENCY = 16  # Sources downloaded at once
+CLEANING_PROCESSES = None  # Worker processes cleaning text (None = one per CPU)
+
+SQLITE_SUFFIXES = (".sqlite3", ".sqlite", ".db")
+
+
+class JsonlKnowledgeBaseWriter:
+    """Writes one knowledge-base question per line, tagged with its `user_id` and `quiz_id`.
+
+    Lines go to `<path>.tmp`, which replaces `path` when the build finishes, so a re-run
+    rewrites the file instead of duplicating it and an interrupted build leaves the old one.
+    `tools.vector_index.load_knowledge_base` reads the file directly, so it can be embedded
+    without converting it to the single-document JSON format first.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.tmp_path, "w", encoding="utf-8")
+        return self
+
+    def write(self, user_id, quiz_id, questions):
+        self._file.write("".join(
+            json.dumps({"user_id": user_id, "quiz_id": quiz_id, **question}, ensure_ascii=False) + "\n"
+            for question in questions
+        ))
+        self._file.flush()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._file.close()
+        self._file = None
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+
+
+class StudentStoreKnowledgeBaseWriter:
+    """Adds each student's questions to `student_knowledge_base` in a `StudentStore` database."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        return self
+
+    def write(self, user_id, quiz_id, questions):
+        self.store.add_knowledge_base(user_id, questions)
+
+    def __exit__(self, *exc):
+        pass
+
+
+def open_writer(output):
+    """Picks the writer from the output path: `.jsonl` or an SQLite database."""
+    if output.endswith(".jsonl"):
+        return JsonlKnowledgeBaseWriter(output)
+    if output.endswith(SQLITE_SUFFIXES):
+        from data_modules.student_store import StudentStore
+
+        return StudentStoreKnowledgeBaseWriter(StudentStore(output))
+    raise ValueError(f"Unsupported knowledge base output: {output} (expected .jsonl or {', '.join(SQLITE_SUFFIXES)})")
+
+
+def load_sources(path):
+    """Reads a JSON list of `{"quiz_url": ..., "student_url": ...}` sources."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def _build_source(source, semaphore, pool, writer):
+    async with semaphore:
+        quiz, student = await asyncio.gather(
+            fetch_json(source["quiz_url"], "❌ Failed to fetch quiz data"),
+            fetch_json(source["student_url"], "❌ Failed to fetch student data")
+        )
+        quiz = quiz["quiz"]
+        # ✅ Text cleaning is CPU-bound, so it runs in worker processes while other sources download
+        questions = await asyncio.get_running_loop().run_in_executor(
+            pool, build_knowledge_base, quiz["questions"], student
+        )
+    # Writes happen on the event loop thread, one at a time, so writers need no locking
+    writer.write(student.get("user_id"), quiz.get("id"), questions)
+    return len(questions)
+
+
+async def build_knowledge_bases_async(sources, writer, fetch_concurrency=FETCH_CONCURRENCY,
+                                      processes=CLEANING_PROCESSES):
+    """Fetches, cleans and writes every source; a failing source is reported, not fatal.
+
+    At most `fetch_concurrency` sources are in flight, so memory stays bounded however
+    many sources there are: each one's questions are written as soon as they are ready.
+    """
+    semaphore = asyncio.Semaphore(fetch_concurrency)
+    summary = {"sources": len(sources), "built": 0, "questions": 0, "failed": []}
+
+    async def build(source):
+        try:
+            count = await _build_source(source, semaphore, pool, writer)
+        except Exception as e:
+            summary["failed"].append({**source, "error": getattr(e, "detail", None) or repr(e)})
+        else:
+            summary["built"] += 1
+            summary["questions"] += count
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        try:
+            await asyncio.gather(*(build(source) for source in sources))
+        finally:
+            await close_http_client()
+    return summary
+
+
+def build_knowledge_bases(sources, output, fetch_concurrency=FETCH_CONCURRENCY, processes=CLEANING_PROCESSES):
+    """Builds the knowledge bases of many quiz/student sources into `output` (.jsonl or SQLite)."""
+    with open_writer(output) as writer:
+        return asyncio.run(build_knowledge_bases_async(sources, writer, fetch_concurrency, processes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build knowledge bases for many quiz/student sources.")
+    parser.add_argument("sources", help='JSON list of {"quiz_url": ..., "student_url": ...}')
+    parser.add_argument("--output", default="quiz_knowledge_base.jsonl", help=".jsonl file or SQLite database")
+    parser.add_argument("--fetch-concurrency", type=int, default=FETCH_CONCURRENCY)
+    parser.add_argument("--processes", type=int, default=CLEANING_PROCESSES)
+    args = parser.parse_args()
+
+    summary = build_knowledge_bases(load_sources(args.sources), os.path.abspath(args.output),
+                                    args.fetch_concurrency, args.processes)
+    print(f"✅ {summary['built']}/{summary['sources']} sources, {summary['questions']} questions → {args.output}")
+    for failure in summary["failed"]:
+        print(f"❌ {failure['quiz_url']} / {failure['student_url']}: {failure['error']}")
+
+
+if __name__ == "__main__":
+    main()
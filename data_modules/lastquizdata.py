@@ -1,32 +1,8 @@
-import requests
-import json
+import asyncio
+import os
 import re
 
-# **API Endpoints**
-QUIZ_API = "https://www.jsonkeeper.com/b/LLQT"
-STUDENT_API = "https://api.jsonserve.com/rJvd7g"
-
-# **Output JSON File**
-OUTPUT_FILE = "../quiz_knowledge_base.json"
-
-
-# **🔹 Fetch Quiz Data**
-def fetch_quiz_data():
-    response = requests.get(QUIZ_API)
-    if response.status_code == 200:
-        return response.json()["quiz"]["questions"]
-    else:
-        raise Exception("❌ Failed to fetch quiz data")
-
-
-# **🔹 Fetch Student Data**
-def fetch_student_data():
-    response = requests.get(STUDENT_API)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception("❌ Failed to fetch student data")
-
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 def clean_text(text):
@@ -37,10 +13,8 @@ def clean_text(text):
 
 
 
-def process_quiz_data():
-    questions = fetch_quiz_data()
-    student_data = fetch_student_data()
-
+def build_knowledge_base(questions, student_data):
+    """Knowledge-base records for one quiz's questions and one student's response."""
     # Extract student response map (Question ID -> Answer ID)
     response_map = student_data.get("response_map", {})
 
@@ -85,13 +59,40 @@ def process_quiz_data():
             "context": context
         })
 
-    # **Save Data as JSON**
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump({"quiz_questions": quiz_knowledge_base}, f, indent=4, ensure_ascii=False)
+    return quiz_knowledge_base
+
+
+def process_quiz_data():
+    """Refreshes the snapshot from upstream and returns its knowledge-base records."""
+    from data_modules.snapshots import KNOWLEDGE_BASE_FILE, get_snapshot, refresh_snapshot
+    from data_modules.upstream import close_http_client
+
+    async def refresh():
+        try:
+            return await refresh_snapshot()
+        finally:
+            await close_http_client()
+
+    version = asyncio.run(refresh())  # ✅ Published as a new snapshot, never over the served files
+    print(f"✅ Snapshot {version} published")
+    return get_snapshot().document(KNOWLEDGE_BASE_FILE)["quiz_questions"]
+
+
+# **🔹 Refresh the FAISS Index (only changed questions are re-embedded)**
+def refresh_vector_index():
+    from data_modules.snapshots import knowledge_base_path
+    from tools.embedding_cache import CachedEmbeddings
+    from tools.retrieval_service import EMBEDDING_MODEL_NAME
+    from tools.vector_index import default_index_path, sync_knowledge_base_index
 
-    print(f"✅ JSON file '{OUTPUT_FILE}' created successfully!")
+    embedding_model = CachedEmbeddings(EMBEDDING_MODEL_NAME, cache_dir=os.path.join(ROOT_DIR, "embedding_cache"))
+    _, stats = sync_knowledge_base_index(embedding_model, knowledge_base_path(),
+                                         os.path.join(ROOT_DIR, default_index_path()))
+    print(f"✅ FAISS index synced: {stats}")
 
 
 
+# Run from the repository root:  python -m data_modules.lastquizdata
 if __name__ == "__main__":
     process_quiz_data()
+    refresh_vector_index()
@@ -1,5 +1,7 @@
-import requests
+import asyncio
 from fastapi import FastAPI, HTTPException
+from config import SNAPSHOT_RETRY_SECONDS
+from data_modules.upstream import AsyncTTLCache, fetch_json
 
 app = FastAPI()
 
@@ -7,28 +9,23 @@ app = FastAPI()
 QUIZ_API = "https://www.jsonkeeper.com/b/LLQT"
 STUDENT_API = "https://api.jsonserve.com/rJvd7g"
 
+# How long fetched quiz/student payloads are reused by snapshot refreshes: a refresh retried
+# after another source failed, or run while one is in flight, doesn't call these upstreams again
+CACHE_TTL_SECONDS = 60
 
-def fetch_quiz_data():
-    response = requests.get(QUIZ_API)
-    if response.status_code == 200:
-        return response.json()["quiz"]  # ✅ Return quiz data only
-    else:
-        raise HTTPException(status_code=500, detail="❌ Failed to fetch quiz data")
+latest_quiz_cache = AsyncTTLCache(ttl=CACHE_TTL_SECONDS)
 
 
-def fetch_student_data():
-    response = requests.get(STUDENT_API)
-    if response.status_code == 200:
-        return response.json()  # ✅ Return student data only
-    else:
-        raise HTTPException(status_code=500, detail="❌ Failed to fetch student data")
+async def fetch_quiz_data():
+    quiz = await fetch_json(QUIZ_API, "❌ Failed to fetch quiz data")
+    return quiz["quiz"]  # ✅ Return quiz data only
 
 
+async def fetch_student_data():
+    return await fetch_json(STUDENT_API, "❌ Failed to fetch student data")  # ✅ Return student data only
 
-def get_full_quiz_data():
-    quiz_data = fetch_quiz_data()
-    student_data = fetch_student_data()
 
+def combine_quiz_data(quiz_data, student_data):
     combined_data = {
         "quiz_details": {
             "quiz_id": quiz_data["id"],
@@ -54,3 +51,26 @@ def get_full_quiz_data():
     }
 
     return combined_data
+
+
+async def _fetch_sources():
+    # ✅ Both upstream calls run concurrently over the pooled client
+    quiz_data, student_data = await asyncio.gather(fetch_quiz_data(), fetch_student_data())
+    return quiz_data, student_data
+
+
+def load_latest_quiz():
+    """Returns `(snapshot version, combined payload)` from the current snapshot, without calling upstream."""
+    from data_modules.snapshots import LATEST_QUIZ_FILE, get_snapshot
+
+    snapshot = get_snapshot()
+    payload = snapshot.document(LATEST_QUIZ_FILE)
+    if payload is None:
+        raise HTTPException(status_code=503, detail="⏳ The latest quiz has not been fetched yet.",
+                            headers={"Retry-After": str(SNAPSHOT_RETRY_SECONDS)})
+    return snapshot.version, payload
+
+
+async def fetch_latest_sources():
+    """Returns the `(quiz, student)` upstream payloads, cached for CACHE_TTL_SECONDS with request coalescing."""
+    return await latest_quiz_cache.get((QUIZ_API, STUDENT_API), _fetch_sources)
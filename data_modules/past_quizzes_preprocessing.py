@@ -1,98 +1,146 @@
-import requests
+import base64
+import binascii
 import json
-import os
-import pandas as pd
 from fastapi import HTTPException
+from data_modules.snapshots import current_quiz_store
+from data_modules.quiz_metrics import METRIC_COLUMNS, with_metrics
 
 # API URL for Student A's quiz data
 API_URL = "https://api.jsonserve.com/XgAgFJ"
 
-# File Path for JSON Data
-DATA_FILE = "quiz_data.json"
-
-# **Fetch and Save Quiz Data**
-def fetch_quiz_data():
-    response = requests.get(API_URL)
-    if response.status_code == 200:
-        quiz_data = response.json()
-        print("✅ Data fetched successfully.")
-
-        cleaned_data = []
-        for quiz in quiz_data:
-            if "quiz" in quiz and "topic" in quiz["quiz"]:
-                cleaned_quiz = {
-                    "quiz_id": quiz["quiz_id"],
-                    "score": int(quiz["score"]),
-                    "accuracy": float(quiz["accuracy"].replace("%", "").strip()),
-                    "speed": float(quiz["speed"]),
-                    "correct_answers": int(quiz["correct_answers"]),
-                    "incorrect_answers": int(quiz["incorrect_answers"]),
-                    "correct_answer_marks": float(quiz["quiz"]["correct_answer_marks"]),
-                    "negative_marks": float(quiz["quiz"]["negative_marks"]),
-                    "negative_score": float(quiz["negative_score"]),
-                    "total_questions": int(quiz["quiz"]["questions_count"]),
-                    "started_at": quiz["started_at"],
-                    "ended_at": quiz["ended_at"],
-                    "duration": quiz["duration"],
-                    "initial_mistake_count": int(quiz["initial_mistake_count"]),
-                    "mistakes_corrected": int(quiz["mistakes_corrected"]),
-                    "date": quiz["submitted_at"].split("T")[0],
-                    "topic": quiz["quiz"]["topic"],
-                    "title": quiz["quiz"]["title"]
-                }
-                cleaned_data.append(cleaned_quiz)
-
-        # Save cleaned data to JSON
-        with open(DATA_FILE, "w") as f:
-            json.dump(cleaned_data, f, indent=4)
-
-        print(f"✅ Data saved to `{DATA_FILE}`")
-    else:
-        print(f"❌ Failed to fetch data: {response.status_code}")
-        raise HTTPException(status_code=500, detail="Failed to fetch quiz data.")
-
-# **Load Quiz Data from File**
+# Fields of a stored attempt, as accepted by `/all?fields=`
+QUIZ_FIELDS = [
+    "quiz_id", "score", "accuracy", "speed", "correct_answers", "incorrect_answers", "correct_answer_marks",
+    "negative_marks", "negative_score", "total_questions", "started_at", "ended_at", "submitted_at", "duration",
+    "initial_mistake_count", "mistakes_corrected", "date", "topic", "title"
+] + METRIC_COLUMNS
+
+# Largest page `/all` returns at once
+MAX_PAGE_SIZE = 1000
+
+# **Clean a Raw Quiz Attempt**
+def clean_quiz(quiz):
+    cleaned_quiz = {
+        "quiz_id": quiz["quiz_id"],
+        "score": int(quiz["score"]),
+        "accuracy": float(quiz["accuracy"].replace("%", "").strip()),
+        "speed": float(quiz["speed"]),
+        "correct_answers": int(quiz["correct_answers"]),
+        "incorrect_answers": int(quiz["incorrect_answers"]),
+        "correct_answer_marks": float(quiz["quiz"]["correct_answer_marks"]),
+        "negative_marks": float(quiz["quiz"]["negative_marks"]),
+        "negative_score": float(quiz["negative_score"]),
+        "total_questions": int(quiz["quiz"]["questions_count"]),
+        "started_at": quiz["started_at"],
+        "ended_at": quiz["ended_at"],
+        "submitted_at": quiz["submitted_at"],
+        "duration": quiz["duration"],
+        "initial_mistake_count": int(quiz["initial_mistake_count"]),
+        "mistakes_corrected": int(quiz["mistakes_corrected"]),
+        "date": quiz["submitted_at"].split("T")[0],
+        "topic": quiz["quiz"]["topic"],
+        "title": quiz["quiz"]["title"]
+    }
+    return with_metrics(cleaned_quiz)
+
+
+def select_quiz_attempts(payload):
+    """Keeps the raw attempts that carry a quiz topic."""
+    return [quiz for quiz in payload if "quiz" in quiz and "topic" in quiz["quiz"]]
+
+
+# **Load Quiz Data from the Current Snapshot** (refreshed in the background, never fetched here)
 def load_quiz_data():
-    if not os.path.exists(DATA_FILE):
-        fetch_quiz_data()  # Fetch data if file doesn't exist
     try:
-        with open(DATA_FILE, "r") as f:
-            return json.load(f)
+        return current_quiz_store().records()
     except json.JSONDecodeError:
         raise HTTPException(status_code=500, detail="❌ Error decoding JSON data.")
 
+# **Paginated, Filtered and Projected Queries for `/all`**
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(str(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return 0
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="❌ Invalid cursor.")
+
+
+def parse_fields(fields):
+    """Splits a comma-separated field list; None or empty means every field."""
+    if not fields:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in QUIZ_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"❌ Unknown field(s): {', '.join(unknown)}")
+    return selected
+
+
+def _project(quiz, fields):
+    return quiz if fields is None else {field: quiz.get(field) for field in fields}
+
+
+def _scan(cursor, topic, from_date, to_date):
+    load_quiz_data()
+    return current_quiz_store().scan(decode_cursor(cursor), topic, from_date, to_date)
+
+
+def query_quiz_data(cursor=None, limit=None, topic=None, from_date=None, to_date=None, fields=None):
+    """Returns `{"quizzes": [...]}` for the matching attempts in file order.
+
+    With `limit`, returns at most that many plus `next_cursor`, which is passed back as
+    `cursor` for the following page and is None on the last page.
+    """
+    fields = parse_fields(fields)
+    if limit is None and not (cursor or topic or from_date or to_date or fields):
+        return {"quizzes": load_quiz_data()}  # ✅ Unfiltered: the cached records as-is
+
+    quizzes = []
+    for position, quiz in _scan(cursor, topic, from_date, to_date):
+        if limit is not None and len(quizzes) == limit:
+            return {"quizzes": quizzes, "next_cursor": encode_cursor(position)}
+        quizzes.append(_project(quiz, fields))
+    return {"quizzes": quizzes, "next_cursor": None} if limit is not None else {"quizzes": quizzes}
+
+
+def stream_quiz_data(cursor=None, limit=None, topic=None, from_date=None, to_date=None, fields=None):
+    """Returns a generator of NDJSON lines for the matching attempts, one attempt per line.
+
+    Arguments are validated before the generator is returned, so errors surface as normal
+    HTTP errors rather than mid-stream. With `limit`, the stream stops after that many
+    attempts and, if more remain, ends with a `{"next_cursor": ...}` line.
+    """
+    fields = parse_fields(fields)
+    rows = _scan(cursor, topic, from_date, to_date)
+
+    def lines():
+        sent = 0
+        for position, quiz in rows:
+            if limit is not None and sent == limit:
+                yield json.dumps({"next_cursor": encode_cursor(position)}) + "\n"
+                return
+            yield json.dumps(_project(quiz, fields)) + "\n"
+            sent += 1
+
+    return lines()
+
+
 # **Analyze Performance**
 def analyze_performance():
-    quiz_data = load_quiz_data()
-    if not quiz_data:
+    load_quiz_data()
+    report = current_quiz_store().performance()  # ✅ Precomputed when the data was loaded
+    if not report:
         raise HTTPException(status_code=404, detail="❌ No quiz data available.")
+    return report
+
+
+def quiz_data_version():
+    """Version of the stored quiz history, for ETags on `/all` and `/performance`."""
+    load_quiz_data()
+    return current_quiz_store().version()
 
-    df = pd.DataFrame(quiz_data)
-
-    # **Create Unique Quiz Identifier**
-    df["quiz_identifier"] = df["topic"] + " - " + df["title"]
-
-    # **Compute Performance Metrics**
-    df["total_attempted"] = df["correct_answers"] + df["incorrect_answers"]
-    df["total_unattempted"] = df["total_questions"] - df["total_attempted"]
-    df["accuracy_rate"] = (df["correct_answers"] / df["total_attempted"]) * 100
-    df["attempt_rate"] = (df["total_attempted"] / df["total_questions"]) * 100
-    df["unanswered_rate"] = (df["total_unattempted"] / df["total_questions"]) * 100
-    df["net_score"] = (df["correct_answers"] * df["correct_answer_marks"]) - (
-            df["incorrect_answers"] * df["negative_marks"])
-
-    df = df.fillna(0)
-
-    # **Prepare API Response**
-    quiz_performance = df[[
-        "quiz_identifier", "total_questions", "total_attempted", "correct_answers",
-        "incorrect_answers", "total_unattempted", "attempt_rate", "accuracy_rate",
-        "unanswered_rate", "net_score"
-    ]].to_dict(orient="records")
-
-    return {
-        "average_accuracy": round(df["accuracy_rate"].mean(), 2),
-        "average_attempt_rate": round(df["attempt_rate"].mean(), 2),
-        "average_unanswered_rate": round(df["unanswered_rate"].mean(), 2),
-        "all_quiz_performance": quiz_performance
-    }
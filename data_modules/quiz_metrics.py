@@ -0,0 +1,99 @@
+from datetime import datetime
+
+# **Derived Per-Quiz Metrics (materialized at ingest time)**
+METRIC_COLUMNS = [
+    "quiz_identifier", "total_attempted", "total_unattempted", "accuracy_rate",
+    "attempt_rate", "unanswered_rate", "net_score"
+]
+
+# Columns returned per quiz by `/performance`
+PERFORMANCE_COLUMNS = [
+    "quiz_identifier", "total_questions", "total_attempted", "correct_answers",
+    "incorrect_answers", "total_unattempted", "attempt_rate", "accuracy_rate",
+    "unanswered_rate", "net_score"
+]
+
+HISTORY_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _rate(part, whole):
+    return (part / whole) * 100 if whole else 0.0
+
+
+def compute_quiz_metrics(quiz):
+    """Computes the derived performance metrics for a single cleaned quiz record."""
+    total_attempted = quiz["correct_answers"] + quiz["incorrect_answers"]
+    total_unattempted = max(0, quiz["total_questions"] - total_attempted)
+
+    return {
+        "quiz_identifier": f"{quiz['topic']} - {quiz['title']}",
+        "total_attempted": total_attempted,
+        "total_unattempted": total_unattempted,
+        "accuracy_rate": _rate(quiz["correct_answers"], total_attempted),
+        "attempt_rate": _rate(total_attempted, quiz["total_questions"]),
+        "unanswered_rate": _rate(total_unattempted, quiz["total_questions"]),
+        "net_score": (quiz["correct_answers"] * quiz["correct_answer_marks"]) - (
+            quiz["incorrect_answers"] * quiz["negative_marks"])
+    }
+
+
+def with_metrics(quiz):
+    """Returns the record with derived metrics, computing them only if they are missing."""
+    if all(column in quiz for column in METRIC_COLUMNS):
+        return quiz
+    return {**quiz, **compute_quiz_metrics(quiz)}
+
+
+def topic_key(topic):
+    return str(topic).lower()
+
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(value)
+
+
+def history_entry(quiz):
+    """Copy of a quiz record with its timestamps formatted for display and prompts."""
+    entry = dict(quiz)
+    entry["started_at"] = parse_timestamp(quiz["started_at"]).strftime(HISTORY_TIME_FORMAT)
+    entry["ended_at"] = parse_timestamp(quiz["ended_at"]).strftime(HISTORY_TIME_FORMAT)
+    return entry
+
+
+def attempt_keys(quiz):
+    """Keys identifying an attempt. Older records carry no `submitted_at`, so `started_at` is a fallback."""
+    keys = [(quiz["quiz_id"], "started_at", quiz["started_at"])]
+    if quiz.get("submitted_at"):
+        keys.append((quiz["quiz_id"], "submitted_at", quiz["submitted_at"]))
+    return keys
+
+
+class PerformanceReport:
+    """Running `/performance` payload that is extended one quiz at a time."""
+
+    def __init__(self):
+        self.rows = []
+        self._sums = {"accuracy_rate": 0.0, "attempt_rate": 0.0, "unanswered_rate": 0.0}
+
+    def add(self, quiz):
+        self.rows.append({column: quiz[column] for column in PERFORMANCE_COLUMNS})
+        for column in self._sums:
+            self._sums[column] += quiz[column]
+
+    def copy(self):
+        report = PerformanceReport()
+        report.rows = list(self.rows)
+        report._sums = dict(self._sums)
+        return report
+
+    def as_dict(self):
+        if not self.rows:
+            return None
+
+        count = len(self.rows)
+        return {
+            "average_accuracy": round(self._sums["accuracy_rate"] / count, 2),
+            "average_attempt_rate": round(self._sums["attempt_rate"] / count, 2),
+            "average_unanswered_rate": round(self._sums["unanswered_rate"] / count, 2),
+            "all_quiz_performance": self.rows
+        }
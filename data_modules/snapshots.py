@@ -0,0 +1,478 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from config import (
+    COLUMNAR_FORMAT, SNAPSHOT_DIR, SNAPSHOT_KEEP, SNAPSHOT_REFRESH_SECONDS, SNAPSHOT_RETRY_SECONDS,
+    SNAPSHOT_STALE_SECONDS
+)
+from data_modules.columnar_store import (
+    FORMAT_EXTENSIONS, ColumnarQuizHistory, append_columnar, columnar_available, columnar_name, write_columnar
+)
+from data_modules.dataset_store import ATTEMPTS_FILE, DATA_FILE, QuizDatasetStore
+from data_modules.instrumentation import span
+from data_modules.worker_pool import run_blocking
+
+# **Snapshot Layout**
+# snapshots/<version>/ holds one immutable copy of every upstream-derived file; snapshots/CURRENT
+# names the published version and when it was last confirmed fresh, and is replaced atomically.
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+HISTORY_FILE = "quiz_attempts.jsonl"
+LATEST_QUIZ_FILE = "latest_quiz.json"
+KNOWLEDGE_BASE_FILE = "quiz_knowledge_base.json"
+HISTORY_COLUMNAR_BASE = "quiz_attempts"  # Columnar copy of HISTORY_FILE, e.g. quiz_attempts.arrow/
+
+# Linux ioctl that clones a file's extents (copy-on-write filesystems such as btrfs and XFS)
+FICLONE = 0x40049409
+
+
+class Snapshot:
+    """One published snapshot. Its files never change; parsed contents are cached per version.
+
+    `previous` is the snapshot served before this one; its loaded quiz history is carried
+    forward when this snapshot's history is the same log or that log with attempts appended.
+    """
+
+    def __init__(self, version, refreshed_at, previous=None):
+        self.version = version
+        self.directory = os.path.join(SNAPSHOT_DIR, version)
+        self.refreshed_at = refreshed_at
+        self._lock = threading.Lock()
+        self._store = None
+        self._documents = {}
+        self._previous = previous if previous is not None and previous._store is not None else None
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def age(self):
+        """Seconds since upstream was last pulled successfully, or None for a seeded snapshot (it never was)."""
+        if not self.refreshed_at:
+            return None
+        return max(0.0, time.time() - self.refreshed_at)
+
+    @property
+    def stale(self):
+        age = self.age()
+        return age is None or age > SNAPSHOT_STALE_SECONDS
+
+    def has(self, name):
+        return os.path.exists(self.path(name))
+
+    def columnar_history(self):
+        """The columnar copy of this snapshot's history, or None if it was published without one."""
+        for file_format in FORMAT_EXTENSIONS:
+            path = self.path(columnar_name(HISTORY_COLUMNAR_BASE, file_format))
+            if os.path.isdir(path) and columnar_available():
+                return ColumnarQuizHistory(path)
+        return None
+
+    def history_digest(self):
+        """Digest of this snapshot's quiz history as recorded in its manifest (None for older manifests)."""
+        return (self.document(MANIFEST_FILE) or {}).get("file_digests", {}).get(HISTORY_FILE)
+
+    def quiz_store(self):
+        """The quiz history of this snapshot, loaded once into a `QuizDatasetStore`."""
+        previous, self._previous = self._previous, None
+        carried = None
+        if previous is not None and previous.history_digest() is not None:
+            manifest = self.document(MANIFEST_FILE) or {}
+            # ✅ Keyed by digest: the previous log unchanged, or the base this one appended to
+            if previous.history_digest() in (self.history_digest(), manifest.get("history_base")):
+                carried = previous.quiz_store()
+        with self._lock:
+            if self._store is None:
+                if carried is not None:
+                    self._store = carried.carried_to(self.path(HISTORY_FILE), columnar=self.columnar_history())
+                else:
+                    self._store = QuizDatasetStore(self.path(HISTORY_FILE), columnar=self.columnar_history())
+            return self._store
+
+    def document(self, name):
+        """The parsed JSON file `name`, or None if this snapshot doesn't have it."""
+        with self._lock:
+            if name not in self._documents:
+                try:
+                    with open(self.path(name), "r", encoding="utf-8") as f:
+                        self._documents[name] = json.load(f)
+                except FileNotFoundError:
+                    self._documents[name] = None
+            return self._documents[name]
+
+    def headers(self):
+        age = self.age()
+        headers = {"X-Snapshot-Version": self.version, "X-Snapshot-Age": "never" if age is None else str(int(age))}
+        if self.stale:
+            headers["X-Snapshot-Stale"] = "1"
+        return headers
+
+    def status(self):
+        age = self.age()
+        return {"version": self.version, "refreshed_at": self.refreshed_at or None,
+                "age_seconds": None if age is None else round(age, 1),
+                "stale": self.stale, "files": sorted(name for name in os.listdir(self.directory))}
+
+
+def _pointer_path():
+    return os.path.join(SNAPSHOT_DIR, CURRENT_FILE)
+
+
+def _read_pointer():
+    try:
+        with open(_pointer_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_pointer(pointer):
+    tmp_path = f"{_pointer_path()}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pointer, f)
+    os.replace(tmp_path, _pointer_path())  # ✅ Readers see the old or the new pointer, never a partial one
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _clone_or_copy(source, destination):
+    """Copies a file, sharing its blocks instead (a reflink) on filesystems that support it."""
+    try:
+        import fcntl
+
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return
+    except (ImportError, OSError):
+        pass
+    shutil.copyfile(source, destination)
+
+
+def _link_or_copy(source, destination):
+    """Hard-links an immutable snapshot file into a new snapshot, copying where links aren't supported."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+class HistoryAppend:
+    """Snapshot payload for the quiz history: the `base` snapshot's log with `records` appended.
+
+    The base log is linked or cloned byte for byte, so only the new attempts are serialized,
+    and its digest is chained from the base's recorded one instead of re-hashing the file.
+    Readers of the new snapshot carry the base's parsed store forward (see `Snapshot.quiz_store`).
+    """
+
+    def __init__(self, base, records):
+        self.base = base
+        self.records = records
+
+    def base_digest(self):
+        digests = (self.base.document(MANIFEST_FILE) or {}).get("file_digests", {})
+        return digests.get(HISTORY_FILE) or _hash_file(self.base.path(HISTORY_FILE))  # Older manifests: hash once
+
+    def all_records(self):
+        return list(self.base.quiz_store().records()) + self.records
+
+    def write(self, path):
+        """Writes the history to `path` and returns its digest."""
+        if not self.base.has(HISTORY_FILE):
+            return _write_file(os.path.dirname(path), HISTORY_FILE, self.records)
+        if not self.records:
+            _link_or_copy(self.base.path(HISTORY_FILE), path)
+            return self.base_digest()
+
+        _clone_or_copy(self.base.path(HISTORY_FILE), path)  # ✅ Not a link: the base file must not change
+        appended = "".join(json.dumps(record) + "\n" for record in self.records).encode("utf-8")
+        with open(path, "ab") as f:
+            f.write(appended)
+        return hashlib.sha256(f"{self.base_digest()}:{hashlib.sha256(appended).hexdigest()}".encode()).hexdigest()
+
+
+def _write_file(directory, name, payload):
+    """Writes one snapshot file (JSONL for record lists named `.jsonl`) and returns its SHA-256."""
+    path = os.path.join(directory, name)
+    if isinstance(payload, HistoryAppend):
+        return payload.write(path)
+    with open(path, "w", encoding="utf-8") as f:
+        if name.endswith(".jsonl"):
+            f.write("".join(json.dumps(record) + "\n" for record in payload))
+        else:
+            json.dump(payload, f, ensure_ascii=False)
+    return _hash_file(path)
+
+
+def _write_history_columnar(history, path, tag):
+    """Writes the columnar copy of `history` (a record list or `HistoryAppend`) at `path`."""
+    if isinstance(history, HistoryAppend):
+        base = history.base.path(columnar_name(HISTORY_COLUMNAR_BASE, COLUMNAR_FORMAT))
+        if os.path.isdir(base):
+            # ✅ Existing partition files are shared with the base; only the new attempts are written
+            shutil.copytree(base, path, copy_function=_link_or_copy)
+            append_columnar(history.records, path, COLUMNAR_FORMAT, tag)
+            return
+        history = history.all_records()
+    write_columnar(history, path, COLUMNAR_FORMAT)
+
+
+def _prune(current_version):
+    versions = sorted(name for name in os.listdir(SNAPSHOT_DIR)
+                      if not name.startswith(".") and os.path.isdir(os.path.join(SNAPSHOT_DIR, name)))
+    for version in versions[:-SNAPSHOT_KEEP]:
+        if version != current_version:
+            shutil.rmtree(os.path.join(SNAPSHOT_DIR, version), ignore_errors=True)
+
+
+def publish_snapshot(files, refreshed_at=None):
+    """Writes `files` ({file name: payload}) as a new snapshot and points CURRENT at it.
+
+    A snapshot with the same content as the current one is not duplicated; only its refresh
+    time moves. The history may be a `HistoryAppend` on the current snapshot, so a refresh
+    costs the new attempts rather than the whole log. The newest SNAPSHOT_KEEP versions are kept, so requests still reading an
+    older one can finish. Returns the published version.
+    """
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    staging = os.path.join(SNAPSHOT_DIR, f".staging-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+    os.makedirs(staging)
+    try:
+        file_digests = {name: _write_file(staging, name, files[name]) for name in sorted(files)}
+        digest = hashlib.sha256()
+        for name in sorted(files):
+            digest.update(f"{name}:{file_digests[name]}\n".encode())
+        digest = digest.hexdigest()
+
+        current = _read_pointer()
+        if current and current["digest"] == digest:
+            version = current["version"]
+        else:
+            version = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{digest[:12]}"
+            if HISTORY_FILE in files and COLUMNAR_FORMAT and columnar_available():
+                # ✅ Derived from the history, so it is written only for new content and not hashed
+                columnar_path = os.path.join(staging, columnar_name(HISTORY_COLUMNAR_BASE, COLUMNAR_FORMAT))
+                try:
+                    with span("snapshot.columnar_write"):
+                        _write_history_columnar(files[HISTORY_FILE], columnar_path, digest[:12])
+                except Exception as e:
+                    # Analytics fall back to the JSON history; the snapshot is still published
+                    print(f"⚠️ Columnar copy failed, publishing the snapshot without it: {e!r}")
+                    shutil.rmtree(columnar_path, ignore_errors=True)
+            manifest = {"version": version, "digest": digest, "created_at": time.time(), "files": sorted(files),
+                        "file_digests": file_digests}
+            if isinstance(files.get(HISTORY_FILE), HistoryAppend) and files[HISTORY_FILE].base.has(HISTORY_FILE):
+                manifest["history_base"] = files[HISTORY_FILE].base_digest()
+            with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            try:
+                os.rename(staging, os.path.join(SNAPSHOT_DIR, version))
+            except OSError:
+                if not os.path.isdir(os.path.join(SNAPSHOT_DIR, version)):
+                    raise  # Otherwise another process published the same content first
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    _write_pointer({"version": version, "digest": digest,
+                    "refreshed_at": time.time() if refreshed_at is None else refreshed_at})
+    _prune(version)
+    return version
+
+
+def seed_snapshot():
+    """Publishes a first snapshot from the local quiz history and knowledge base, without calling
+    upstream. It is marked as never refreshed, so it is served as stale until a refresh succeeds."""
+    local = QuizDatasetStore(ATTEMPTS_FILE, DATA_FILE)
+    files = {HISTORY_FILE: local.records() if local.exists() else []}
+    if os.path.exists(KNOWLEDGE_BASE_FILE):
+        with open(KNOWLEDGE_BASE_FILE, "r", encoding="utf-8") as f:
+            files[KNOWLEDGE_BASE_FILE] = json.load(f)
+    return publish_snapshot(files, refreshed_at=0)
+
+
+_current = None
+_current_signature = None
+_current_lock = threading.Lock()
+
+
+def get_snapshot():
+    """Returns the current snapshot; seeds one from local files if none was ever published.
+
+    Only the CURRENT pointer is stat'ed per call. A stale snapshot is still returned
+    (stale-while-revalidate), and the background refresher is asked to refresh early.
+    """
+    global _current, _current_signature
+    try:
+        stat = os.stat(_pointer_path())
+    except FileNotFoundError:
+        with _current_lock:
+            if not os.path.exists(_pointer_path()):
+                seed_snapshot()
+        stat = os.stat(_pointer_path())
+
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if signature != _current_signature:
+        with _current_lock:
+            if signature != _current_signature:
+                pointer = _read_pointer()
+                if _current is None or _current.version != pointer["version"]:
+                    _current = Snapshot(pointer["version"], pointer["refreshed_at"], previous=_current)
+                else:
+                    _current.refreshed_at = pointer["refreshed_at"]  # ✅ Same files: keep what's loaded
+                _current_signature = signature
+
+    snapshot = _current
+    if snapshot.stale and _refresher is not None:
+        _refresher.request_refresh()
+    return snapshot
+
+
+def loaded_snapshot():
+    """The snapshot this process last read, without touching the disk (None before the first read)."""
+    return _current
+
+
+def current_quiz_store():
+    return get_snapshot().quiz_store()
+
+
+def knowledge_base_path():
+    """The current snapshot's knowledge base, or the local file if no snapshot has one yet."""
+    snapshot = get_snapshot()
+    return snapshot.path(KNOWLEDGE_BASE_FILE) if snapshot.has(KNOWLEDGE_BASE_FILE) else KNOWLEDGE_BASE_FILE
+
+
+# **🔹 Refresh From Upstream**
+def _build_files(history, quiz, student):
+    from data_modules.lastquizdata import build_knowledge_base
+    from data_modules.latest_quiz_preprocessing import combine_quiz_data
+    from data_modules.past_quizzes_preprocessing import clean_quiz, select_quiz_attempts
+
+    # ✅ Attempts are appended to the previous history, so ones upstream no longer returns are kept
+    snapshot = get_snapshot()
+    unseen = snapshot.quiz_store().unseen(select_quiz_attempts(history))
+    return {
+        HISTORY_FILE: HistoryAppend(snapshot, [clean_quiz(quiz) for quiz in unseen]),
+        LATEST_QUIZ_FILE: combine_quiz_data(quiz, student),
+        KNOWLEDGE_BASE_FILE: {"quiz_questions": build_knowledge_base(quiz["questions"], student)}
+    }
+
+
+async def refresh_snapshot():
+    """Pulls every upstream source concurrently and publishes a new snapshot. Returns its version.
+
+    If any source fails, nothing is published and the current snapshot keeps being served.
+    """
+    from data_modules import latest_quiz_preprocessing, past_quizzes_preprocessing
+    from data_modules.upstream import fetch_json
+
+    with span("snapshot.refresh"):
+        history, (quiz, student) = await asyncio.gather(
+            fetch_json(past_quizzes_preprocessing.API_URL, "❌ Failed to fetch quiz history"),
+            latest_quiz_preprocessing.fetch_latest_sources()
+        )
+        files = await run_blocking(_build_files, history, quiz, student)
+        return await run_blocking(publish_snapshot, files)
+
+
+class SnapshotRefresher:
+    """Background task that refreshes the snapshot every `interval` seconds.
+
+    A request that finds the snapshot stale wakes it early, at most once per
+    SNAPSHOT_RETRY_SECONDS. Each API process runs one; a process skips its turn when the
+    snapshot on disk is already younger than `interval` (another process refreshed it).
+    """
+
+    def __init__(self, interval=SNAPSHOT_REFRESH_SECONDS):
+        self.interval = interval
+        self.last_attempt = None
+        self.last_error = None
+        self.failures = 0
+        self._loop = None
+        self._wake = None
+        self._task = None
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def request_refresh(self):
+        """Wakes the refresher early; safe to call from worker threads."""
+        recently = self.last_attempt is not None and time.monotonic() - self.last_attempt < SNAPSHOT_RETRY_SECONDS
+        if self._task is not None and not recently:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def refresh(self):
+        self.last_attempt = time.monotonic()
+        try:
+            version = await refresh_snapshot()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = getattr(e, "detail", None) or repr(e)
+            print(f"⚠️ Snapshot refresh failed, still serving the previous snapshot: {self.last_error}")
+        else:
+            self.last_error = None
+            print(f"✅ Snapshot {version} published")
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            age = (await run_blocking(get_snapshot)).age()
+            if age is None or age >= self.interval:
+                await self.refresh()
+                delay = SNAPSHOT_RETRY_SECONDS if self.last_error else self.interval
+            else:
+                delay = self.interval - age
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def status(self):
+        return {"interval_seconds": self.interval, "running": self._task is not None,
+                "failures": self.failures, "last_error": self.last_error}
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_snapshot_refresher():
+    """Returns the process-wide snapshot refresher (started by the API on startup)."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = SnapshotRefresher()
+        return _refresher
+
+
+# Run from the repository root to refresh once, e.g. from cron when the API's refresher is disabled:
+#   python -m data_modules.snapshots
+if __name__ == "__main__":
+    async def main():
+        from data_modules.upstream import close_http_client
+
+        try:
+            print(f"✅ Snapshot {await refresh_snapshot()} published")
+        finally:
+            await close_http_client()
+
+    asyncio.run(main())
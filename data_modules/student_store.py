@@ -0,0 +1,265 @@
+import json
+import os
+import sqlite3
+import threading
+from data_modules.quiz_metrics import PERFORMANCE_COLUMNS, history_entry, parse_timestamp, topic_key, with_metrics
+
+# SQLite database holding every student's quiz history
+STUDENT_DB_FILE = os.path.join("db", "students.sqlite3")
+
+KNOWLEDGE_BASE_FILE = "quiz_knowledge_base.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quiz_attempts (
+    user_id TEXT NOT NULL,
+    quiz_id INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    started_ts REAL NOT NULL,
+    topic_key TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (user_id, quiz_id, started_at)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_attempts_user_time ON quiz_attempts (user_id, started_ts);
+CREATE INDEX IF NOT EXISTS idx_attempts_user_topic_time ON quiz_attempts (user_id, topic_key, started_ts);
+
+CREATE TABLE IF NOT EXISTS student_topic_stats (
+    user_id TEXT NOT NULL,
+    topic_key TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    total_quizzes INTEGER NOT NULL,
+    sum_accuracy_rate REAL NOT NULL,
+    sum_attempt_rate REAL NOT NULL,
+    sum_unanswered_rate REAL NOT NULL,
+    first_ts REAL NOT NULL,
+    first_started_at TEXT NOT NULL,
+    first_accuracy_rate REAL NOT NULL,
+    first_net_score REAL NOT NULL,
+    latest_ts REAL NOT NULL,
+    latest_started_at TEXT NOT NULL,
+    latest_accuracy_rate REAL NOT NULL,
+    latest_net_score REAL NOT NULL,
+    PRIMARY KEY (user_id, topic_key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS student_latest_quiz (
+    user_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS student_knowledge_base (
+    user_id TEXT NOT NULL,
+    question_id INTEGER NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (user_id, question_id)
+) WITHOUT ROWID;
+"""
+
+
+def _empty_stats(quiz):
+    return {
+        "topic": quiz["topic"], "total_quizzes": 0,
+        "sum_accuracy_rate": 0.0, "sum_attempt_rate": 0.0, "sum_unanswered_rate": 0.0,
+        "first_ts": float("inf"), "first_started_at": "", "first_accuracy_rate": 0.0, "first_net_score": 0.0,
+        "latest_ts": float("-inf"), "latest_started_at": "", "latest_accuracy_rate": 0.0, "latest_net_score": 0.0
+    }
+
+
+def _fold_stats(stats, quiz, started_ts, started_at):
+    stats["total_quizzes"] += 1
+    stats["sum_accuracy_rate"] += quiz["accuracy_rate"]
+    stats["sum_attempt_rate"] += quiz["attempt_rate"]
+    stats["sum_unanswered_rate"] += quiz["unanswered_rate"]
+    if started_ts < stats["first_ts"]:
+        stats.update(first_ts=started_ts, first_started_at=started_at,
+                     first_accuracy_rate=quiz["accuracy_rate"], first_net_score=quiz["net_score"])
+    if started_ts >= stats["latest_ts"]:
+        stats.update(latest_ts=started_ts, latest_started_at=started_at,
+                     latest_accuracy_rate=quiz["accuracy_rate"], latest_net_score=quiz["net_score"])
+
+
+class StudentStore:
+    """Per-student quiz history, topic aggregates, latest quiz and knowledge base in SQLite.
+
+    Every read is an index range scan on `user_id` (and `topic_key`), so query latency
+    depends on the size of one student's history rather than on the cohort size.
+    """
+
+    def __init__(self, path=STUDENT_DB_FILE):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # **Writes**
+    def add_attempts(self, user_id, quizzes):
+        """Inserts cleaned attempts for a student, skipping ones already stored, and updates topic stats."""
+        conn = self._connect()
+        with conn:
+            stats = {}
+            for quiz in quizzes:
+                quiz = with_metrics(quiz)
+                started_ts = parse_timestamp(quiz["started_at"]).timestamp()
+                key = topic_key(quiz["topic"])
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO quiz_attempts VALUES (?, ?, ?, ?, ?, ?)",
+                    (user_id, quiz["quiz_id"], quiz["started_at"], started_ts, key, json.dumps(quiz))
+                ).rowcount
+                if not inserted:
+                    continue
+                if key not in stats:
+                    stats[key] = self._load_stats(conn, user_id, key) or _empty_stats(quiz)
+                _fold_stats(stats[key], quiz, started_ts, history_entry(quiz)["started_at"])
+
+            for key, row in stats.items():
+                conn.execute(
+                    "INSERT OR REPLACE INTO student_topic_stats VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (user_id, key, row["topic"], row["total_quizzes"],
+                     row["sum_accuracy_rate"], row["sum_attempt_rate"], row["sum_unanswered_rate"],
+                     row["first_ts"], row["first_started_at"], row["first_accuracy_rate"], row["first_net_score"],
+                     row["latest_ts"], row["latest_started_at"], row["latest_accuracy_rate"], row["latest_net_score"])
+                )
+
+    def set_latest_quiz(self, user_id, payload):
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO student_latest_quiz VALUES (?, ?)", (user_id, json.dumps(payload)))
+
+    def set_knowledge_base(self, user_id, questions):
+        """Replaces a student's knowledge base (the `quiz_questions` list of quiz_knowledge_base.json)."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM student_knowledge_base WHERE user_id = ?", (user_id,))
+            conn.executemany(
+                "INSERT INTO student_knowledge_base VALUES (?, ?, ?)",
+                [(user_id, question["question_id"], json.dumps(question)) for question in questions]
+            )
+
+    def add_knowledge_base(self, user_id, questions):
+        """Adds or updates knowledge-base questions for a student, keeping the others."""
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO student_knowledge_base VALUES (?, ?, ?)",
+                [(user_id, question["question_id"], json.dumps(question)) for question in questions]
+            )
+
+    # **Reads**
+    def _load_stats(self, conn, user_id, key):
+        cursor = conn.execute(
+            "SELECT * FROM student_topic_stats WHERE user_id = ? AND topic_key = ?", (user_id, key)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        columns = [column[0] for column in cursor.description]
+        stats = dict(zip(columns, row))
+        del stats["user_id"], stats["topic_key"]
+        return stats
+
+    def has_student(self, user_id):
+        """True if the student has quiz attempts or a knowledge base (batch builds may add only the latter)."""
+        conn = self._connect()
+        return conn.execute(
+            "SELECT 1 FROM quiz_attempts WHERE user_id = ? "
+            "UNION ALL SELECT 1 FROM student_knowledge_base WHERE user_id = ? LIMIT 1", (user_id, user_id)
+        ).fetchone() is not None
+
+    def quiz_history(self, user_id):
+        """All of a student's attempts in chronological order."""
+        rows = self._connect().execute(
+            "SELECT record FROM quiz_attempts WHERE user_id = ? ORDER BY started_ts", (user_id,)
+        )
+        return [json.loads(record) for (record,) in rows]
+
+    def performance(self, user_id):
+        """The `/performance` payload for one student, or None when the student has no attempts."""
+        history = self.quiz_history(user_id)
+        if not history:
+            return None
+
+        count = len(history)
+        return {
+            "average_accuracy": round(sum(quiz["accuracy_rate"] for quiz in history) / count, 2),
+            "average_attempt_rate": round(sum(quiz["attempt_rate"] for quiz in history) / count, 2),
+            "average_unanswered_rate": round(sum(quiz["unanswered_rate"] for quiz in history) / count, 2),
+            "all_quiz_performance": [{column: quiz[column] for column in PERFORMANCE_COLUMNS} for quiz in history]
+        }
+
+    def topics(self, user_id):
+        rows = self._connect().execute(
+            "SELECT topic FROM student_topic_stats WHERE user_id = ? ORDER BY topic", (user_id,)
+        )
+        return [topic for (topic,) in rows]
+
+    def topic_summary(self, user_id, topic):
+        """Same shape as `TopicAnalysisEngine.topic_summary()`, read from the precomputed stats row."""
+        stats = self._load_stats(self._connect(), user_id, topic_key(topic))
+        if stats is None:
+            return None
+
+        count = stats["total_quizzes"]
+        return {
+            "total_quizzes": count,
+            "average_accuracy": stats["sum_accuracy_rate"] / count,
+            "average_attempt_rate": stats["sum_attempt_rate"] / count,
+            "average_unanswered_rate": stats["sum_unanswered_rate"] / count,
+            "first_started_at": stats["first_started_at"],
+            "latest_started_at": stats["latest_started_at"],
+            "accuracy_change": stats["latest_accuracy_rate"] - stats["first_accuracy_rate"],
+            "net_score_change": stats["latest_net_score"] - stats["first_net_score"]
+        }
+
+    def topic_history(self, user_id, topic):
+        rows = self._connect().execute(
+            "SELECT record FROM quiz_attempts WHERE user_id = ? AND topic_key = ? ORDER BY started_ts",
+            (user_id, topic_key(topic))
+        )
+        return [history_entry(json.loads(record)) for (record,) in rows]
+
+    def latest_quiz(self, user_id):
+        row = self._connect().execute(
+            "SELECT payload FROM student_latest_quiz WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def knowledge_base(self, user_id):
+        rows = self._connect().execute(
+            "SELECT record FROM student_knowledge_base WHERE user_id = ? ORDER BY question_id", (user_id,)
+        )
+        return {"quiz_questions": [json.loads(record) for (record,) in rows]}
+
+
+def import_single_student_files(user_id, store=None):
+    """Loads the single-student quiz history and knowledge base files into the store under `user_id`."""
+    from data_modules.snapshots import current_quiz_store
+
+    store = store or get_student_store()
+    store.add_attempts(user_id, current_quiz_store().records())
+    if os.path.exists(KNOWLEDGE_BASE_FILE):
+        with open(KNOWLEDGE_BASE_FILE, "r", encoding="utf-8") as f:
+            store.set_knowledge_base(user_id, json.load(f)["quiz_questions"])
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_student_store(path=STUDENT_DB_FILE):
+    """Returns the process-wide student store."""
+    global _store
+    with _store_lock:
+        if _store is None or _store.path != path:
+            _store = StudentStore(path)
+        return _store
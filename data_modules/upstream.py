@@ -0,0 +1,87 @@
+import asyncio
+import time
+import httpx
+from fastapi import HTTPException
+from data_modules.instrumentation import timed
+
+# **Pooled HTTP Client Settings**
+REQUEST_TIMEOUT_SECONDS = 10
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+_client = None
+_client_loop = None
+
+
+def get_http_client():
+    """Returns a pooled async HTTP client bound to the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client():
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client, _client_loop = None, None
+
+
+@timed("upstream.fetch")
+async def fetch_json(url, error_detail):
+    """GETs a JSON document over the pooled client, raising HTTPException(500) on failure."""
+    try:
+        response = await get_http_client().get(url)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=500, detail=error_detail)
+    if response.status_code != 200:
+        raise HTTPException(status_code=500, detail=error_detail)
+    return response.json()
+
+
+class AsyncTTLCache:
+    """Caches coroutine results for `ttl` seconds.
+
+    Concurrent callers asking for a key that is being fetched await the same
+    in-flight task, so N simultaneous misses produce one upstream call.
+    Failures are not cached.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, key, fetch):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._entries[key] = (time.monotonic() + self.ttl, task.result())
+
+    def clear(self):
+        self._entries.clear()
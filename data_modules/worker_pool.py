@@ -0,0 +1,34 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import API_WORKER_THREADS
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Returns the bounded pool that runs blocking work off the event loop."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=API_WORKER_THREADS, thread_name_prefix="api-worker")
+        return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Runs a synchronous function in the worker pool and awaits its result."""
+    loop = asyncio.get_running_loop()
+    # ✅ Carry the request context into the worker so its spans reach the Server-Timing header
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
@@ -1,40 +1,33 @@
 import json
-import requests
 import streamlit as st
-import faiss
-import numpy as np
-import google.generativeai as genai
-from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAI
-
-from langchain.chains import RetrievalQA
-from langchain.prompts import PromptTemplate
-from langchain.schema import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-import os
-from config import GOOGLE_API_KEY
-
-genai.configure(api_key=GOOGLE_API_KEY)
+from data_modules.snapshots import knowledge_base_path
+from tools.api_client import get_api_session
+from tools.question_index import QuestionIndex
+
+# ✅ The knowledge base comes from the current snapshot; a new snapshot is a new path, so caches reload
+KNOWLEDGE_BASE_PATH = knowledge_base_path()
 
 @st.cache_data
-def load_quiz_data():
-    with open("quiz_knowledge_base.json", "r", encoding="utf-8") as file:
+def load_quiz_data(path):
+    with open(path, "r", encoding="utf-8") as file:
         return json.load(file)
 
-quiz_data = load_quiz_data()
+quiz_data = load_quiz_data(KNOWLEDGE_BASE_PATH)
+
+@st.cache_resource
+def get_question_index(path):
+    # ✅ Selected questions are found by hash lookup instead of scanning the list on every rerun
+    return QuestionIndex(load_quiz_data(path)["quiz_questions"])
 
 @st.cache_data
 def fetch_latest_quiz():
-    url = "http://localhost:8000/latestquiz"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        st.error("❌ Failed to fetch latest quiz data from API")
-        return None
+    return get_api_session().get_json("/latestquiz")
 
 quiz_metadata = fetch_latest_quiz()
+if quiz_metadata is None:
+    fetch_latest_quiz.clear()  # ✅ A failed fetch (e.g. 503 before the first snapshot) isn't kept; reruns retry
+    st.warning("⏳ The latest quiz data isn't available from the API yet. Please try again shortly.")
+    st.stop()
 
 quiz_details = quiz_metadata.get("quiz_details", {})
 student_performance = quiz_metadata.get("student_performance", {})
@@ -49,43 +42,13 @@ incorrect_answers = student_performance.get("incorrect_answers", 0)
 accuracy = student_performance.get("accuracy", "Unknown Accuracy")
 final_score = student_performance.get("final_score", "Unknown Score")
 
-documents = []
-for item in quiz_data["quiz_questions"]:
-    context_text = f"Question: {item['question']}\nContext: {item['context']}\nCorrect Answer: {item['answer']}\nOther Options: {', '.join(item['other_options'])}"
-    doc = Document(page_content=context_text, metadata={"question_id": item["question_id"]})
-    documents.append(doc)
-
-text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-split_docs = text_splitter.split_documents(documents)
-
-embedding_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-
-faiss_index_path = "faiss_index"
-if os.path.exists(faiss_index_path):
-    db = FAISS.load_local(faiss_index_path, embedding_model, allow_dangerous_deserialization=True)
-else:
-    db = FAISS.from_documents(split_docs, embedding_model)
-    db.save_local(faiss_index_path)
-
-gemini_llm = GoogleGenerativeAI(model="gemini-1.5-pro-latest", api_key=GOOGLE_API_KEY)
-
-prompt_template = PromptTemplate(
-    input_variables=["context", "question"],
-    template="""You are an expert tutor analyzing quiz results.
-
-    Question: {question}
-    Context: {context}
-
-    Based on the given context, provide an explanation.
-    
-    """
-)
+@st.cache_resource
+def get_service(path):
+    # ✅ Model, index and QA chain are loaded once per process, not on every rerun.
+    # LangChain, FAISS and sentence-transformers are imported here, on the first request for feedback.
+    from tools.retrieval_service import get_retrieval_service
 
-qa_chain = RetrievalQA.from_chain_type(
-    llm=gemini_llm,
-    retriever=db.as_retriever(),
-    chain_type_kwargs={"prompt": prompt_template}
-)
+    return get_retrieval_service(path)
 
 st.title("🤖 AI Quiz Insights")
 st.subheader(f"📌 Quiz Analysis for {student_id}")
@@ -100,7 +63,7 @@ questions_list = [q["question"] for q in quiz_data["quiz_questions"]]
 selected_question = st.selectbox("📌 Select a Question for Analysis:", questions_list)
 
 if selected_question:
-    selected_question_data = next(q for q in quiz_data["quiz_questions"] if q["question"] == selected_question)
+    selected_question_data = get_question_index(KNOWLEDGE_BASE_PATH).match(selected_question)
 
 
     student_answered = selected_question_data.get("student_answered", "Unknown")
@@ -117,7 +80,7 @@ if selected_question:
 
     if st.button("🤖 Generate AI Feedback"):
         with st.spinner("Analyzing..."):
-            response = qa_chain.run(selected_question)
+            response = get_service(KNOWLEDGE_BASE_PATH).answer(selected_question)  # ✅ Cached across students
             st.success("✅ AI Analysis Completed!")
             st.write(response)
 
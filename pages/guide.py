@@ -1,7 +1,11 @@
 import json
+import time
 import streamlit as st
-from crew_ai import create_crewai_agent
 from tools.performance_analysis import analyze_performance
+from tools.report_jobs import get_report_job_queue
+
+# Seconds between checks while a report is being generated in the background
+POLL_INTERVAL_SECONDS = 2
 
 st.title("💡Detailed Analysis with Testline Mentor ")
 
@@ -16,6 +20,7 @@ if "selected_topic" in st.session_state and st.session_state["selected_topic"]:
 
     if st.session_state["last_topic"] != selected_topic:
         st.session_state["ai_response"] = None  # Reset AI response
+        st.session_state["report_job_id"] = None
         st.session_state["last_topic"] = selected_topic  # Update stored topic
 
 else:
@@ -25,32 +30,46 @@ else:
 
 if "ai_response" not in st.session_state:
     st.session_state["ai_response"] = None
+if "report_job_id" not in st.session_state:
+    st.session_state["report_job_id"] = None
 
 
-if st.sidebar.button("📢 Get Detailed Analysis") or st.session_state["ai_response"]:
+if (st.sidebar.button("📢 Get Detailed Analysis") or st.session_state["ai_response"]
+        or st.session_state["report_job_id"]):
     st.subheader(f"🎯 Analysis of **{selected_topic}**")
 
 
     if st.session_state["ai_response"] is None:
-        # ✅ Fetch full student quiz data for the selected topic
-        quiz_history, performance_summary = analyze_performance(selected_topic)
-
-        if not quiz_history:
-            st.warning(performance_summary)  # Show warning message if no data found
-        else:
-
-            crew = create_crewai_agent(selected_topic, quiz_data_json=quiz_history,
-                                       performance_summary=performance_summary)
-            result = crew.kickoff(inputs={
-                "topic": selected_topic,
-                "quiz_history": quiz_history
-            })
-
-
-            if hasattr(result, "raw") and isinstance(result.raw, str):
-                st.session_state["ai_response"] = result.raw
-            else:
-                st.session_state["ai_response"] = str(result)
+        queue = get_report_job_queue()
+
+        if st.session_state["report_job_id"] is None:
+            # ✅ Fetch full student quiz data for the selected topic
+            quiz_history, performance_summary = analyze_performance(selected_topic)
+
+            if not quiz_history:
+                st.warning(performance_summary)  # Show warning message if no data found
+                st.stop()
+
+            # ✅ Generated by a background worker; identical requests share one job and the report cache
+            st.session_state["report_job_id"] = queue.submit(selected_topic, quiz_history, performance_summary)["job_id"]
+
+        job = queue.get(st.session_state["report_job_id"])
+        if job is None or job["status"] == "failed":
+            st.session_state["report_job_id"] = None
+            st.error(f"❌ Report generation failed: {job['error'] if job else 'job expired'}")
+            st.stop()
+
+        if job["status"] != "done":
+            st.info(f"⏳ Your mentor is preparing the report ({job['status']}, {job['progress']} steps so far)...")
+            if job["progress"]:
+                latest, _ = queue.jobs.chunks(job["job_id"], job["progress"] - 1)
+                with st.expander("🔎 Latest step"):
+                    st.write(latest[-1])
+            time.sleep(POLL_INTERVAL_SECONDS)
+            st.rerun()
+
+        st.session_state["ai_response"] = job["result"]
+        st.session_state["report_job_id"] = None
 
 
     st.subheader("📊 Performance Summary")
@@ -0,0 +1,49 @@
+"""ColumnarQuizHistory answers topic queries exactly like TopicAnalysisEngine over the same records."""
+import pytest
+import pandas as pd
+from benchmarks.synthetic import TOPICS, make_history
+from data_modules.analysis_engine import TopicAnalysisEngine
+from data_modules.columnar_store import ColumnarQuizHistory, append_columnar, write_columnar
+from data_modules.dataset_store import build_frame
+from data_modules.quiz_metrics import with_metrics
+
+ATTEMPTS = 600
+
+
+@pytest.fixture(scope="module")
+def records():
+    return [with_metrics(quiz) for quiz in make_history(ATTEMPTS)]
+
+
+def assert_matches_engine(columnar, records):
+    engine = TopicAnalysisEngine(build_frame(records))
+    for topic in TOPICS + [TOPICS[0].upper(), "No such topic"]:
+        expected_summary = engine.topic_summary(topic)
+        if expected_summary is None:
+            assert columnar.topic_summary(topic) is None
+        else:
+            assert columnar.topic_summary(topic) == pytest.approx(expected_summary)
+        expected = engine.topic_history(topic)
+        actual = columnar.topic_history(topic)
+        assert len(actual) == len(expected)
+        for got, want in zip(actual, expected):
+            assert got == pytest.approx(want)
+    pd.testing.assert_frame_equal(columnar.all_topic_summaries().sort_index(),
+                                  engine.all_topic_summaries().sort_index(), check_dtype=False)
+
+
+@pytest.mark.parametrize("file_format", ["ipc", "parquet"])
+def test_columnar_matches_engine(tmp_path, records, file_format):
+    path = str(tmp_path / f"quiz_attempts.{file_format}")
+    write_columnar(records, path, file_format)
+    assert_matches_engine(ColumnarQuizHistory(path), records)
+
+
+def test_appended_rows_match_engine(tmp_path, records):
+    path = str(tmp_path / "quiz_attempts.arrow")
+    write_columnar(records[:400], path, "ipc")
+    append_columnar(records[400:], path, "ipc", "next")
+    columnar = ColumnarQuizHistory(path)
+    assert columnar.count() == ATTEMPTS
+    assert_matches_engine(columnar, records)
+
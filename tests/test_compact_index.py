@@ -0,0 +1,68 @@
+"""CompactIndexManager.sync patches the trained index for small changes and retrains for large ones."""
+import copy
+from benchmarks.fakes import FakeEmbeddings
+from benchmarks.synthetic import make_knowledge_base
+from tools.compact_index import CompactIndexManager
+
+QUESTIONS = 200
+NPROBE = 4096  # Search every inverted list, so results don't depend on the clustering
+
+
+def open_manager(path):
+    return CompactIndexManager(FakeEmbeddings(), str(path), kind="ivf-fp16", nprobe=NPROBE).load()
+
+
+def top_question(manager, text):
+    return manager.similarity_search(text, k=1)[0].metadata["question_id"]
+
+
+def test_small_change_patches_index(tmp_path):
+    questions = make_knowledge_base(QUESTIONS)["quiz_questions"]
+    manager = open_manager(tmp_path)
+    assert manager.sync(questions)["rebuilt"] == 1
+    nlist = manager.meta["nlist"]
+
+    edited = copy.deepcopy(questions)
+    edited[0]["question"] = "Which zeppelin hovers over the aquarium?"
+    removed_id = str(edited.pop(1)["question_id"])
+    new = {**edited[5], "question_id": 10_000, "question": "What does a quokka eat for breakfast?"}
+    edited.append(new)
+
+    stats = manager.sync(edited)
+    assert stats == {"added": 1, "updated": 1, "removed": 1, "unchanged": QUESTIONS - 2, "rebuilt": 0}
+    assert manager.meta["nlist"] == nlist  # Not retrained
+
+    reopened = open_manager(tmp_path)
+    assert reopened.index.ntotal == reopened.meta["chunks"]
+    assert top_question(reopened, new["question"]) == "10000"
+    assert top_question(reopened, edited[0]["question"]) == str(edited[0]["question_id"])
+    assert reopened.question_chunks(removed_id) == []
+    assert "zeppelin" in reopened.question_chunks(edited[0]["question_id"])[0].page_content
+    assert reopened.sync(edited)["unchanged"] == QUESTIONS
+
+
+def test_large_change_retrains(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.sync(make_knowledge_base(QUESTIONS)["quiz_questions"])
+    replaced = make_knowledge_base(QUESTIONS, seed=1)["quiz_questions"]
+    for item in replaced:
+        item["question_id"] += QUESTIONS
+
+    assert manager.sync(replaced)["rebuilt"] == 1
+    assert manager.index.ntotal == manager.meta["chunks"]
+    assert manager.question_chunks(1) == []
+
+
+def test_empty_knowledge_base_clears_the_index(tmp_path):
+    assert open_manager(tmp_path).similarity_search("anything") == []  # Never built
+
+    manager = open_manager(tmp_path)
+    questions = make_knowledge_base(QUESTIONS)["quiz_questions"]
+    manager.sync(questions)
+    assert manager.sync([])["rebuilt"] == 1
+
+    reopened = open_manager(tmp_path)
+    assert reopened.similarity_search(questions[0]["question"]) == []
+    assert reopened.question_chunks(questions[0]["question_id"]) == []
+    assert reopened.sync(questions)["rebuilt"] == 1
+    assert top_question(reopened, questions[0]["question"]) == str(questions[0]["question_id"])
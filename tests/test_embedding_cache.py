@@ -0,0 +1,51 @@
+"""EmbeddingCache shared by several writers, and recovery from damaged files."""
+import os
+import numpy as np
+from tools.embedding_cache import EmbeddingCache
+
+DIM = 4
+
+
+def vector(seed):
+    return np.full(DIM, seed, dtype=np.float32)
+
+
+def test_interleaved_writers_keep_rows_aligned(tmp_path):
+    first, second = EmbeddingCache(str(tmp_path), DIM), EmbeddingCache(str(tmp_path), DIM)
+    first.add(["a"], [vector(1)])
+    second.add(["b"], [vector(2)])  # Would reuse row 0 if rows came from an in-memory count
+    first.add(["c", "b"], [vector(3), vector(99)])
+
+    for cache in (first, second, EmbeddingCache(str(tmp_path), DIM)):
+        found = cache.get({"a", "b", "c"})
+        assert {digest: float(value[0]) for digest, value in found.items()} == {"a": 1.0, "b": 2.0, "c": 3.0}
+    with open(tmp_path / "hashes.txt") as f:
+        assert f.read().split() == ["a", "b", "c"]
+    assert os.path.getsize(tmp_path / "vectors.f32") == 3 * DIM * 4
+
+
+def test_missing_vectors_file_resets_the_cache(tmp_path):
+    EmbeddingCache(str(tmp_path), DIM).add(["a", "b"], [vector(1), vector(2)])
+    os.remove(tmp_path / "vectors.f32")
+
+    cache = EmbeddingCache(str(tmp_path), DIM)
+    assert len(cache) == 0
+    cache.add(["b"], [vector(5)])
+    assert float(cache.get({"b"})["b"][0]) == 5.0
+
+
+def test_interrupted_write_is_dropped(tmp_path):
+    EmbeddingCache(str(tmp_path), DIM).add(["a"], [vector(1)])
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(vector(7).tobytes())  # Vector written, hash never appended
+
+    cache = EmbeddingCache(str(tmp_path), DIM)
+    cache.add(["b"], [vector(2)])
+    assert {digest: float(value[0]) for digest, value in cache.get({"a", "b"}).items()} == {"a": 1.0, "b": 2.0}
+
+
+def test_first_add_to_a_new_model_directory(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "new-model"), DIM)
+    assert cache.get({"a"}) == {}
+    cache.add(["a"], [vector(7)])
+    assert float(EmbeddingCache(str(tmp_path / "new-model"), DIM).get({"a"})["a"][0]) == 7.0
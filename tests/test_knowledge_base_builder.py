@@ -0,0 +1,74 @@
+"""Batch knowledge-base builds against the local stub server: output, failures and re-runs."""
+import json
+import random
+import pytest
+from benchmarks.stub_server import StubServer
+from benchmarks.synthetic import make_quiz_source
+from data_modules.knowledge_base_builder import JsonlKnowledgeBaseWriter, build_knowledge_bases
+
+SOURCES = 4
+QUESTIONS = 5
+
+
+def make_routes():
+    rng = random.Random(0)
+    routes = {}
+    for quiz_id in range(1, SOURCES + 1):
+        quiz, student = make_quiz_source(rng, quiz_id, QUESTIONS)
+        routes[f"/quiz/{quiz_id}"] = quiz
+        routes[f"/student/{quiz_id}"] = student
+    return routes
+
+
+def sources(server, quiz_ids):
+    return [{"quiz_url": f"{server.url}/quiz/{quiz_id}", "student_url": f"{server.url}/student/{quiz_id}"}
+            for quiz_id in quiz_ids]
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_build_writes_every_question_once(tmp_path):
+    output = str(tmp_path / "kb.jsonl")
+    with StubServer(make_routes(), delay=0) as server:
+        summary = build_knowledge_bases(sources(server, range(1, SOURCES + 1)), output, processes=1)
+
+    assert summary["built"] == SOURCES and summary["failed"] == []
+    records = read_jsonl(output)
+    assert summary["questions"] == len(records) == SOURCES * QUESTIONS
+    assert {record["quiz_id"] for record in records} == set(range(1, SOURCES + 1))
+
+
+def test_rerun_replaces_output_instead_of_appending(tmp_path):
+    output = str(tmp_path / "kb.jsonl")
+    with StubServer(make_routes(), delay=0) as server:
+        build_knowledge_bases(sources(server, range(1, SOURCES + 1)), output, processes=1)
+        first = read_jsonl(output)
+        build_knowledge_bases(sources(server, range(1, SOURCES + 1)), output, processes=1)
+
+    assert sorted(map(json.dumps, read_jsonl(output))) == sorted(map(json.dumps, first))
+    assert not (tmp_path / "kb.jsonl.tmp").exists()
+
+
+def test_failing_source_is_reported(tmp_path):
+    output = str(tmp_path / "kb.jsonl")
+    with StubServer(make_routes(), delay=0) as server:
+        summary = build_knowledge_bases(sources(server, [1, 99]), output, processes=1)
+
+    assert summary["built"] == 1
+    assert [failure["quiz_url"].rsplit("/", 1)[-1] for failure in summary["failed"]] == ["99"]
+    assert len(read_jsonl(output)) == QUESTIONS
+
+
+def test_interrupted_build_keeps_previous_output(tmp_path):
+    output = tmp_path / "kb.jsonl"
+    output.write_text('{"question_id": 1}\n', encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with JsonlKnowledgeBaseWriter(str(output)) as writer:
+            writer.write("student", 1, [{"question_id": 2}])
+            raise RuntimeError("interrupted")
+
+    assert read_jsonl(output) == [{"question_id": 1}]
+    assert not (tmp_path / "kb.jsonl.tmp").exists()
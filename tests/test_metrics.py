@@ -0,0 +1,27 @@
+"""/metrics cache counters: eager caches always, LangChain/CrewAI-backed ones only once loaded."""
+import asyncio
+import api
+from data_modules.instrumentation import MetricsRegistry
+from tools import tool_cache
+from tools.tool_cache import ToolResultCache
+
+
+def counters(registry):
+    return [line for line in registry.render().splitlines() if line.startswith("quiz_cache_requests_total")]
+
+
+def test_registered_caches(tmp_path, monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(api, "registry", registry)
+    monkeypatch.setattr(tool_cache, "_cache", None)
+    asyncio.run(api.register_caches())
+
+    exported = counters(registry)
+    assert any('cache="latest_quiz",result="coalesced"' in line for line in exported)
+    assert any('cache="mentor_report",result="hits"' in line for line in exported)
+    assert not any('cache="tool_result"' in line or 'cache="answer"' in line for line in exported)
+
+    cache = ToolResultCache(str(tmp_path / "tools.sqlite3"))
+    cache.get_or_fetch("query", lambda: "results")
+    monkeypatch.setattr(tool_cache, "_cache", cache)
+    assert 'quiz_cache_requests_total{cache="tool_result",result="misses"} 1' in counters(registry)
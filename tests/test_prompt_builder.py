@@ -0,0 +1,73 @@
+"""The compact mentor prompt stays within its token budget however long the history is."""
+import json
+import pytest
+from config import MENTOR_PROMPT_TOKEN_BUDGET
+from tools.prompt_builder import (
+    RECENT_ATTEMPTS, build_mentor_task_description, compact_quiz_history, estimate_tokens
+)
+
+
+def make_topic_history(attempts):
+    """Chronological topic history rows shaped like `TopicAnalysisEngine.topic_history`."""
+    return [
+        {
+            "started_at": f"{2020 + n // 336}-{n // 28 % 12 + 1:02d}-{n % 28 + 1:02d}T10:00:00",
+            "title": f"Practice set {n % 40} with a fairly long descriptive quiz title",
+            "total_questions": 20, "correct_answers": n % 20, "incorrect_answers": 20 - n % 20,
+            "total_unattempted": 0, "accuracy_rate": n % 20 * 5.0, "attempt_rate": 100.0,
+            "net_score": n % 20 * 4 - (20 - n % 20), "speed": 1.5, "mistakes_corrected": n % 3
+        }
+        for n in range(attempts)
+    ]
+
+
+@pytest.mark.parametrize("attempts", [1, RECENT_ATTEMPTS, 500, 5000])
+def test_history_fits_budget(attempts):
+    text = compact_quiz_history(make_topic_history(attempts))
+    assert estimate_tokens(text) <= MENTOR_PROMPT_TOKEN_BUDGET
+
+
+def old_history_text(history):
+    """The history as the previous prompt embedded it: the full records as indented JSON."""
+    return json.dumps(history, indent=4)
+
+
+@pytest.mark.parametrize("attempts, min_reduction", [(10, 3), (100, 20), (1000, 200)])
+def test_history_is_smaller_than_the_old_prompt(attempts, min_reduction):
+    history = make_topic_history(attempts)
+    old_tokens = estimate_tokens(old_history_text(history))
+    new_tokens = estimate_tokens(compact_quiz_history(history))
+
+    # The old prompt grew with every attempt (~100 tokens each); the compact one levels off at the budget
+    assert new_tokens <= MENTOR_PROMPT_TOKEN_BUDGET
+    assert new_tokens * min_reduction <= old_tokens
+
+
+def test_long_history_summarizes_old_attempts_before_recent_ones():
+    history = make_topic_history(5000)
+    text = compact_quiz_history(history)
+
+    assert f"{len(history) - RECENT_ATTEMPTS} older attempts" in text
+    # The most recent attempts keep their own rows; older ones only appear in the summary
+    for quiz in history[-RECENT_ATTEMPTS:]:
+        assert quiz["started_at"] in text
+    assert history[0]["started_at"] not in text
+    assert history[-RECENT_ATTEMPTS - 1]["started_at"] not in text
+
+
+def test_tight_budget_drops_oldest_rows_first():
+    history = make_topic_history(500)
+    full = compact_quiz_history(history)
+    tight = compact_quiz_history(history, token_budget=estimate_tokens(full) - 50)
+
+    assert estimate_tokens(tight) <= estimate_tokens(full) - 50
+    assert history[-1]["started_at"] in tight
+    assert history[-RECENT_ATTEMPTS]["started_at"] not in tight
+
+
+def test_task_description_grows_only_by_the_fixed_template():
+    short = build_mentor_task_description("Algebra", make_topic_history(5), "summary")
+    long = build_mentor_task_description("Algebra", make_topic_history(5000), "summary")
+    template = estimate_tokens(build_mentor_task_description("Algebra", [], "summary"))
+    assert estimate_tokens(short) <= template + MENTOR_PROMPT_TOKEN_BUDGET
+    assert estimate_tokens(long) <= template + MENTOR_PROMPT_TOKEN_BUDGET
@@ -0,0 +1,106 @@
+"""Report jobs kept in SQLite: visible from every queue on the same database, streamed without a thread."""
+import asyncio
+import threading
+import time
+from streamlit.testing.v1 import AppTest
+import tools.performance_analysis
+import tools.report_jobs
+from tools.report_cache import MentorReportCache
+from tools.report_jobs import ReportJobQueue
+
+HISTORY = [{"quiz_id": 1, "accuracy": "50 %"}]
+
+
+def slow_crew(release):
+    calls = []
+
+    def generate(topic, quiz_history, performance_summary, on_progress):
+        calls.append(topic)
+        on_progress("step 1")
+        release.wait(5)
+        on_progress("step 2")
+        return f"report on {topic}"
+    return generate, calls
+
+
+def collect(queue, job_id):
+    async def run():
+        return [chunk async for chunk in queue.stream(job_id, poll_seconds=0.01)]
+    return asyncio.run(run())
+
+
+def test_job_is_visible_from_another_worker(tmp_path):
+    release = threading.Event()
+    generate, calls = slow_crew(release)
+    path = str(tmp_path / "reports.sqlite3")
+    queue = ReportJobQueue(max_concurrency=1, generate=generate, cache=MentorReportCache(path))
+    other = ReportJobQueue(max_concurrency=1, generate=generate, cache=MentorReportCache(path))
+
+    job = queue.submit("Algebra", HISTORY, "summary")
+    # The same topic/history submitted through another worker joins the running job
+    assert other.submit("Algebra", HISTORY, "summary")["job_id"] == job["job_id"]
+    assert other.get(job["job_id"])["status"] in ("queued", "running")
+
+    release.set()
+    assert collect(other, job["job_id"]) == ["step 1", "step 2"]
+    assert other.get(job["job_id"])["result"] == "report on Algebra"
+    assert calls == ["Algebra"]
+
+
+def test_failed_job_reports_error(tmp_path):
+    def failing(topic, quiz_history, performance_summary, on_progress):
+        raise RuntimeError("crew failed")
+
+    queue = ReportJobQueue(max_concurrency=1, generate=failing,
+                           cache=MentorReportCache(str(tmp_path / "reports.sqlite3")))
+    job = queue.submit("Geometry", HISTORY, "summary")
+    assert collect(queue, job["job_id"]) == []
+    assert queue.get(job["job_id"])["status"] == "failed"
+    assert queue.get(job["job_id"])["error"] == "crew failed"
+
+
+def test_unknown_job(tmp_path):
+    queue = ReportJobQueue(cache=MentorReportCache(str(tmp_path / "reports.sqlite3")))
+    assert queue.get("missing") is None
+
+
+def test_orphaned_job_is_failed_and_resubmitted(tmp_path):
+    path = str(tmp_path / "reports.sqlite3")
+    queue = ReportJobQueue(max_concurrency=1, generate=lambda *args: "report on Algebra",
+                           cache=MentorReportCache(path))
+    # A job created by a worker that died before running it
+    orphan, _ = queue.jobs.create("Algebra", queue.cache.key("Algebra", HISTORY))
+    assert queue.submit("Algebra", HISTORY, "summary")["job_id"] == orphan
+
+    # Its heartbeat stops; the jobs of live workers keep theirs fresh
+    with queue.jobs._connect() as conn:
+        conn.execute("UPDATE report_jobs SET heartbeat_at = ? WHERE job_id = ?",
+                     (time.time() - tools.report_jobs.STALE_JOB_SECONDS - 1, orphan))
+    assert queue.get(orphan)["status"] == "failed"
+    job = queue.submit("Algebra", HISTORY, "summary")
+    assert job["job_id"] != orphan
+    collect(queue, job["job_id"])
+    assert queue.get(job["job_id"])["result"] == "report on Algebra"
+
+
+def test_guide_page_shows_report(tmp_path, monkeypatch):
+    def generate(topic, quiz_history, performance_summary, on_progress):
+        on_progress("step 1")
+        return f"report on {topic}\nhttps://example.com/article\nhttps://youtube.com/watch?v=1"
+
+    queue = ReportJobQueue(max_concurrency=1, generate=generate,
+                           cache=MentorReportCache(str(tmp_path / "reports.sqlite3")))
+    monkeypatch.setattr(tools.report_jobs, "get_report_job_queue", lambda: queue)
+    monkeypatch.setattr(tools.performance_analysis, "analyze_performance", lambda topic: (HISTORY, "summary"))
+
+    page = AppTest.from_file("../pages/guide.py", default_timeout=30)
+    page.session_state["selected_topic"] = "Algebra"
+    page.run()
+    page.sidebar.button[0].click().run()
+    while page.session_state["ai_response"] is None:  # The page polls until the job is done
+        assert not page.exception and not page.error
+        page.run()
+
+    assert not page.exception
+    assert page.session_state["ai_response"].startswith("report on Algebra")
+    assert "https://example.com/article" in [markdown.value for markdown in page.markdown]
@@ -0,0 +1,103 @@
+"""Snapshot publishing: each refresh appends its new attempts to the previous version's history."""
+import json
+import os
+import pytest
+from benchmarks.synthetic import make_history
+from data_modules import snapshots
+from data_modules.dataset_store import QuizDatasetStore
+from data_modules.snapshots import HISTORY_FILE, MANIFEST_FILE, HistoryAppend, publish_snapshot
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(snapshots, "COLUMNAR_FORMAT", "")
+    monkeypatch.setattr(snapshots, "_current", None)
+    monkeypatch.setattr(snapshots, "_current_signature", None)
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_refresh_appends_only_unseen_attempts():
+    history = make_history(30)
+    publish_snapshot({HISTORY_FILE: history[:20]}, refreshed_at=0)
+    base = snapshots.get_snapshot()
+
+    unseen = base.quiz_store().unseen(history[:25])
+    assert len(unseen) == 5
+    version = publish_snapshot({HISTORY_FILE: HistoryAppend(base, unseen)})
+
+    current = snapshots.get_snapshot()
+    assert current.version == version != base.version
+    assert read_lines(current.path(HISTORY_FILE)) == read_lines(base.path(HISTORY_FILE)) + unseen
+    assert len(read_lines(base.path(HISTORY_FILE))) == 20  # The base version is untouched
+
+
+def test_refresh_without_new_attempts_keeps_the_version():
+    publish_snapshot({HISTORY_FILE: make_history(10), "latest_quiz.json": {"quiz": 1}}, refreshed_at=0)
+    base = snapshots.get_snapshot()
+
+    version = publish_snapshot({HISTORY_FILE: HistoryAppend(base, []), "latest_quiz.json": {"quiz": 1}})
+    assert version == base.version
+    assert snapshots.get_snapshot().refreshed_at > 0  # Only the refresh time moved
+
+
+def test_history_digest_is_chained_from_the_manifest():
+    publish_snapshot({HISTORY_FILE: make_history(10)}, refreshed_at=0)
+    base = snapshots.get_snapshot()
+    with open(base.path(MANIFEST_FILE), encoding="utf-8") as f:
+        assert HISTORY_FILE in json.load(f)["file_digests"]
+
+    extra = make_history(12)[10:]
+    first = publish_snapshot({HISTORY_FILE: HistoryAppend(base, extra)})
+    # The same append on the same base is the same content, so it is not published twice
+    assert publish_snapshot({HISTORY_FILE: HistoryAppend(base, extra)}) == first
+    assert len(os.listdir(snapshots.SNAPSHOT_DIR)) == 3  # Two versions and CURRENT
+
+
+def test_columnar_failure_still_publishes(monkeypatch):
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshots, "COLUMNAR_FORMAT", "ipc")
+    monkeypatch.setattr(snapshots, "columnar_available", lambda: True)
+    monkeypatch.setattr(snapshots, "_write_history_columnar", fail)
+    version = publish_snapshot({HISTORY_FILE: make_history(5)})
+
+    current = snapshots.get_snapshot()
+    assert current.version == version
+    assert current.columnar_history() is None
+    assert len(current.quiz_store().records()) == 5
+
+
+def test_appended_snapshot_carries_the_loaded_store_forward(monkeypatch):
+    history = make_history(30)
+    publish_snapshot({HISTORY_FILE: history[:20]}, refreshed_at=0)
+    base = snapshots.get_snapshot()
+    assert len(base.quiz_store().records()) == 20
+
+    read = []
+    read_tail = QuizDatasetStore._read_tail
+    monkeypatch.setattr(QuizDatasetStore, "_read_tail", lambda store: read.append(read_tail(store)) or read[-1])
+    publish_snapshot({HISTORY_FILE: HistoryAppend(base, history[20:])})
+    current = snapshots.get_snapshot()
+    assert current.version != base.version
+
+    assert [quiz["quiz_id"] for quiz in current.quiz_store().records()] == [quiz["quiz_id"] for quiz in history]
+    assert [len(records) for records in read] == [10]  # Only the appended attempts were parsed
+    assert len(base.quiz_store().records()) == 20  # The previous store is untouched
+    assert current.quiz_store().performance() == QuizDatasetStore(current.path(HISTORY_FILE)).performance()
+
+
+def test_seeded_snapshot_has_no_age():
+    publish_snapshot({HISTORY_FILE: make_history(3)}, refreshed_at=0)
+    seeded = snapshots.get_snapshot()
+    assert seeded.age() is None and seeded.stale
+    assert seeded.status()["age_seconds"] is None
+    assert seeded.headers()["X-Snapshot-Age"] == "never"
+
+    publish_snapshot({HISTORY_FILE: HistoryAppend(seeded, [])})
+    assert 0 <= snapshots.get_snapshot().age() < 60
@@ -0,0 +1,28 @@
+"""Per-student endpoints answer 404, not `200 null`, for data a student doesn't have."""
+import pytest
+from fastapi.testclient import TestClient
+import api
+from benchmarks.synthetic import make_history
+from data_modules.student_store import StudentStore
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = StudentStore(str(tmp_path / "students.sqlite3"))
+    store.add_attempts("with-attempts", make_history(3))
+    store.set_knowledge_base("kb-only", [{"question_id": 1, "question": "What is 2 + 2?"}])
+    monkeypatch.setattr(api, "get_student_store", lambda: store)
+    return TestClient(api.app)
+
+
+def test_knowledge_base_only_student_has_no_performance(client):
+    response = client.get("/students/kb-only/performance")
+    assert response.status_code == 404
+    assert "No quiz attempts" in response.json()["detail"]
+    assert client.get("/students/kb-only/knowledge-base").json()["quiz_questions"][0]["question_id"] == 1
+
+
+def test_student_performance(client):
+    assert len(client.get("/students/with-attempts/performance").json()["all_quiz_performance"]) == 3
+    assert client.get("/students/with-attempts/topics/No such topic").status_code == 404
+    assert client.get("/students/unknown/performance").status_code == 404
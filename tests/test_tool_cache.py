@@ -0,0 +1,87 @@
+"""CachedTool over a stub search tool: hits, misses, expiry, and failures that are not cached."""
+import time
+import pytest
+from crewai.tools import BaseTool
+from tools.tool_cache import CachedTool, ToolResultCache, is_cacheable
+
+
+class StubSearchTool(BaseTool):
+    name: str = "Stub search"
+    description: str = "Returns queued results, or the default one when the queue is empty."
+    calls: int = 0
+    results: list = []
+
+    def _run(self, search_query: str) -> str:
+        self.calls += 1
+        if self.results:
+            result = self.results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return f"results for {search_query}"
+
+
+def make_tool(tmp_path, ttl_seconds=60, results=()):
+    stub = StubSearchTool(results=list(results))
+    cache = ToolResultCache(str(tmp_path / "tools.sqlite3"), ttl_seconds=ttl_seconds)
+    return stub, cache, CachedTool(stub, cache)
+
+
+def test_repeated_query_is_a_hit(tmp_path):
+    stub, cache, tool = make_tool(tmp_path)
+    first = tool.run(search_query="Algebra tutorial")
+    assert tool.run(search_query="  ALGEBRA   tutorial ") == first
+    assert stub.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_different_query_is_a_miss(tmp_path):
+    stub, cache, tool = make_tool(tmp_path)
+    tool.run(search_query="Algebra tutorial")
+    tool.run(search_query="Geometry tutorial")
+    assert stub.calls == 2
+    assert cache.misses == 2
+
+
+def test_entry_expires_after_ttl(tmp_path):
+    stub, cache, tool = make_tool(tmp_path, ttl_seconds=0.05)
+    tool.run(search_query="Algebra tutorial")
+    time.sleep(0.1)
+    tool.run(search_query="Algebra tutorial")
+    assert stub.calls == 2
+
+
+@pytest.mark.parametrize("failure", ["", "Error: rate limit exceeded", "   "])
+def test_error_or_empty_result_is_not_cached(tmp_path, failure):
+    stub, cache, tool = make_tool(tmp_path, results=[failure])
+    tool.run(search_query="Algebra tutorial")
+    assert tool.run(search_query="Algebra tutorial") == "results for Algebra tutorial"
+    assert stub.calls == 2
+    # The successful retry is cached
+    tool.run(search_query="Algebra tutorial")
+    assert stub.calls == 2
+
+
+def test_exception_is_not_cached(tmp_path):
+    stub, cache, tool = make_tool(tmp_path, results=[RuntimeError("upstream down")])
+    with pytest.raises(Exception):
+        tool.run(search_query="Algebra tutorial")
+    assert tool.run(search_query="Algebra tutorial") == "results for Algebra tutorial"
+    assert stub.calls == 2
+
+
+def test_get_or_fetch_skips_error_payloads(tmp_path):
+    cache = ToolResultCache(str(tmp_path / "tools.sqlite3"))
+    assert cache.get_or_fetch("key", lambda: {"error": "quota"}) == {"error": "quota"}
+    assert cache.get("key") is None
+    assert cache.get_or_fetch("key", lambda: {"organic": [1]}) == {"organic": [1]}
+    assert cache.get("key") == {"organic": [1]}
+
+
+def test_is_cacheable():
+    assert is_cacheable("some results")
+    assert is_cacheable({"organic": []})
+    assert not is_cacheable(None)
+    assert not is_cacheable([])
+    assert not is_cacheable({})
+    assert not is_cacheable("error: timeout")
@@ -0,0 +1,114 @@
+"""AsyncTTLCache and the pooled upstream client, against the local stub server."""
+import asyncio
+import pytest
+from fastapi import HTTPException
+from benchmarks.stub_server import LATEST_QUIZ, STUDENT_RESPONSE, StubServer
+from data_modules import latest_quiz_preprocessing
+from data_modules.upstream import AsyncTTLCache, close_http_client, fetch_json
+
+
+def counting_fetch(result="value", delay=0.0):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return result
+    return fetch, calls
+
+
+def test_hit_within_ttl():
+    async def run():
+        cache = AsyncTTLCache(ttl=60)
+        fetch, calls = counting_fetch()
+        assert await cache.get("key", fetch) == "value"
+        assert await cache.get("key", fetch) == "value"
+        return cache, calls
+
+    cache, calls = asyncio.run(run())
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entry_expires_after_ttl():
+    async def run():
+        cache = AsyncTTLCache(ttl=0.05)
+        fetch, calls = counting_fetch()
+        await cache.get("key", fetch)
+        await asyncio.sleep(0.1)
+        await cache.get("key", fetch)
+        return calls
+
+    assert len(asyncio.run(run())) == 2
+
+
+def test_concurrent_misses_are_coalesced():
+    async def run():
+        cache = AsyncTTLCache(ttl=60)
+        fetch, calls = counting_fetch(delay=0.05)
+        results = await asyncio.gather(*(cache.get("key", fetch) for _ in range(20)))
+        return cache, calls, results
+
+    cache, calls, results = asyncio.run(run())
+    assert len(calls) == 1
+    assert results == ["value"] * 20
+    assert (cache.misses, cache.coalesced) == (1, 19)
+
+
+def test_failures_are_not_cached():
+    async def run():
+        cache = AsyncTTLCache(ttl=60)
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            raise RuntimeError("upstream down")
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await cache.get("key", failing)
+        fetch, _ = counting_fetch()
+        return attempts, await cache.get("key", fetch)
+
+    attempts, value = asyncio.run(run())
+    assert len(attempts) == 2
+    assert value == "value"
+
+
+def test_fetch_json_against_stub():
+    routes = {"/quiz": LATEST_QUIZ}
+
+    async def run(server):
+        try:
+            payload = await fetch_json(f"{server.url}/quiz", "quiz failed")
+            with pytest.raises(HTTPException) as missing:
+                await fetch_json(f"{server.url}/missing", "missing failed")
+            return payload, missing.value
+        finally:
+            await close_http_client()
+
+    with StubServer(routes, delay=0) as server:
+        payload, error = asyncio.run(run(server))
+    assert payload == LATEST_QUIZ
+    assert (error.status_code, error.detail) == (500, "missing failed")
+
+
+def test_latest_sources_fetch_upstreams_once_for_concurrent_callers(monkeypatch):
+    routes = {"/quiz": LATEST_QUIZ, "/student": STUDENT_RESPONSE}
+
+    async def run():
+        try:
+            return await asyncio.gather(*(latest_quiz_preprocessing.fetch_latest_sources() for _ in range(10)))
+        finally:
+            await close_http_client()
+
+    with StubServer(routes, delay=0.05) as server:
+        monkeypatch.setattr(latest_quiz_preprocessing, "QUIZ_API", f"{server.url}/quiz")
+        monkeypatch.setattr(latest_quiz_preprocessing, "STUDENT_API", f"{server.url}/student")
+        monkeypatch.setattr(latest_quiz_preprocessing, "latest_quiz_cache", AsyncTTLCache(ttl=60))
+        results = asyncio.run(run())
+        hits = dict(server.hits)
+
+    assert hits == {"/quiz": 1, "/student": 1}
+    assert results[0] == (LATEST_QUIZ["quiz"], STUDENT_RESPONSE)
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from tools.question_index import normalize_question
+
+ANSWER_CACHE_FILE = "answer_cache.json"
+
+
+class AnswerCache:
+    """LRU + TTL cache of generated answers keyed on question text, persisted to a JSON file.
+
+    With `embeddings` and a `similarity_threshold`, a miss on the exact text falls back to
+    the cached question with the highest cosine similarity, if it clears the threshold.
+    Entries are tagged with `knowledge_base_version`; answers from another version of the
+    knowledge base are dropped, so they don't outlive a rebuilt index.
+    """
+
+    def __init__(self, path=ANSWER_CACHE_FILE, max_entries=1000, ttl_seconds=7 * 24 * 3600,
+                 embeddings=None, similarity_threshold=None, knowledge_base_version=None):
+        self.path = path
+        self.knowledge_base_version = knowledge_base_version
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._vectors = {}
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._load()
+
+    @property
+    def semantic(self):
+        return self.embeddings is not None and bool(self.similarity_threshold)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        now = time.time()
+        for key, entry in entries.items():
+            if now - entry["created_at"] < self.ttl_seconds and self._current(entry):
+                self._entries[key] = entry
+        if self.semantic and self._entries:
+            keys = list(self._entries)
+            vectors = self.embeddings.embed_documents([self._entries[key]["question"] for key in keys])
+            self._vectors = {key: self._unit(vector) for key, vector in zip(keys, vectors)}
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _unit(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _current(self, entry):
+        return entry.get("knowledge_base_version") == self.knowledge_base_version
+
+    def set_knowledge_base_version(self, version):
+        """Switches to a new knowledge-base version, dropping answers generated from other versions."""
+        with self._lock:
+            if version == self.knowledge_base_version:
+                return
+            self.knowledge_base_version = version
+            for key in [key for key, entry in self._entries.items() if not self._current(entry)]:
+                self._evict(key)
+            self._save()
+
+    def _expired(self, entry):
+        return time.time() - entry["created_at"] >= self.ttl_seconds
+
+    def _evict(self, key):
+        self._entries.pop(key, None)
+        self._vectors.pop(key, None)
+
+    def _nearest(self, query):
+        if not self._vectors:
+            return None
+        keys = list(self._vectors)
+        scores = np.stack([self._vectors[key] for key in keys]) @ query
+        best = int(np.argmax(scores))
+        return keys[best] if scores[best] >= self.similarity_threshold else None
+
+    def get(self, question):
+        """Returns the cached answer for `question`, or None."""
+        key = normalize_question(question)
+        # ✅ Embed outside the lock; only needed when the exact text is not cached
+        query = None
+        if self.semantic and key not in self._entries:
+            query = self._unit(self.embeddings.embed_query(question))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self._expired(entry):
+                self._evict(key)
+                entry = None
+            if entry is None and query is not None:
+                key = self._nearest(query)
+                entry = self._entries.get(key) if key else None
+                if entry and self._expired(entry):
+                    self._evict(key)
+                    entry = None
+                if entry:
+                    self.semantic_hits += 1
+            elif entry:
+                self.hits += 1
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry["answer"]
+
+    def put(self, question, answer):
+        key = normalize_question(question)
+        vector = self._unit(self.embeddings.embed_query(question)) if self.semantic else None
+        with self._lock:
+            self._entries[key] = {"question": question, "answer": answer, "created_at": time.time(),
+                                  "knowledge_base_version": self.knowledge_base_version}
+            self._entries.move_to_end(key)
+            if vector is not None:
+                self._vectors[key] = vector
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)))
+            self._save()
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits,
+                "semantic_hits": self.semantic_hits, "misses": self.misses}
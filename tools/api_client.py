@@ -0,0 +1,49 @@
+import threading
+import requests
+from config import FASTAPI_URL
+
+REQUEST_TIMEOUT_SECONDS = 10
+
+
+class ConditionalSession:
+    """Pooled HTTP session to the quiz API that revalidates with `If-None-Match`.
+
+    The last body and ETag of each path are remembered, so an unchanged resource costs a
+    304 with no payload instead of a full download and JSON parse.
+    """
+
+    def __init__(self, base_url=FASTAPI_URL):
+        self.base_url = base_url
+        self.session = requests.Session()  # ✅ Keep-alive connections reused across fetches
+        self._lock = threading.Lock()
+        self._validated = {}
+
+    def get_json(self, path):
+        """Returns the JSON body of `path`, or None if the API did not answer with 200/304."""
+        with self._lock:
+            etag, cached = self._validated.get(path, (None, None))
+        headers = {"If-None-Match": etag} if etag else {}
+        response = self.session.get(f"{self.base_url}{path}", headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+
+        if response.status_code == 304 and etag:
+            return cached
+        if response.status_code != 200:
+            return None
+        payload = response.json()
+        if response.headers.get("ETag"):
+            with self._lock:
+                self._validated[path] = (response.headers["ETag"], payload)
+        return payload
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_api_session():
+    """Returns the process-wide conditional session to the quiz API."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = ConditionalSession()
+        return _session
@@ -0,0 +1,57 @@
+import re
+from collections import Counter
+import numpy as np
+from scipy import sparse
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed corpus.
+
+    Every (document, term) weight is precomputed into a sparse document-term matrix, so
+    scoring a query is the sum of a few matrix columns even at 100k+ documents.
+    """
+
+    def __init__(self, texts, ids, k1=1.5, b=0.75):
+        self.ids = list(ids)
+        self.vocabulary = {}
+        rows, cols, counts = [], [], []
+        lengths = np.zeros(len(self.ids), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths[row] = len(tokens)
+            for term, count in Counter(tokens).items():
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                counts.append(count)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        tf = np.asarray(counts, dtype=np.float32)
+        documents = len(self.ids)
+        df = np.bincount(cols, minlength=len(self.vocabulary))
+        idf = np.log(1 + (documents - df + 0.5) / (df + 0.5))
+        average_length = lengths.mean() if documents else 1.0
+        length_norm = k1 * (1 - b + b * lengths[rows] / max(average_length, 1.0))
+        weights = idf[cols] * tf * (k1 + 1) / (tf + length_norm)
+        self.matrix = sparse.csc_matrix((weights.astype(np.float32), (rows, cols)),
+                                        shape=(documents, len(self.vocabulary)))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query, n=10):
+        """Returns `[(id, score), ...]` for the top `n` documents with a positive score."""
+        terms = [self.vocabulary[term] for term in set(tokenize(query)) if term in self.vocabulary]
+        if not terms:
+            return []
+        scores = np.asarray(self.matrix[:, terms].sum(axis=1)).ravel()
+        n = min(n, len(scores))
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top if scores[i] > 0]
@@ -0,0 +1,357 @@
+import json
+import math
+import os
+import shutil
+import sqlite3
+import threading
+import numpy as np
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from config import VECTOR_INDEX_NPROBE
+from tools.vector_index import (
+    CHUNK_OVERLAP, CHUNK_SIZE, COMPACT_INDEX_PATH, knowledge_base_fingerprint, question_hash, split_question
+)
+
+INDEX_FILE = "vectors.index"
+DOCSTORE_FILE = "docstore.sqlite3"
+META_FILE = "meta.json"
+
+# Supported quantized layouts: IVF + product quantization, or IVF + float16 scalar quantization
+INDEX_KINDS = ("ivfpq", "ivf-fp16")
+
+# Bits per PQ code, and the fewest vectors that train its 256-centroid codebooks well; smaller
+# collections are stored as "ivf-fp16" instead
+PQ_BITS = 8
+MIN_PQ_VECTORS = 39 * 2 ** PQ_BITS
+
+# Vectors sampled per inverted list (capped) to train the coarse quantizer and codebooks
+TRAINING_SAMPLES_PER_LIST = 64
+MAX_TRAINING_SAMPLES = 262144
+
+# Vectors added to the index, and texts embedded, per batch
+ADD_BATCH_SIZE = 65536
+EMBED_BATCH_SIZE = 4096
+
+# `sync` patches the trained index in place unless the chunks removed plus added exceed this
+# fraction of it; beyond that the coarse quantizer and codebooks are retrained on the new data
+REBUILD_FRACTION = 0.25
+
+DOCSTORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    row INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_question_id ON chunks (question_id);
+CREATE TABLE IF NOT EXISTS questions (
+    question_id TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def default_nlist(count):
+    """Inverted lists for `count` vectors: about 4 * sqrt(N), never more than the vectors themselves."""
+    return max(1, min(count, 65536, int(4 * math.sqrt(count))))
+
+
+def pq_subquantizers(dim):
+    """Most PQ sub-vectors of at least 4 dimensions that divide `dim` (64 for MiniLM's 384)."""
+    for m in (64, 48, 32, 24, 16, 12, 8, 4, 2, 1):
+        if dim % m == 0 and dim // m >= 4:
+            return m
+    return 1
+
+
+def make_index(kind, dim, nlist):
+    import faiss
+
+    quantizer = faiss.IndexFlatL2(dim)
+    if kind == "ivfpq":
+        return faiss.IndexIVFPQ(quantizer, dim, nlist, pq_subquantizers(dim), PQ_BITS)
+    if kind == "ivf-fp16":
+        return faiss.IndexIVFScalarQuantizer(quantizer, dim, nlist, faiss.ScalarQuantizer.QT_fp16)
+    raise ValueError(f"Unknown compact index kind: {kind} (expected one of {INDEX_KINDS})")
+
+
+def build_compact_index(vectors, path, kind="ivfpq", nlist=None, seed=0):
+    """Trains a quantized IVF index on a sample of `vectors` (an array or memmap), adds them in
+    batches so row `i` is id `i`, and writes it to `path`. Returns `(layout, nlist)`."""
+    import faiss
+
+    count, dim = vectors.shape
+    if kind == "ivfpq" and count < MIN_PQ_VECTORS:
+        kind = "ivf-fp16"
+    nlist = nlist or default_nlist(count)
+    index = make_index(kind, dim, nlist)
+
+    wanted = max(nlist * TRAINING_SAMPLES_PER_LIST, MIN_PQ_VECTORS if kind == "ivfpq" else 0)
+    sample_size = min(count, wanted, MAX_TRAINING_SAMPLES)
+    sample = np.sort(np.random.default_rng(seed).choice(count, sample_size, replace=False))
+    index.train(np.ascontiguousarray(vectors[sample], dtype=np.float32))
+    for start in range(0, count, ADD_BATCH_SIZE):
+        index.add(np.ascontiguousarray(vectors[start:start + ADD_BATCH_SIZE], dtype=np.float32))
+
+    faiss.write_index(index, path)
+    return kind, nlist
+
+
+def load_compact_index(path, nprobe=VECTOR_INDEX_NPROBE):
+    """Opens an index written by `build_compact_index` with its inverted lists memory-mapped."""
+    import faiss
+
+    index = faiss.read_index(path, faiss.IO_FLAG_MMAP)
+    index.nprobe = nprobe
+    return index
+
+
+class ChunkStore:
+    """Chunk texts in SQLite keyed by FAISS row and `question_id`, read on demand.
+
+    Replaces the pickled LangChain docstore, which has to be unpickled in full on load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def write(self, chunks, hashes=()):
+        """Writes `(doc_id, question_id, text)` tuples as rows 0..n-1, and `(question_id, hash)` pairs."""
+        conn = self._connect()
+        with conn:
+            conn.executescript(DOCSTORE_SCHEMA)
+            conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)",
+                             ((row, *chunk) for row, chunk in enumerate(chunks)))
+            conn.executemany("INSERT INTO questions VALUES (?, ?)", hashes)
+
+    def question_hashes(self):
+        """{question_id: content hash} of every indexed question."""
+        return dict(self._connect().execute("SELECT question_id, hash FROM questions"))
+
+    def rows_of(self, question_ids):
+        """FAISS rows of every chunk of the given questions."""
+        conn = self._connect()
+        return [row for question_id in question_ids
+                for (row,) in conn.execute("SELECT row FROM chunks WHERE question_id = ?", (question_id,))]
+
+    def next_row(self):
+        return self._connect().execute("SELECT COALESCE(MAX(row) + 1, 0) FROM chunks").fetchone()[0]
+
+    def apply(self, stale_question_ids, chunks, first_row, hashes):
+        """Deletes the chunks of `stale_question_ids`, then writes `chunks` as rows from `first_row`."""
+        conn = self._connect()
+        with conn:
+            conn.executemany("DELETE FROM chunks WHERE question_id = ?", ((qid,) for qid in stale_question_ids))
+            conn.executemany("DELETE FROM questions WHERE question_id = ?", ((qid,) for qid in stale_question_ids))
+            conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)",
+                             ((first_row + n, *chunk) for n, chunk in enumerate(chunks)))
+            conn.executemany("INSERT INTO questions VALUES (?, ?)", hashes)
+
+    @staticmethod
+    def _document(doc_id, question_id, text):
+        return Document(page_content=text, metadata={"question_id": question_id, "doc_id": doc_id})
+
+    def by_rows(self, rows):
+        """Returns {row: Document} for the given FAISS rows."""
+        if not rows:
+            return {}
+        placeholders = ",".join("?" * len(rows))
+        cursor = self._connect().execute(
+            f"SELECT row, doc_id, question_id, text FROM chunks WHERE row IN ({placeholders})", rows
+        )
+        return {row: self._document(doc_id, question_id, text) for row, doc_id, question_id, text in cursor}
+
+    def by_question(self, question_id):
+        cursor = self._connect().execute(
+            "SELECT doc_id, question_id, text FROM chunks WHERE question_id = ? ORDER BY row", (str(question_id),)
+        )
+        return [self._document(*chunk) for chunk in cursor]
+
+
+class CompactIndexManager:
+    """Quantized, memory-mapped FAISS index plus an SQLite docstore for large question banks.
+
+    Same search interface as `VectorIndexManager`. The docstore records each question's
+    content hash, so `sync` removes the chunks of deleted or edited questions and adds new
+    ones to the trained index with `remove_ids`/`add_with_ids`; it retrains only when the
+    collection crosses MIN_PQ_VECTORS or the change is a large part of the index. Loading
+    maps the inverted lists instead of reading them, and chunk texts are fetched from SQLite
+    only for the rows a search returns.
+    """
+
+    def __init__(self, embedding_model, index_path=COMPACT_INDEX_PATH, kind="ivfpq", nprobe=VECTOR_INDEX_NPROBE):
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown compact index kind: {kind} (expected one of {INDEX_KINDS})")
+        self.embedding_model = embedding_model
+        self.index_path = index_path
+        self.kind = kind
+        self.nprobe = nprobe
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+        self.index = None
+        self.docstore = None
+        self.meta = {}
+
+    def _file(self, name):
+        return os.path.join(self.index_path, name)
+
+    def load(self):
+        if not os.path.exists(self._file(META_FILE)):
+            return self
+        with open(self._file(META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.index = self._load_index()
+        self.docstore = ChunkStore(self._file(DOCSTORE_FILE))
+        return self
+
+    def _load_index(self):
+        """The mapped index, or None when the knowledge base was empty at the last rebuild."""
+        if not os.path.exists(self._file(INDEX_FILE)):
+            return None
+        return load_compact_index(self._file(INDEX_FILE), self.nprobe)
+
+    def sync(self, questions):
+        """Applies the difference between `questions` and the index. Returns counts per kind of change."""
+        fingerprint = knowledge_base_fingerprint(questions)
+        if self.meta.get("fingerprint") == fingerprint and self.meta.get("kind") == self.kind:
+            return {"added": 0, "updated": 0, "removed": 0, "unchanged": len(questions), "rebuilt": 0}
+
+        wanted = {str(item["question_id"]): item for item in questions}
+        # Indexes written before question hashes were recorded have no "questions" count
+        indexed = self.docstore.question_hashes() if self.index is not None and "questions" in self.meta else None
+        if indexed is None or self.meta.get("kind") != self.kind:
+            self._rebuild(questions, fingerprint)
+            return {"added": len(questions), "updated": 0, "removed": 0, "unchanged": 0, "rebuilt": 1}
+
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "rebuilt": 0}
+        stale = [question_id for question_id in indexed if question_id not in wanted]
+        stats["removed"] = len(stale)
+        changed = []
+        for question_id, item in wanted.items():
+            digest = question_hash(item)
+            if indexed.get(question_id) == digest:
+                stats["unchanged"] += 1
+                continue
+            stats["updated" if question_id in indexed else "added"] += 1
+            if question_id in indexed:
+                stale.append(question_id)
+            changed.append(item)
+
+        stale_rows = self.docstore.rows_of(stale)
+        chunks, hashes = self._split(changed)
+        count = self.index.ntotal - len(stale_rows) + len(chunks)
+        crosses_pq = self.kind == "ivfpq" and (self.meta.get("layout") == "ivfpq") != (count >= MIN_PQ_VECTORS)
+        if crosses_pq or len(stale_rows) + len(chunks) > REBUILD_FRACTION * max(self.index.ntotal, 1):
+            self._rebuild(questions, fingerprint)
+            return {**stats, "rebuilt": 1}
+
+        self._patch(stale, stale_rows, chunks, hashes, fingerprint, len(wanted))
+        return stats
+
+    def _split(self, questions):
+        """Chunks `(doc_id, question_id, text)` and `(question_id, hash)` pairs of `questions`."""
+        chunks, hashes = [], []
+        for item in questions:
+            documents, doc_ids = split_question(item, self.splitter)
+            chunks += [(doc_id, str(item["question_id"]), doc.page_content) for doc, doc_id in zip(documents, doc_ids)]
+            hashes.append((str(item["question_id"]), question_hash(item)))
+        return chunks, hashes
+
+    def _embed(self, chunks, staging_path):
+        """Embeds chunk texts in batches into a memmap at `staging_path` (None if there are none)."""
+        # ✅ Vectors are staged in a memmap, so building millions of chunks doesn't need them all in RAM
+        vectors = None
+        for start in range(0, len(chunks), EMBED_BATCH_SIZE):
+            batch = np.asarray(self.embedding_model.embed_documents(
+                [text for _, _, text in chunks[start:start + EMBED_BATCH_SIZE]]
+            ), dtype=np.float32)
+            if vectors is None:
+                vectors = np.memmap(staging_path, dtype=np.float32, mode="w+", shape=(len(chunks), batch.shape[1]))
+            vectors[start:start + len(batch)] = batch
+        return vectors
+
+    def _temp_files(self):
+        tmp_index, tmp_docstore = self._file(f"{INDEX_FILE}.tmp"), self._file(f"{DOCSTORE_FILE}.tmp")
+        for tmp_path in (tmp_index, tmp_docstore):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return tmp_index, tmp_docstore
+
+    def _publish(self, tmp_index, tmp_docstore, meta):
+        """Swaps in the new files; a `tmp_index` of None publishes an empty index (no chunks)."""
+        if tmp_index is not None:
+            os.replace(tmp_index, self._file(INDEX_FILE))
+        elif os.path.exists(self._file(INDEX_FILE)):
+            os.remove(self._file(INDEX_FILE))
+        os.replace(tmp_docstore, self._file(DOCSTORE_FILE))
+        self.meta = meta
+        with open(self._file(META_FILE), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        self.index = self._load_index()
+        self.docstore = ChunkStore(self._file(DOCSTORE_FILE))  # Fresh connections to the replaced file
+
+    def _rebuild(self, questions, fingerprint):
+        os.makedirs(self.index_path, exist_ok=True)
+        chunks, hashes = self._split(questions)
+        staging_path = self._file("vectors.staging.f32")
+        vectors = self._embed(chunks, staging_path)
+        tmp_index, tmp_docstore = self._temp_files()
+        if vectors is None:
+            # ✅ Nothing to index: publish an empty docstore, so removed questions stop being returned
+            tmp_index, layout, nlist = None, None, 0
+        else:
+            layout, nlist = build_compact_index(vectors, tmp_index, self.kind)
+            del vectors
+        ChunkStore(tmp_docstore).write(chunks, hashes)
+        if os.path.exists(staging_path):
+            os.remove(staging_path)
+
+        self._publish(tmp_index, tmp_docstore, {
+            "fingerprint": fingerprint, "kind": self.kind, "layout": layout, "nlist": nlist,
+            "chunks": len(chunks), "questions": len(hashes)
+        })
+
+    def _patch(self, stale_question_ids, stale_rows, chunks, hashes, fingerprint, question_count):
+        """Removes `stale_rows` from the trained index and adds `chunks` under new row ids."""
+        import faiss
+
+        staging_path = self._file("vectors.staging.f32")
+        vectors = self._embed(chunks, staging_path)
+        tmp_index, tmp_docstore = self._temp_files()
+        # The mapped index is read-only, so the patched copy is read into memory and written back
+        index = faiss.read_index(self._file(INDEX_FILE))
+        if stale_rows:
+            index.remove_ids(np.asarray(stale_rows, dtype=np.int64))
+        first_row = self.docstore.next_row()
+        if vectors is not None:
+            for start in range(0, len(chunks), ADD_BATCH_SIZE):
+                batch = np.ascontiguousarray(vectors[start:start + ADD_BATCH_SIZE], dtype=np.float32)
+                index.add_with_ids(batch, np.arange(first_row + start, first_row + start + len(batch), dtype=np.int64))
+            del vectors
+            os.remove(staging_path)
+        faiss.write_index(index, tmp_index)
+
+        shutil.copyfile(self._file(DOCSTORE_FILE), tmp_docstore)
+        ChunkStore(tmp_docstore).apply(stale_question_ids, chunks, first_row, hashes)
+        self._publish(tmp_index, tmp_docstore, {
+            **self.meta, "fingerprint": fingerprint, "chunks": int(index.ntotal), "questions": question_count
+        })
+
+    def similarity_search(self, question, k=4):
+        if self.index is None:
+            return []  # Not built yet, or built from an empty knowledge base
+        query = np.asarray([self.embedding_model.embed_query(question)], dtype=np.float32)
+        _, rows = self.index.search(query, k)
+        found = [int(row) for row in rows[0] if row >= 0]
+        docs = self.docstore.by_rows(found)
+        return [docs[row] for row in found if row in docs]
+
+    def question_chunks(self, question_id):
+        return self.docstore.by_question(question_id) if self.docstore else []
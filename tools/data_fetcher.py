@@ -1,10 +1,9 @@
-import json
+from data_modules.snapshots import current_quiz_store
 
 def fetch_quiz_data():
-    """Fetches quiz data from the JSON file."""
+    """Fetches quiz data from the current snapshot's in-memory dataset store."""
     try:
-        with open("quiz_data.json", "r") as f:
-            return json.load(f)
+        return current_quiz_store().records()
     except FileNotFoundError:
         return []
 
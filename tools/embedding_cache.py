@@ -0,0 +1,181 @@
+import hashlib
+import os
+import re
+import threading
+from contextlib import contextmanager
+import numpy as np
+from langchain.embeddings.base import Embeddings
+from config import EMBEDDING_BATCH_SIZE, EMBEDDING_THREADS
+from data_modules.instrumentation import timed
+
+try:
+    import fcntl  # Unix: serializes appends from several processes
+except ImportError:
+    fcntl = None
+
+EMBEDDING_CACHE_DIR = "embedding_cache"
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Append-only on-disk store of float32 vectors keyed by text hash, for a single model.
+
+    `hashes.txt` holds one hash per line; row `i` of the raw `vectors.f32` file is the vector
+    for line `i`. Vectors are read through a NumPy memory map, so the cache is not loaded
+    into RAM up front. Several processes may share the directory: appends hold an exclusive
+    `flock` on it, and each vector is written before its hash, so a complete hash line
+    always has its row.
+    """
+
+    def __init__(self, cache_dir, dim):
+        self.cache_dir = cache_dir
+        self.dim = dim
+        self.row_bytes = 4 * dim
+        self.hashes_path = os.path.join(cache_dir, "hashes.txt")
+        self.vectors_path = os.path.join(cache_dir, "vectors.f32")
+        self.lock_path = os.path.join(cache_dir, "lock")
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._count = 0
+        self._hashes_offset = 0
+        self._vectors = None
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._file_lock():
+            self._repair()
+        self._catch_up()
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared with other processes using this directory (none where fcntl is missing)."""
+        with open(self.lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _repair(self):
+        """Makes both files describe the same rows (caller holds the file lock)."""
+        hashes = []
+        if os.path.exists(self.hashes_path):
+            with open(self.hashes_path, "r") as f:
+                data = f.read()
+            hashes = data[:data.rfind("\n") + 1].split()
+        stored = os.path.getsize(self.vectors_path) // self.row_bytes if os.path.exists(self.vectors_path) else 0
+        if stored < len(hashes) or (hashes and not data.endswith("\n")):
+            # ✅ Vectors missing or cut short (e.g. deleted): keep only the rows both files have,
+            # which resets the cache when vectors.f32 is gone
+            hashes = hashes[:stored]
+            with open(self.hashes_path, "w") as f:
+                f.write("".join(f"{digest}\n" for digest in hashes))
+        # Both files exist from here on, even for a new model directory
+        for path in (self.hashes_path, self.vectors_path):
+            with open(path, "ab"):
+                pass
+        # Drop the tail of an interrupted write (a vector whose hash was never appended)
+        os.truncate(self.vectors_path, len(hashes) * self.row_bytes)
+
+    def _catch_up(self):
+        """Maps rows appended since the last read, by this or another process (caller holds `_lock`)."""
+        size = os.path.getsize(self.hashes_path) if os.path.exists(self.hashes_path) else 0
+        if size < self._hashes_offset:  # Rewritten by a repair: read it again from the start
+            self._rows, self._count, self._hashes_offset = {}, 0, 0
+        if size == self._hashes_offset:
+            return
+        with open(self.hashes_path, "rb") as f:
+            f.seek(self._hashes_offset)
+            data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]  # Leave a half-written last line for the next read
+        for digest in complete.decode().split():
+            self._rows.setdefault(digest, self._count)
+            self._count += 1
+        self._hashes_offset += len(complete)
+        self._map(self._count)
+
+    def _map(self, rows):
+        self._vectors = (
+            np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)) if rows else None
+        )
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get(self, digests):
+        """Returns {hash: vector} for the hashes that are cached."""
+        with self._lock:
+            if any(digest not in self._rows for digest in digests):
+                self._catch_up()
+            return {digest: self._vectors[self._rows[digest]] for digest in digests if digest in self._rows}
+
+    def add(self, digests, vectors):
+        with self._lock, self._file_lock():
+            self._catch_up()
+            fresh = [(digest, vector) for digest, vector in zip(digests, vectors) if digest not in self._rows]
+            if not fresh:
+                return
+            # ✅ The next row comes from the file itself, under the lock, not from an in-memory count
+            row = os.path.getsize(self.vectors_path) // self.row_bytes
+            if row != self._count:
+                os.truncate(self.vectors_path, self._count * self.row_bytes)
+                row = self._count
+            if os.path.getsize(self.hashes_path) != self._hashes_offset:
+                os.truncate(self.hashes_path, self._hashes_offset)  # A half-written line from a crashed writer
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.asarray([vector for _, vector in fresh], dtype=np.float32).tobytes())
+            lines = "".join(f"{digest}\n" for digest, _ in fresh).encode()
+            with open(self.hashes_path, "ab") as f:
+                f.write(lines)
+            for offset, (digest, _) in enumerate(fresh):
+                self._rows[digest] = row + offset
+            self._count = row + len(fresh)
+            self._hashes_offset += len(lines)
+            self._map(self._count)
+
+
+class CachedEmbeddings(Embeddings):
+    """Sentence-transformers embeddings computed in batches and cached on disk by (model, text hash).
+
+    Drop-in replacement for `HuggingFaceEmbeddings` that never re-embeds identical text.
+    """
+
+    def __init__(self, model_name, cache_dir=EMBEDDING_CACHE_DIR,
+                 batch_size=EMBEDDING_BATCH_SIZE, num_threads=EMBEDDING_THREADS):
+        from sentence_transformers import SentenceTransformer
+
+        if num_threads:
+            import torch
+            torch.set_num_threads(num_threads)
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = SentenceTransformer(model_name)
+        model_dir = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        self.cache = EmbeddingCache(os.path.join(cache_dir, model_dir),
+                                    self.model.get_sentence_embedding_dimension())
+
+    @timed("embedding.encode")
+    def _encode(self, texts):
+        return self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True, show_progress_bar=False)
+
+    def embed_documents(self, texts):
+        digests = [text_hash(text) for text in texts]
+        cached = self.cache.get(set(digests))
+
+        missing = {}
+        for digest, text in zip(digests, texts):
+            if digest not in cached and digest not in missing:
+                missing[digest] = text
+        if missing:
+            vectors = self._encode(list(missing.values()))
+            self.cache.add(list(missing), vectors)
+            cached.update(zip(missing, vectors))
+
+        return [cached[digest].tolist() for digest in digests]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
@@ -1,73 +1,46 @@
-import pandas as pd
-import json
-from datetime import datetime
+from data_modules.snapshots import current_quiz_store
+from data_modules.instrumentation import timed
 
+@timed("analysis.topic")
 def analyze_performance(topic):
     """Extracts all quiz attempts for the given topic, calculates trends, and tracks student improvement."""
 
+    store = current_quiz_store()
     try:
-        with open("quiz_data.json", "r") as f:
-            quiz_data = json.load(f)
+        has_records = store.has_records()
     except FileNotFoundError:
         return None, "❌ Quiz data file not found."
 
-    df = pd.DataFrame(quiz_data)
-
-    if df.empty:
+    if not has_records:
         return None, "⚠️ No quiz data available."
 
 
-    df_filtered = df[df["topic"].str.lower() == topic.lower()]
+    summary = store.topic_summary(topic)
 
-    if df_filtered.empty:
+    if summary is None:
         return None, f"⚠️ No quiz data found for the topic: {topic}"
 
 
-    df_filtered["started_at"] = pd.to_datetime(df_filtered["started_at"])
-
-
-    df_filtered = df_filtered.sort_values(by="started_at")
-
-
-    df_filtered["started_at"] = df_filtered["started_at"].dt.strftime("%Y-%m-%d %H:%M:%S")
-
-
-    df_filtered["total_attempted"] = df_filtered["correct_answers"] + df_filtered["incorrect_answers"]
-    df_filtered["total_unattempted"] = df_filtered["total_questions"] - df_filtered["total_attempted"]
-
+    avg_accuracy = summary["average_accuracy"]
+    avg_attempt_rate = summary["average_attempt_rate"]
+    avg_unanswered_rate = summary["average_unanswered_rate"]
+    total_quizzes = summary["total_quizzes"]
 
-    df_filtered["total_unattempted"] = df_filtered["total_unattempted"].apply(lambda x: max(0, x))
-
-
-    df_filtered["accuracy_rate"] = (df_filtered["correct_answers"] / df_filtered["total_attempted"]) * 100
-    df_filtered["attempt_rate"] = (df_filtered["total_attempted"] / df_filtered["total_questions"]) * 100
-    df_filtered["unanswered_rate"] = (df_filtered["total_unattempted"] / df_filtered["total_questions"]) * 100
-    df_filtered["net_score"] = (df_filtered["correct_answers"] * df_filtered["correct_answer_marks"]) - (
-        df_filtered["incorrect_answers"] * df_filtered["negative_marks"])
-
-    avg_accuracy = df_filtered["accuracy_rate"].mean()
-    avg_attempt_rate = df_filtered["attempt_rate"].mean()
-    avg_unanswered_rate = df_filtered["unanswered_rate"].mean()
-
-
-    first_attempt = df_filtered.iloc[0]
-    latest_attempt = df_filtered.iloc[-1]
-
-    accuracy_change = latest_attempt["accuracy_rate"] - first_attempt["accuracy_rate"]
-    net_score_change = latest_attempt["net_score"] - first_attempt["net_score"]
+    accuracy_change = summary["accuracy_change"]
+    net_score_change = summary["net_score_change"]
 
     improvement_summary = (
         f"📈 **Performance Over Time in {topic}**\n"
-        f"- **First Quiz Date:** {first_attempt['started_at']}\n"
-        f"- **Latest Quiz Date:** {latest_attempt['started_at']}\n"
+        f"- **First Quiz Date:** {summary['first_started_at']}\n"
+        f"- **Latest Quiz Date:** {summary['latest_started_at']}\n"
         f"- **Accuracy Change:** {accuracy_change:+.2f}%\n"
         f"- **Net Score Change:** {net_score_change:+.2f} points\n\n"
-        f"✅ **Total Quizzes Taken:** {len(df_filtered)}"
+        f"✅ **Total Quizzes Taken:** {total_quizzes}"
         f"\n\nDoes the student show improvement? {'✅ Yes' if accuracy_change > 0 else '❌ No'}"
     )
 
 
-    full_quiz_history = df_filtered.to_dict(orient="records")
+    full_quiz_history = store.topic_history(topic)
 
 
     performance_summary = (
@@ -75,9 +48,16 @@ def analyze_performance(topic):
         f"- **Average Accuracy Rate:** {avg_accuracy:.2f}%\n"
         f"- **Average Attempt Rate:** {avg_attempt_rate:.2f}%\n"
         f"- **Average Unanswered Rate:** {avg_unanswered_rate:.2f}%\n"
-        f"- **Total Quizzes Taken:** {len(df_filtered)}\n\n"
+        f"- **Total Quizzes Taken:** {total_quizzes}\n\n"
         f"{improvement_summary}\n\n"
         f"Here is the detailed performance history:"
     )
 
     return full_quiz_history, performance_summary
+
+
+@timed("analysis.all_topics")
+def analyze_all_topics():
+    """Aggregates for every topic in one vectorized pass, as a list of records sorted by topic."""
+    summaries = current_quiz_store().all_topic_summaries()
+    return summaries.reset_index(drop=True).to_dict(orient="records")
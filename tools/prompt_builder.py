@@ -0,0 +1,112 @@
+import math
+from collections import defaultdict
+from config import MENTOR_PROMPT_TOKEN_BUDGET
+
+# Attempts shown row by row before older ones are summarized
+RECENT_ATTEMPTS = 10
+
+# Most frequent quiz titles listed individually in the summary of older attempts
+MAX_TITLE_LINES = 8
+
+# (record field, column header) for the compact attempt table
+TABLE_COLUMNS = [
+    ("started_at", "date"), ("title", "quiz"), ("total_questions", "qs"), ("correct_answers", "right"),
+    ("incorrect_answers", "wrong"), ("total_unattempted", "skip"), ("accuracy_rate", "acc%"),
+    ("attempt_rate", "att%"), ("net_score", "net"), ("speed", "speed"), ("mistakes_corrected", "fixed")
+]
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token for English and numbers)."""
+    return math.ceil(len(text) / 4)
+
+
+def _value(value):
+    if isinstance(value, float):
+        return f"{value:.1f}".rstrip("0").rstrip(".")
+    return str(value).strip()
+
+
+def _table(attempts):
+    lines = ["|".join(header for _, header in TABLE_COLUMNS)]
+    for quiz in attempts:
+        lines.append("|".join(_value(quiz.get(field, "")) for field, _ in TABLE_COLUMNS))
+    return "\n".join(lines)
+
+
+def _mean(attempts, field):
+    return sum(quiz[field] for quiz in attempts) / len(attempts)
+
+
+def _summary(attempts, per_title):
+    accuracies = [quiz["accuracy_rate"] for quiz in attempts]
+    lines = [
+        f"{len(attempts)} older attempts, {attempts[0]['started_at'][:10]} to {attempts[-1]['started_at'][:10]}: "
+        f"mean acc {_value(_mean(attempts, 'accuracy_rate'))}%, mean att {_value(_mean(attempts, 'attempt_rate'))}%, "
+        f"mean net {_value(_mean(attempts, 'net_score'))}, best acc {_value(max(accuracies))}%, "
+        f"worst acc {_value(min(accuracies))}%"
+    ]
+    if per_title:
+        by_title = defaultdict(list)
+        for quiz in attempts:
+            by_title[str(quiz["title"]).strip()].append(quiz)
+        for title, group in sorted(by_title.items(), key=lambda item: -len(item[1]))[:MAX_TITLE_LINES]:
+            lines.append(
+                f"- {title}: {len(group)}x, mean acc {_value(_mean(group, 'accuracy_rate'))}%, "
+                f"acc {_value(group[0]['accuracy_rate'])}%->{_value(group[-1]['accuracy_rate'])}%"
+            )
+    return "\n".join(lines)
+
+
+def _render(history, recent, per_title):
+    older, latest = history[:len(history) - recent], history[len(history) - recent:]
+    parts = []
+    if older:
+        parts.append(_summary(older, per_title))
+    if latest:
+        parts.append(f"Most recent {len(latest)} attempts (oldest first):\n{_table(latest)}")
+    return "\n\n".join(parts)
+
+
+def compact_quiz_history(quiz_history, token_budget=MENTOR_PROMPT_TOKEN_BUDGET, recent_attempts=RECENT_ATTEMPTS):
+    """Dense text encoding of a chronologically sorted topic history for the mentor prompt.
+
+    The most recent attempts are listed as a pipe-separated table and older ones are
+    summarized. Fewer attempts are listed in full until the text fits `token_budget`.
+    """
+    if not quiz_history:
+        return "No attempts recorded."
+
+    recent = min(recent_attempts, len(quiz_history))
+    while True:
+        text = _render(quiz_history, recent, per_title=True)
+        if estimate_tokens(text) <= token_budget or recent == 0:
+            break
+        recent = recent // 2 if recent > 1 else 0
+
+    if estimate_tokens(text) > token_budget:
+        text = _render(quiz_history, 0, per_title=False)
+    return text
+
+
+def build_mentor_task_description(topic, quiz_history, performance_summary, token_budget=MENTOR_PROMPT_TOKEN_BUDGET):
+    """Task description for the mentor agent, with the history compacted to `token_budget`."""
+    quiz_data_str = compact_quiz_history(quiz_history, token_budget).replace("{", "{{").replace("}", "}}")
+
+    return (
+        f"Analyze the student's quiz performance in **{topic}**.\n\n"
+        f"### 📊 **Performance Trends**\n"
+        f"{performance_summary}\n\n"
+        f"Here is the student's quiz history (columns: acc% = accuracy, att% = attempt rate, "
+        f"net = net score, fixed = mistakes corrected):\n\n"
+        f"{quiz_data_str}\n\n"
+        f"### 🔹 Key Points to Analyze:\n"
+        f"1️⃣ **Highlight weak areas, improvement trends, and performance gaps for a given user.**\n\n"
+        f"2️⃣ **Identify specific strengths and weaknesses with creative labels or insights.**\n"
+        f"3️⃣ **Analyze if the student is improving over multiple attempts.**\n"
+        f"4️⃣ **Detect the weakest concepts based on repeated mistakes.**\n\n"
+        f"5️⃣ **Use `youtube_search_tool.run('{topic} tutorial')` to find 2 relevant YouTube videos.**\n"
+        f"6️⃣ **Use `google_search_tool.run('{topic} tutorial')` to find 2 relevant articles.**\n"
+        f"7️⃣ **Ensure the YouTube video links are clickable for easy access.**"
+        f"🎯 **Your output MUST include clickable YouTube and article links.**"
+    )
@@ -0,0 +1,24 @@
+def normalize_question(question):
+    return " ".join(question.split()).lower()
+
+
+class QuestionIndex:
+    """Hash lookups from question text (whitespace- and case-normalized) or `question_id` to
+    knowledge-base entries, replacing linear scans over `quiz_questions`."""
+
+    def __init__(self, questions):
+        self.by_id = {}
+        self.by_text = {}
+        for item in questions:
+            self.by_id[str(item["question_id"])] = item
+            self.by_text.setdefault(normalize_question(item["question"]), item)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def get(self, question_id):
+        return self.by_id.get(str(question_id))
+
+    def match(self, question):
+        """Returns the entry whose question text equals `question`, or None."""
+        return self.by_text.get(normalize_question(question))
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+REPORT_DB_FILE = os.path.join("db", "mentor_reports.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mentor_reports (
+    topic_key TEXT NOT NULL,
+    history_hash TEXT NOT NULL,
+    report TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (topic_key, history_hash)
+) WITHOUT ROWID;
+"""
+
+
+def history_fingerprint(quiz_history):
+    """Stable hash of a topic's quiz history; it changes whenever an attempt is added or edited."""
+    payload = json.dumps(quiz_history, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MentorReportCache:
+    """Durable cache of mentor reports keyed on (topic, quiz history hash).
+
+    Concurrent requests for the same key inside this process wait on a single
+    generation. Storing a report for a topic drops the topic's reports for older
+    histories, so new attempts invalidate what was cached before them.
+    """
+
+    def __init__(self, path=REPORT_DB_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def key(topic, quiz_history):
+        return topic.lower(), history_fingerprint(quiz_history)
+
+    def get(self, topic, quiz_history):
+        row = self._connect().execute(
+            "SELECT report FROM mentor_reports WHERE topic_key = ? AND history_hash = ?",
+            self.key(topic, quiz_history)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, topic, quiz_history, report):
+        topic_key, history_hash = self.key(topic, quiz_history)
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM mentor_reports WHERE topic_key = ? AND history_hash != ?",
+                         (topic_key, history_hash))
+            conn.execute("INSERT OR REPLACE INTO mentor_reports VALUES (?, ?, ?, ?)",
+                         (topic_key, history_hash, report, time.time()))
+
+    def get_or_create(self, topic, quiz_history, generate):
+        """Returns the cached report, or runs `generate()` once for all concurrent callers of the same key."""
+        report = self.get(topic, quiz_history)
+        if report is not None:
+            self.hits += 1
+            return report
+
+        key = self.key(topic, quiz_history)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            report = self.get(topic, quiz_history)  # Another caller may have just finished
+            if report is None:
+                report = generate()
+                self.put(topic, quiz_history, report)
+            future.set_result(report)
+            return report
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_mentor_report_cache():
+    """Returns the process-wide mentor report cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MentorReportCache()
+        return _cache
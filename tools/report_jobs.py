@@ -0,0 +1,248 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config import MENTOR_REPORT_CONCURRENCY
+from data_modules.worker_pool import run_blocking
+from tools.report_cache import get_mentor_report_cache
+
+# Jobs are forgotten this long after they were submitted
+JOB_RETENTION_SECONDS = 3600
+
+# How often a stream checks for new progress
+STREAM_POLL_SECONDS = 0.25
+
+# Each process refreshes the heartbeat of the jobs it runs this often; an unfinished job whose
+# heartbeat is older than STALE_JOB_SECONDS lost its worker (crash or restart) and is failed
+HEARTBEAT_SECONDS = 10
+STALE_JOB_SECONDS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_jobs (
+    job_id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    topic_key TEXT NOT NULL,
+    history_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    owner_pid INTEGER,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS report_jobs_key ON report_jobs (topic_key, history_hash, status);
+CREATE TABLE IF NOT EXISTS report_job_chunks (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+) WITHOUT ROWID;
+"""
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _run_crew(topic, quiz_history, performance_summary, on_progress):
+    from crew_ai import run_mentor_report  # ✅ CrewAI is only imported by the workers that need it
+
+    return run_mentor_report(topic, quiz_history, performance_summary, on_progress=on_progress)
+
+
+class ReportJobStore:
+    """Job status and progress chunks in SQLite (next to the report cache), so every API
+    worker process sees every job, whichever process runs it."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(report_jobs)")}
+            for column, kind in (("owner_pid", "INTEGER"), ("heartbeat_at", "REAL")):
+                if column not in columns:  # Databases created before heartbeats
+                    conn.execute(f"ALTER TABLE report_jobs ADD COLUMN {column} {kind}")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _fail_stale(self, conn):
+        """Fails unfinished jobs whose worker stopped sending heartbeats."""
+        now = time.time()
+        stale = "status IN (?, ?) AND COALESCE(heartbeat_at, created_at) < ?"
+        args = (*ACTIVE_STATUSES, now - STALE_JOB_SECONDS)
+        if conn.execute(f"SELECT 1 FROM report_jobs WHERE {stale} LIMIT 1", args).fetchone() is None:
+            return  # ✅ The common case stays a read, so polling takes no write lock
+        with conn:
+            conn.execute(f"UPDATE report_jobs SET status = 'failed', error = ?, finished_at = ? WHERE {stale}",
+                         ("❌ The worker running this report stopped; please request it again.", now, *args))
+
+    def create(self, topic, key):
+        """Returns the id of the unfinished job for `key`, or of a new queued one, and whether it is new."""
+        conn = self._connect()
+        self._fail_stale(conn)
+        with conn:
+            now = time.time()
+            cutoff = now - JOB_RETENTION_SECONDS
+            conn.execute("DELETE FROM report_job_chunks WHERE job_id IN "
+                         "(SELECT job_id FROM report_jobs WHERE created_at < ?)", (cutoff,))
+            conn.execute("DELETE FROM report_jobs WHERE created_at < ?", (cutoff,))
+            row = conn.execute(
+                "SELECT job_id FROM report_jobs WHERE topic_key = ? AND history_hash = ? AND status IN (?, ?)",
+                (*key, *ACTIVE_STATUSES)
+            ).fetchone()
+            if row:
+                return row[0], False
+            job_id = uuid.uuid4().hex
+            conn.execute("INSERT INTO report_jobs VALUES (?, ?, ?, ?, 'queued', NULL, NULL, ?, NULL, ?, ?)",
+                         (job_id, topic, *key, now, os.getpid(), now))
+            return job_id, True
+
+    def heartbeat(self, job_ids):
+        if not job_ids:
+            return
+        with self._connect() as conn:
+            conn.executemany("UPDATE report_jobs SET heartbeat_at = ? WHERE job_id = ?",
+                             ((time.time(), job_id) for job_id in job_ids))
+
+    def set_running(self, job_id):
+        with self._connect() as conn:
+            conn.execute("UPDATE report_jobs SET status = 'running' WHERE job_id = ?", (job_id,))
+
+    def emit(self, job_id, text):
+        with self._connect() as conn:
+            conn.execute("INSERT INTO report_job_chunks VALUES (?, "
+                         "(SELECT COUNT(*) FROM report_job_chunks WHERE job_id = ?), ?)", (job_id, job_id, text))
+
+    def finish(self, job_id, status, result=None, error=None):
+        with self._connect() as conn:
+            conn.execute("UPDATE report_jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE job_id = ?",
+                         (status, result, error, time.time(), job_id))
+
+    def get(self, job_id):
+        conn = self._connect()
+        self._fail_stale(conn)
+        row = conn.execute("SELECT topic, status, result, error FROM report_jobs WHERE job_id = ?",
+                           (job_id,)).fetchone()
+        if row is None:
+            return None
+        progress = conn.execute("SELECT COUNT(*) FROM report_job_chunks WHERE job_id = ?", (job_id,)).fetchone()[0]
+        topic, status, result, error = row
+        return {"job_id": job_id, "topic": topic, "status": status, "progress": progress,
+                "result": result, "error": error}
+
+    def chunks(self, job_id, after):
+        """Returns (chunks with seq >= `after`, whether the job has finished)."""
+        conn = self._connect()
+        self._fail_stale(conn)
+        status = conn.execute("SELECT status FROM report_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        rows = conn.execute("SELECT text FROM report_job_chunks WHERE job_id = ? AND seq >= ? ORDER BY seq",
+                            (job_id, after)).fetchall()
+        return [text for (text,) in rows], status is None or status[0] not in ACTIVE_STATUSES
+
+
+class ReportJobQueue:
+    """Runs mentor report generation on a bounded pool of background workers.
+
+    `max_concurrency` caps simultaneous crew runs to protect LLM rate limits; further jobs
+    wait in the queue. Submitting a topic/history that is already queued or running returns
+    the existing job, and finished reports go through the durable report cache. Job state
+    lives in SQLite, so status and streams work from any API worker process; a job whose
+    process dies stops getting heartbeats and is failed after STALE_JOB_SECONDS.
+    """
+
+    def __init__(self, max_concurrency=MENTOR_REPORT_CONCURRENCY, generate=_run_crew, cache=None):
+        self.generate = generate
+        self.cache = cache or get_mentor_report_cache()
+        self.jobs = ReportJobStore(self.cache.path)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="mentor-report")
+        self._owned = set()
+        self._owned_lock = threading.Lock()
+        self._heartbeat = None
+
+    def _beat(self):
+        """Keeps the heartbeat of this process's unfinished jobs fresh (daemon thread)."""
+        while True:
+            time.sleep(HEARTBEAT_SECONDS)
+            with self._owned_lock:
+                owned = list(self._owned)
+            try:
+                self.jobs.heartbeat(owned)
+            except sqlite3.Error as e:
+                print(f"⚠️ Report job heartbeat failed: {e!r}")
+
+    def _own(self, job_id):
+        with self._owned_lock:
+            self._owned.add(job_id)
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._beat, name="report-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+    def submit(self, topic, quiz_history, performance_summary):
+        """Queues a report and returns its job status without waiting for it."""
+        job_id, created = self.jobs.create(topic, self.cache.key(topic, quiz_history))
+        if created:
+            cached = self.cache.get(topic, quiz_history)
+            if cached is not None:
+                self.jobs.emit(job_id, cached)
+                self.jobs.finish(job_id, "done", result=cached)
+            else:
+                self._own(job_id)
+                self._executor.submit(self._run, job_id, topic, quiz_history, performance_summary)
+        return self.jobs.get(job_id)
+
+    def _run(self, job_id, topic, quiz_history, performance_summary):
+        self.jobs.set_running(job_id)
+        try:
+            report = self.cache.get_or_create(
+                topic, quiz_history,
+                lambda: self.generate(topic, quiz_history, performance_summary,
+                                      lambda text: self.jobs.emit(job_id, text))
+            )
+            self.jobs.finish(job_id, "done", result=report)
+        except Exception as exc:
+            self.jobs.finish(job_id, "failed", error=str(exc))
+        finally:
+            with self._owned_lock:
+                self._owned.discard(job_id)
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    async def stream(self, job_id, poll_seconds=STREAM_POLL_SECONDS):
+        """Yields progress chunks as they arrive, ending when the job finishes.
+
+        Waits with `asyncio.sleep` between checks, so a long crew run holds no thread.
+        """
+        sent = 0
+        while True:
+            chunks, done = await run_blocking(self.jobs.chunks, job_id, sent)
+            sent += len(chunks)
+            for chunk in chunks:
+                yield chunk
+            if done:
+                if not chunks:
+                    return
+                continue  # Drain anything emitted just before the job finished
+            await asyncio.sleep(poll_seconds)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_report_job_queue():
+    """Returns the process-wide report job queue."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ReportJobQueue()
+        return _queue
@@ -0,0 +1,168 @@
+import threading
+from collections import defaultdict
+from typing import Any
+from langchain.chains import RetrievalQA
+from langchain.prompts import PromptTemplate
+from langchain.schema import BaseRetriever
+from langchain_google_genai import GoogleGenerativeAI
+from config import ANSWER_CACHE_MAX_ENTRIES, ANSWER_CACHE_SIMILARITY, ANSWER_CACHE_TTL_SECONDS, GOOGLE_API_KEY
+from data_modules.instrumentation import span, timed
+from tools.answer_cache import AnswerCache
+from tools.bm25 import BM25Index
+from tools.embedding_cache import CachedEmbeddings
+from tools.question_index import QuestionIndex
+from tools.vector_index import (
+    KNOWLEDGE_BASE_FILE, knowledge_base_fingerprint, load_knowledge_base, open_index_manager, question_text
+)
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+LLM_MODEL_NAME = "gemini-1.5-pro-latest"
+
+# Questions taken from each of the vector and BM25 rankings before fusing them
+HYBRID_CANDIDATES = 20
+
+# Reciprocal rank fusion constant: score = sum of 1 / (RRF_K + rank) over both rankings
+RRF_K = 60
+
+PROMPT_TEMPLATE = PromptTemplate(
+    input_variables=["context", "question"],
+    template="""You are an expert tutor analyzing quiz results.
+
+    Question: {question}
+    Context: {context}
+
+    Based on the given context, provide an explanation.
+
+    """
+)
+
+
+class KnowledgeBaseRetriever(BaseRetriever):
+    """LangChain retriever backed by `RetrievalService.retrieve` (exact match, else hybrid search)."""
+
+    service: Any
+    k: int = 4
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return self.service.retrieve(query, k=self.k)
+
+
+class RetrievalService:
+    """Embedding model, FAISS index, lexical indexes and RetrievalQA chain, loaded once and reused.
+
+    A question that appears verbatim in the knowledge base is answered from its own chunks
+    through a hash lookup, with no embedding or vector search. Other text is ranked by
+    fusing FAISS similarity with BM25 keyword scores.
+    """
+
+    def __init__(self, knowledge_base_path=KNOWLEDGE_BASE_FILE, index_path=None, llm=None, embeddings=None):
+        self.knowledge_base_path = knowledge_base_path
+        self.embedding_model = embeddings or CachedEmbeddings(EMBEDDING_MODEL_NAME)
+        questions = load_knowledge_base(knowledge_base_path)["quiz_questions"]
+        self.index_manager = open_index_manager(self.embedding_model, index_path)
+        self.index_manager.sync(questions)
+        self._build_lexical(questions)
+        self.llm = llm or GoogleGenerativeAI(model=LLM_MODEL_NAME, api_key=GOOGLE_API_KEY)
+        self.answer_cache = AnswerCache(
+            max_entries=ANSWER_CACHE_MAX_ENTRIES, ttl_seconds=ANSWER_CACHE_TTL_SECONDS,
+            embeddings=self.embedding_model, similarity_threshold=ANSWER_CACHE_SIMILARITY,
+            knowledge_base_version=knowledge_base_fingerprint(questions)
+        )
+        self._lock = threading.Lock()
+        self._build_chain()
+
+    def _build_lexical(self, questions):
+        self.questions = QuestionIndex(questions)
+        self.bm25 = BM25Index([question_text(item) for item in questions],
+                              [str(item["question_id"]) for item in questions])
+
+    def _build_chain(self):
+        self.qa_chain = RetrievalQA.from_chain_type(
+            llm=self.llm,
+            retriever=KnowledgeBaseRetriever(service=self),
+            chain_type_kwargs={"prompt": PROMPT_TEMPLATE}
+        )
+
+    def refresh(self):
+        """Re-syncs the indexes with the knowledge-base file (only changed questions are embedded)."""
+        with self._lock:
+            questions = load_knowledge_base(self.knowledge_base_path)["quiz_questions"]
+            stats = self.index_manager.sync(questions)
+            self._build_lexical(questions)
+            self._build_chain()
+            self.answer_cache.set_knowledge_base_version(knowledge_base_fingerprint(questions))
+        return stats
+
+    def question_chunks(self, question_id):
+        return self.index_manager.question_chunks(question_id)
+
+    @timed("retrieval.search")
+    def retrieve(self, question, k=4):
+        """Chunks of the matching question on an exact hit; otherwise the top `k` hybrid results."""
+        item = self.questions.match(question)
+        if item is not None:
+            docs = self.question_chunks(item["question_id"])
+            if docs:
+                return docs[:k]
+        return self.hybrid_search(question, k)
+
+    def hybrid_search(self, question, k=4):
+        """Reciprocal rank fusion of FAISS and BM25 at question level; returns each winner's best chunk."""
+        with span("faiss.search"):
+            vector_docs = self.index_manager.similarity_search(question, k=HYBRID_CANDIDATES)
+        with span("bm25.search"):
+            lexical = self.bm25.search(question, HYBRID_CANDIDATES)
+
+        scores = defaultdict(float)
+        best_chunk = {}
+        for doc in vector_docs:
+            question_id = str(doc.metadata.get("question_id"))
+            if question_id not in best_chunk:
+                best_chunk[question_id] = doc
+                scores[question_id] += 1 / (RRF_K + len(best_chunk))
+        for rank, (question_id, _) in enumerate(lexical, start=1):
+            scores[question_id] += 1 / (RRF_K + rank)
+
+        results = []
+        for question_id in sorted(scores, key=scores.get, reverse=True):
+            doc = best_chunk.get(question_id) or next(iter(self.question_chunks(question_id)), None)
+            if doc is not None:
+                results.append(doc)
+            if len(results) == k:
+                break
+        return results
+
+    def answer(self, question):
+        """Answers from the cache when possible; otherwise runs retrieval + LLM and caches the result."""
+        cached = self.answer_cache.get(question)
+        if cached is not None:
+            return cached
+        with span("llm.answer"):
+            response = self.qa_chain.run(question)
+        self.answer_cache.put(question, response)
+        return response
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_retrieval_service(knowledge_base_path=KNOWLEDGE_BASE_FILE):
+    """Returns the process-wide retrieval service, loading the model and index on first use.
+
+    Given a different knowledge-base file (a newer snapshot), the loaded service is re-synced
+    with it instead of being rebuilt.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = RetrievalService(knowledge_base_path)
+        elif _service.knowledge_base_path != knowledge_base_path:
+            _service.knowledge_base_path = knowledge_base_path
+            _service.refresh()
+        return _service
+
+
+def loaded_retrieval_service():
+    """The process-wide retrieval service if it was loaded, without loading it."""
+    return _service
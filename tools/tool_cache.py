@@ -0,0 +1,134 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+from crewai.tools import BaseTool
+
+TOOL_CACHE_DB_FILE = os.path.join("db", "tool_cache.sqlite3")
+
+# Search results for a tutorial query change slowly; keep them for a month
+TOOL_CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tool_results (
+    cache_key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def normalize_query(value):
+    return " ".join(str(value).split()).lower()
+
+
+def is_cacheable(result):
+    """Only real results are cached: empty output and error payloads are retried on the next call."""
+    if result is None:
+        return False
+    if isinstance(result, str):
+        text = result.strip()
+        return bool(text) and not text.lower().startswith("error")
+    if isinstance(result, dict):
+        return bool(result) and "error" not in result and "errors" not in result
+    if isinstance(result, (list, tuple)):
+        return bool(result)
+    return True
+
+
+def tool_cache_key(tool_name, args, kwargs):
+    """Key for a tool call: tool name plus its arguments with whitespace and case normalized."""
+    normalized = {
+        "args": [normalize_query(arg) for arg in args],
+        "kwargs": {name: normalize_query(value) for name, value in sorted(kwargs.items())}
+    }
+    return f"{tool_name}:{json.dumps(normalized, sort_keys=True)}"
+
+
+class ToolResultCache:
+    """Durable TTL cache of tool outputs in SQLite, shared by every crew run."""
+
+    def __init__(self, path=TOOL_CACHE_DB_FILE, ttl_seconds=TOOL_CACHE_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT result, created_at FROM tool_results WHERE cache_key = ?", (key,)
+        ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO tool_results VALUES (?, ?, ?)",
+                         (key, json.dumps(result, default=str), time.time()))
+
+    def get_or_fetch(self, key, fetch):
+        result = self.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = fetch()  # Exceptions propagate and nothing is stored
+        if is_cacheable(result):
+            self.put(key, result)
+        return result
+
+
+class CachedTool(BaseTool):
+    """Wraps a CrewAI tool so repeated calls with the same normalized arguments skip the external API."""
+
+    inner: Any = None
+    cache: Any = None
+
+    def __init__(self, inner, cache):
+        super().__init__(name=inner.name, description=inner.description, args_schema=inner.args_schema,
+                         inner=inner, cache=cache)
+
+    def _run(self, *args, **kwargs):
+        key = tool_cache_key(self.inner.name, args, kwargs)
+        return self.cache.get_or_fetch(key, lambda: self.inner.run(*args, **kwargs))
+
+
+def prewarm(tools, topics):
+    """Runs each tool once per topic with the `'{topic} tutorial'` query the mentor task asks for."""
+    for topic in topics:
+        for tool in tools:
+            tool.run(search_query=f"{topic.strip()} tutorial")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_tool_cache():
+    """Returns the process-wide tool result cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ToolResultCache()
+        return _cache
+
+
+def loaded_tool_cache():
+    """The process-wide tool result cache if something has used it, without creating it."""
+    return _cache
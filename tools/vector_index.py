@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.vectorstores import FAISS
+from config import VECTOR_INDEX_BACKEND
+
+KNOWLEDGE_BASE_FILE = "quiz_knowledge_base.json"
+FAISS_INDEX_PATH = "faiss_index"
+
+# Directory of the quantized backends (see tools.compact_index)
+COMPACT_INDEX_PATH = "faiss_index_compact"
+
+# question_id -> {"hash": content hash, "doc_ids": [chunk ids in the FAISS docstore]}
+MANIFEST_FILE = "manifest.json"
+
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 100
+
+
+def question_text(item):
+    """The text that is embedded for one knowledge-base question."""
+    return (
+        f"Question: {item['question']}\nContext: {item['context']}\n"
+        f"Correct Answer: {item['answer']}\nOther Options: {', '.join(item['other_options'])}"
+    )
+
+
+def question_hash(item):
+    return hashlib.sha256(question_text(item).encode("utf-8")).hexdigest()
+
+
+def knowledge_base_fingerprint(questions):
+    """Hash of every question's id and content, independent of their order."""
+    digest = hashlib.sha256()
+    for item in sorted(questions, key=lambda item: str(item["question_id"])):
+        digest.update(f"{item['question_id']}:{question_hash(item)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def split_question(item, text_splitter):
+    """Splits one question into chunks with stable ids of the form `<question_id>:<n>`."""
+    document = Document(page_content=question_text(item), metadata={"question_id": item["question_id"]})
+    chunks = text_splitter.split_documents([document])
+    doc_ids = [f"{item['question_id']}:{n}" for n in range(len(chunks))]
+    return chunks, doc_ids
+
+
+def load_knowledge_base(path=KNOWLEDGE_BASE_FILE):
+    """Reads a `{"quiz_questions": [...]}` JSON file, or a JSONL file with one question per line."""
+    with open(path, "r", encoding="utf-8") as file:
+        if path.endswith(".jsonl"):
+            return {"quiz_questions": [json.loads(line) for line in file if line.strip()]}
+        return json.load(file)
+
+
+class VectorIndexManager:
+    """Keeps the FAISS index in step with the knowledge base by embedding only new or changed questions.
+
+    A manifest next to the index records a content hash and the chunk ids of every indexed
+    `question_id`, so `sync` only touches the questions that differ.
+    """
+
+    def __init__(self, embedding_model, index_path=FAISS_INDEX_PATH):
+        self.embedding_model = embedding_model
+        self.index_path = index_path
+        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+        self.db = None
+        self.manifest = {}
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.index_path, MANIFEST_FILE)
+
+    def load(self):
+        """Loads the persisted index and manifest, if there is one."""
+        if not os.path.exists(os.path.join(self.index_path, "index.faiss")):
+            return self
+        self.db = FAISS.load_local(self.index_path, self.embedding_model, allow_dangerous_deserialization=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = self._manifest_from_docstore()
+        return self
+
+    def _manifest_from_docstore(self):
+        """Rebuilds chunk ids for an index saved before manifests existed. Hashes are unknown,
+        so every question is re-embedded once on the next sync."""
+        manifest = {}
+        for doc_id in self.db.index_to_docstore_id.values():
+            question_id = self.db.docstore.search(doc_id).metadata.get("question_id")
+            entry = manifest.setdefault(str(question_id), {"hash": None, "doc_ids": []})
+            entry["doc_ids"].append(doc_id)
+        return manifest
+
+    def save(self):
+        os.makedirs(self.index_path, exist_ok=True)
+        self.db.save_local(self.index_path)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+
+    def sync(self, questions):
+        """Applies the difference between `questions` and the index. Returns counts per kind of change."""
+        wanted = {str(item["question_id"]): item for item in questions}
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        stale_ids = []
+        for question_id in list(self.manifest):
+            if question_id not in wanted:
+                stale_ids += self.manifest.pop(question_id)["doc_ids"]
+                stats["removed"] += 1
+
+        new_chunks, new_ids = [], []
+        for question_id, item in wanted.items():
+            digest = question_hash(item)
+            entry = self.manifest.get(question_id)
+            if entry and entry["hash"] == digest:
+                stats["unchanged"] += 1
+                continue
+
+            if entry:
+                stale_ids += entry["doc_ids"]
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+            chunks, doc_ids = split_question(item, self.text_splitter)
+            new_chunks += chunks
+            new_ids += doc_ids
+            self.manifest[question_id] = {"hash": digest, "doc_ids": doc_ids}
+
+        if not stale_ids and not new_chunks:
+            return stats
+
+        if stale_ids and self.db is not None:
+            self.db.delete(stale_ids)
+        if new_chunks:
+            if self.db is None:
+                self.db = FAISS.from_documents(new_chunks, self.embedding_model, ids=new_ids)
+            else:
+                self.db.add_documents(new_chunks, ids=new_ids)
+        self.save()
+        return stats
+
+    def similarity_search(self, question, k=4):
+        if self.db is None:
+            return []  # Nothing indexed yet
+        return self.db.similarity_search(question, k=k)
+
+    def question_chunks(self, question_id):
+        """The indexed chunks of one question, straight from the docstore."""
+        entry = self.manifest.get(str(question_id))
+        if entry is None or self.db is None:
+            return []
+        docs = [self.db.docstore.search(doc_id) for doc_id in entry["doc_ids"]]
+        return [doc for doc in docs if isinstance(doc, Document)]
+
+
+def default_index_path(backend=VECTOR_INDEX_BACKEND):
+    return FAISS_INDEX_PATH if backend == "flat" else COMPACT_INDEX_PATH
+
+
+def open_index_manager(embedding_model, index_path=None, backend=VECTOR_INDEX_BACKEND):
+    """Loads the index manager for `backend`: "flat", or a compact kind from `tools.compact_index`."""
+    index_path = index_path or default_index_path(backend)
+    if backend == "flat":
+        return VectorIndexManager(embedding_model, index_path).load()
+    from tools.compact_index import CompactIndexManager  # ✅ Only loaded when a compact backend is configured
+
+    return CompactIndexManager(embedding_model, index_path, kind=backend).load()
+
+
+def sync_knowledge_base_index(embedding_model, knowledge_base_path=KNOWLEDGE_BASE_FILE, index_path=None,
+                              backend=VECTOR_INDEX_BACKEND):
+    """Loads the `backend` index at `index_path` and brings it in line with the knowledge-base file."""
+    manager = open_index_manager(embedding_model, index_path, backend)
+    stats = manager.sync(load_knowledge_base(knowledge_base_path)["quiz_questions"])
+    return manager, stats